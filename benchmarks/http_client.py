@@ -0,0 +1,95 @@
+import asyncio
+import statistics
+import sys
+import time
+
+from httpx import AsyncClient
+
+from src.git_hub.api import create_git_hub_client
+
+
+REVIEWS = 20
+REQUESTS_PER_REVIEW = 10
+HANDSHAKE_LATENCY = 0.05
+RESPONSE_LATENCY = 0.005
+
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 2\r\n"
+    b"\r\n"
+    b"{}"
+)
+
+
+async def handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter
+) -> None:
+    await asyncio.sleep(HANDSHAKE_LATENCY)
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            await asyncio.sleep(RESPONSE_LATENCY)
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_review(client: AsyncClient, url: str) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(client.get(url) for _ in range(REQUESTS_PER_REVIEW))
+    )
+
+    return time.perf_counter() - started
+
+
+async def client_per_review(url: str) -> list[float]:
+    latencies = []
+    for _ in range(REVIEWS):
+        async with AsyncClient() as client:
+            latencies.append(await run_review(client, url))
+
+    return latencies
+
+
+async def shared_client(url: str) -> list[float]:
+    async with create_git_hub_client() as client:
+        return [await run_review(client, url) for _ in range(REVIEWS)]
+
+
+def report(name: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<20} mean={statistics.mean(latencies) * 1000:>8.1f} ms"
+        f"  p50={statistics.median(latencies) * 1000:>8.1f} ms"
+        f"  p95={p95 * 1000:>8.1f} ms"
+    )
+
+
+async def main() -> None:
+    server = None
+    if len(sys.argv) > 1:
+        url = sys.argv[1]
+    else:
+        server = await asyncio.start_server(handle_connection, "127.0.0.1")
+        port = server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/rate_limit"
+
+    print(
+        f"{REVIEWS} reviews x {REQUESTS_PER_REVIEW} requests against {url}:"
+    )
+    report("client per review", await client_per_review(url))
+    report("shared client", await shared_client(url))
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
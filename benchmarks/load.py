@@ -0,0 +1,442 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import os
+import resource
+import statistics
+import sys
+import tarfile
+import time
+from collections import Counter
+
+os.environ.setdefault("GITHUB_API_TOKEN", "benchmark-github-token")
+os.environ.setdefault("GROQ_API_TOKEN", "benchmark-groq-token")
+os.environ.setdefault("GROQ_TOKENS_PER_MINUTE", str(10 ** 9))
+os.environ.setdefault("GROQ_MODEL_CONCURRENCY", str(10 ** 3))
+
+from groq import AsyncGroq
+from httpx import ASGITransport, AsyncClient, MockTransport, Request, Response
+from redis.asyncio import Redis
+
+from src.code_guru.cache import cache_stats
+from src.code_guru.dependencies import get_open_ai_api, get_redis
+from src.code_guru.metrics import get_github_endpoint
+from src.code_guru.packing import estimate_tokens
+from src.code_guru.services import GITHUB_RAW_MEDIA_TYPE
+from src.main import app
+
+
+GITHUB_RATE_LIMIT = 10 ** 6
+
+
+def get_blob_sha(data: bytes) -> str:
+    return hashlib.sha1(f"blob {len(data)}\0".encode() + data).hexdigest()
+
+
+class FakeGitHub:
+    def __init__(
+        self, files_count: int,
+        depth: int,
+        file_size: int,
+        latency: float
+    ):
+        self.calls: Counter[str] = Counter()
+        self.downloaded_bytes = 0
+        self._files_count = files_count
+        self._depth = depth
+        self._file_size = file_size
+        self._latency = latency
+        self._repos: dict[str, dict] = {}
+        self._rate_limit_reset = int(time.time()) + 3600
+
+    def _make_file(self, repo_name: str, index: int) -> tuple[str, bytes]:
+        directories = [
+            f"package_{(index >> (level * 2)) % 4}"
+            for level in range(self._depth)
+        ]
+        line = (
+            f"def function_{index}(value):  # {repo_name}\n"
+            f"    return value * {index}\n"
+        )
+        content = line * max(1, self._file_size // len(line))
+
+        return "/".join([*directories, f"module_{index}.py"]), content.encode()
+
+    def _get_repo(self, repo_name: str) -> dict:
+        if repo_name in self._repos:
+            return self._repos[repo_name]
+
+        files = dict(
+            self._make_file(repo_name, index)
+            for index in range(self._files_count)
+        )
+        shas = {path: get_blob_sha(data) for path, data in files.items()}
+        repo = {
+            "head_sha": hashlib.sha1(repo_name.encode()).hexdigest(),
+            "files": files,
+            "shas": shas,
+            "blobs": {shas[path]: data for path, data in files.items()},
+            "tarball": None,
+        }
+        self._repos[repo_name] = repo
+        return repo
+
+    def _get_tarball(self, repo_name: str, repo: dict) -> bytes:
+        if repo["tarball"] is None:
+            buffer = io.BytesIO()
+            with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+                for path, data in repo["files"].items():
+                    info = tarfile.TarInfo(
+                        f"bench-{repo_name}-{repo['head_sha'][:7]}/{path}"
+                    )
+                    info.size = len(data)
+                    archive.addfile(info, io.BytesIO(data))
+            repo["tarball"] = buffer.getvalue()
+
+        return repo["tarball"]
+
+    async def handle(self, request: Request) -> Response:
+        await asyncio.sleep(self._latency)
+        endpoint = get_github_endpoint(str(request.url))
+        self.calls[endpoint] += 1
+        repo_name = request.url.path.strip("/").split("/")[2]
+        repo = self._get_repo(repo_name)
+        headers = {
+            "X-RateLimit-Limit": str(GITHUB_RATE_LIMIT),
+            "X-RateLimit-Remaining": str(
+                GITHUB_RATE_LIMIT - sum(self.calls.values())
+            ),
+            "X-RateLimit-Reset": str(self._rate_limit_reset),
+            "ETag": f'"{repo["head_sha"]}-{endpoint}"',
+        }
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            return Response(304, headers=headers)
+
+        if endpoint == "commits":
+            response = Response(200, headers=headers, text=repo["head_sha"])
+        elif endpoint == "repo":
+            response = Response(
+                200, headers=headers, json={
+                    "size": sum(map(len, repo["files"].values())) // 1024
+                }
+            )
+        elif endpoint == "trees":
+            response = Response(
+                200, headers=headers, json={
+                    "sha": repo["head_sha"],
+                    "truncated": False,
+                    "tree": [
+                        {
+                            "type": "blob",
+                            "path": path,
+                            "sha": repo["shas"][path],
+                            "size": len(data),
+                            "url": (
+                                f"https://api.github.com/repos/bench"
+                                f"/{repo_name}/git/blobs/{repo['shas'][path]}"
+                            ),
+                        }
+                        for path, data in repo["files"].items()
+                    ],
+                }
+            )
+        elif endpoint == "blobs":
+            data = repo["blobs"][request.url.path.rsplit("/", 1)[-1]]
+            if request.headers.get("Accept") == GITHUB_RAW_MEDIA_TYPE:
+                response = Response(200, headers=headers, content=data)
+            else:
+                response = Response(
+                    200, headers=headers, json={
+                        "content": base64.b64encode(data).decode(),
+                        "encoding": "base64",
+                        "size": len(data),
+                    }
+                )
+        elif endpoint == "tarball":
+            response = Response(
+                200,
+                headers=headers,
+                content=self._get_tarball(repo_name, repo)
+            )
+        else:
+            response = Response(404, headers=headers, json={})
+
+        self.downloaded_bytes += len(response.content)
+        return response
+
+
+class FakeGroq:
+    def __init__(
+        self, latency: float,
+        token_latency: float,
+        completion_tokens: int
+    ):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._latency = latency
+        self._token_latency = token_latency
+        self._completion_tokens = completion_tokens
+
+    async def handle(self, request: Request) -> Response:
+        body = json.loads(request.content)
+        prompt_tokens = sum(
+            estimate_tokens(message["content"])
+            for message in body["messages"]
+        )
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += self._completion_tokens
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": self._completion_tokens,
+            "total_tokens": prompt_tokens + self._completion_tokens,
+        }
+        await asyncio.sleep(self._latency)
+
+        if body.get("stream"):
+            return Response(
+                200,
+                headers={"Content-Type": "text/event-stream"},
+                content=self._stream(body["model"], usage)
+            )
+
+        return Response(
+            200, json={
+                "id": "benchmark",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": "review " * self._completion_tokens,
+                        },
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+        )
+
+    async def _stream(self, model: str, usage: dict):
+        for index in range(self._completion_tokens + 1):
+            is_last = index == self._completion_tokens
+            chunk = {
+                "id": "benchmark",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {} if is_last else {"content": "review "},
+                        "finish_reason": "stop" if is_last else None,
+                    }
+                ],
+                "x_groq": {"id": "benchmark", "usage": usage}
+                if is_last else None,
+            }
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+            await asyncio.sleep(self._token_latency)
+        yield b"data: [DONE]\n\n"
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    timings = {}
+    for entry in filter(None, header.split(", ")):
+        name, _, duration = entry.partition(";dur=")
+        timings[name] = float(duration)
+
+    return timings
+
+
+def get_peak_rss_mb() -> float:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak_rss / 1024 / 1024
+
+    return peak_rss / 1024
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    if len(latencies) < 2:
+        latencies = latencies * 2 or [0.0, 0.0]
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+
+    return {
+        "mean": round(statistics.mean(latencies) * 1000, 1),
+        "p50": round(percentiles[49] * 1000, 1),
+        "p95": round(percentiles[94] * 1000, 1),
+        "p99": round(percentiles[98] * 1000, 1),
+        "max": round(max(latencies) * 1000, 1),
+    }
+
+
+async def create_redis(redis_url: str | None) -> Redis:
+    if redis_url:
+        return Redis.from_url(redis_url)
+
+    try:
+        from fakeredis import FakeAsyncRedis
+    except ImportError:
+        sys.exit("fakeredis[lua] is not installed, pass --redis-url instead")
+
+    return FakeAsyncRedis()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    fake_git_hub = FakeGitHub(
+        files_count=args.files,
+        depth=args.depth,
+        file_size=args.file_size,
+        latency=args.github_latency
+    )
+    fake_groq = FakeGroq(
+        latency=args.groq_latency,
+        token_latency=args.groq_token_latency,
+        completion_tokens=args.completion_tokens
+    )
+    redis = await create_redis(args.redis_url)
+    path = "/review/stream/" if args.stream else "/review/"
+    repos = args.repos or args.requests
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with (
+        AsyncClient(
+            transport=MockTransport(fake_git_hub.handle)
+        ) as git_hub_client,
+        AsyncClient(transport=MockTransport(fake_groq.handle)) as groq_client,
+        AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://benchmark",
+            timeout=None
+        ) as client,
+    ):
+        groq_api = AsyncGroq(
+            api_key="benchmark",
+            base_url="http://groq.benchmark",
+            http_client=groq_client,
+            max_retries=0
+        )
+        app.state.git_hub_client = git_hub_client
+        app.dependency_overrides = {
+            get_redis: lambda: redis,
+            get_open_ai_api: lambda: groq_api,
+        }
+
+        async def review(index: int) -> tuple[float, int, dict[str, float]]:
+            async with semaphore:
+                started_at = time.perf_counter()
+                response = await client.post(path, json={
+                    "assignment_description": "Implement a REST API.",
+                    "github_repo_url": (
+                        f"https://github.com/bench/repo-{index % repos}.git"
+                    ),
+                    "candidate_level": "Junior",
+                })
+
+            return (
+                time.perf_counter() - started_at,
+                response.status_code,
+                parse_server_timing(response.headers.get("Server-Timing", ""))
+            )
+
+        started_at = time.perf_counter()
+        try:
+            results = await asyncio.gather(
+                *(review(index) for index in range(args.requests))
+            )
+        finally:
+            app.dependency_overrides = {}
+            await redis.aclose()
+        duration = time.perf_counter() - started_at
+
+    latencies = [
+        latency for latency, status_code, _ in results if status_code == 200
+    ]
+    stages = Counter()
+    for _, status_code, timings in results:
+        if status_code == 200:
+            stages.update(timings)
+
+    return {
+        "config": {
+            "endpoint": path,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "repos": repos,
+            "files": args.files,
+            "depth": args.depth,
+            "file_size": args.file_size,
+            "github_latency": args.github_latency,
+            "groq_latency": args.groq_latency,
+            "groq_token_latency": args.groq_token_latency,
+            "completion_tokens": args.completion_tokens,
+            "redis": args.redis_url or "fakeredis",
+        },
+        "duration_s": round(duration, 3),
+        "reviews_per_second": round(len(latencies) / duration, 2),
+        "errors": Counter(
+            str(status_code)
+            for _, status_code, _ in results
+            if status_code != 200
+        ),
+        "latency_ms": summarize_latencies(latencies),
+        "stages_ms": {
+            stage: round(total / max(len(latencies), 1), 1)
+            for stage, total in stages.items()
+        },
+        "upstream": {
+            "github_calls": dict(fake_git_hub.calls),
+            "github_calls_total": sum(fake_git_hub.calls.values()),
+            "github_bytes": fake_git_hub.downloaded_bytes,
+            "groq_calls": fake_groq.calls,
+            "groq_prompt_tokens": fake_groq.prompt_tokens,
+            "groq_completion_tokens": fake_groq.completion_tokens,
+        },
+        "cache": cache_stats.get_hit_ratios(),
+        "peak_rss_mb": round(get_peak_rss_mb(), 1),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Drive /review/ against local GitHub and Groq stand-ins"
+    )
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--repos", type=int, default=0,
+        help="distinct repositories, defaults to one per request"
+    )
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--file-size", type=int, default=2048)
+    parser.add_argument("--github-latency", type=float, default=0.02)
+    parser.add_argument("--groq-latency", type=float, default=0.5)
+    parser.add_argument("--groq-token-latency", type=float, default=0.0)
+    parser.add_argument("--completion-tokens", type=int, default=200)
+    parser.add_argument("--redis-url")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--output", help="write the report to this file")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Callable
+
+from benchmarks.load import FakeGitHub, create_redis
+from httpx import AsyncClient, MockTransport
+
+from src.code_guru import services
+from src.code_guru.cache import LocalCache
+from src.code_guru.filters import FileFilter
+from src.code_guru.services import GitHubService, GroqAIService
+from src.database.base import FailSafeRedis
+from src.settings import GITHUB_MAX_FILE_SIZE, GITHUB_MAX_REVIEW_SIZE
+
+
+def to_mb(size: int) -> float:
+    return round(size / 1024 / 1024, 2)
+
+
+def measure(function: Callable[[], object]) -> dict[str, float]:
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started_at = time.perf_counter()
+    function()
+    duration = time.perf_counter() - started_at
+    current, peak = tracemalloc.get_traced_memory()
+
+    return {
+        "peak_mb": to_mb(peak - baseline),
+        "retained_mb": to_mb(current - baseline),
+        "duration_s": round(duration, 3),
+    }
+
+
+def get_legacy_messages(
+    assignment_description: str,
+    files_info: dict[str, str]
+) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": "You are a professional Code Reviewer"},
+        {
+            "role": "user",
+            "content": (
+                f"1. Assigment description - {assignment_description}\n"
+                f"2. Content of files - {files_info}\n"
+            ),
+        },
+    ]
+
+
+def build_request_body(messages: list[dict[str, str]]) -> int:
+    return len(json.dumps({"messages": messages}))
+
+
+async def fetch_files_info(
+    args: argparse.Namespace,
+    fake_git_hub: FakeGitHub,
+    use_archive: bool,
+    index: int
+) -> tuple[dict[str, str], dict[str, float]]:
+    services.GITHUB_ARCHIVE_MIN_REPO_SIZE_KB = 0 if use_archive else 10 ** 9
+    redis = await create_redis(args.redis_url)
+    git_hub_service = GitHubService(
+        redis=FailSafeRedis(redis=redis),
+        local_cache=LocalCache(),
+        file_filter=FileFilter(rules=[])
+    )
+
+    async with AsyncClient(
+        transport=MockTransport(fake_git_hub.handle)
+    ) as client:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        started_at = time.perf_counter()
+        files_info = await git_hub_service.get_files_info(
+            client=client,
+            url=git_hub_service.get_api_url_from_usual_url(
+                f"https://github.com/bench/memory-{index}.git"
+            )
+        )
+        duration = time.perf_counter() - started_at
+        current, peak = tracemalloc.get_traced_memory()
+    await redis.aclose()
+
+    return files_info, {
+        "files": len(files_info),
+        "content_mb": to_mb(sum(map(len, files_info.values()))),
+        "peak_mb": to_mb(peak - baseline),
+        "retained_mb": to_mb(current - baseline),
+        "duration_s": round(duration, 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    fake_git_hub = FakeGitHub(
+        files_count=args.files,
+        depth=args.depth,
+        file_size=args.file_size,
+        latency=0
+    )
+    for index in range(2):
+        fake_git_hub._get_repo(f"memory-{index}")
+
+    tracemalloc.start()
+    try:
+        _, tree = await fetch_files_info(
+            args, fake_git_hub, use_archive=False, index=0
+        )
+        files_info, archive = await fetch_files_info(
+            args, fake_git_hub, use_archive=True, index=1
+        )
+
+        groq_ai_service = GroqAIService(groq_api=None)
+        prompt_builders = {
+            "legacy": lambda: get_legacy_messages(
+                "Implement a REST API.",
+                files_info
+            ),
+            "current": lambda: groq_ai_service._get_messages(
+                assignment_description="Implement a REST API.",
+                candidate_level="Junior",
+                files_info=files_info
+            ),
+        }
+        prompt = {
+            name: {
+                "messages": measure(get_messages),
+                "request_body": measure(
+                    lambda: build_request_body(get_messages())
+                ),
+            }
+            for name, get_messages in prompt_builders.items()
+        }
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "config": {
+            "files": args.files,
+            "depth": args.depth,
+            "file_size": args.file_size,
+            "max_file_size": GITHUB_MAX_FILE_SIZE,
+            "max_review_size": GITHUB_MAX_REVIEW_SIZE,
+            "redis": args.redis_url or "fakeredis",
+        },
+        "files_info": {"tree": tree, "archive": archive},
+        "prompt": prompt,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure peak memory of file download and prompt building"
+    )
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--file-size", type=int, default=16 * 1024)
+    parser.add_argument("--redis-url")
+    parser.add_argument("--output", help="write the report to this file")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
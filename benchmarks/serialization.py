@@ -0,0 +1,95 @@
+import hashlib
+import random
+import string
+import timeit
+import tracemalloc
+from typing import Callable
+
+from src.code_guru.serializers import (
+    deserialize_files_info,
+    serialize_files_info,
+)
+
+
+FILES_COUNT = 1000
+REPEAT = 5
+
+
+def make_files_info(files_count: int) -> dict[str, str]:
+    generator = random.Random(0)
+    words = [
+        "".join(generator.choices(string.ascii_lowercase, k=8))
+        for _ in range(200)
+    ]
+    files_info = {}
+    for index in range(files_count):
+        lines = [
+            f"def {generator.choice(words)}_{line}(value):\n"
+            f"    return value + '{generator.choice(words)}'\n"
+            for line in range(generator.randint(10, 80))
+        ]
+        files_info[f"src/package_{index % 20}/module_{index}.py"] = (
+            "".join(lines)
+        )
+
+    return files_info
+
+
+def make_files_sha(files_info: dict[str, str]) -> dict[str, str]:
+    return {
+        path: hashlib.sha1(content.encode("utf-8")).hexdigest()
+        for path, content in files_info.items()
+    }
+
+
+def measure(
+    name: str,
+    files_info: dict[str, str],
+    dumps: Callable[[dict[str, str]], bytes | str],
+    loads: Callable[[bytes | str], dict[str, str]]
+) -> None:
+    serialized = dumps(files_info)
+    assert loads(serialized) == files_info
+
+    dumps_time = min(
+        timeit.repeat(lambda: dumps(files_info), number=1, repeat=REPEAT)
+    )
+    loads_time = min(
+        timeit.repeat(lambda: loads(serialized), number=1, repeat=REPEAT)
+    )
+
+    tracemalloc.start()
+    loads(dumps(files_info))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = len(serialized.encode("utf-8") if isinstance(serialized, str)
+               else serialized)
+    print(
+        f"{name:<28} size={size / 1024:>9.1f} KiB"
+        f"  dumps={dumps_time * 1000:>8.2f} ms"
+        f"  loads={loads_time * 1000:>8.2f} ms"
+        f"  peak={peak / 1024:>9.1f} KiB"
+    )
+
+
+def main() -> None:
+    files_info = make_files_info(FILES_COUNT)
+    files_sha = make_files_sha(files_info)
+
+    for label, payload in (
+        ("file contents", files_info),
+        ("tree (path -> blob sha)", files_sha),
+    ):
+        print(f"{FILES_COUNT} files, {label}:")
+        measure("  str() / eval()", payload, str, eval)
+        measure(
+            "  serialize / deserialize",
+            payload,
+            serialize_files_info,
+            deserialize_files_info
+        )
+
+
+if __name__ == "__main__":
+    main()
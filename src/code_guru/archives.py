@@ -0,0 +1,133 @@
+import zlib
+from typing import Iterator, Optional
+
+
+BLOCK_SIZE = 512
+DECOMPRESS_CHUNK_SIZE = 256 * 1024
+
+REGULAR_FILE_TYPES = (b"0", b"\0", b"7")
+PAX_HEADER_TYPE = b"x"
+PAX_GLOBAL_HEADER_TYPE = b"g"
+GNU_LONG_NAME_TYPE = b"L"
+
+
+class TarGzStreamParser:
+    def __init__(
+        self, strip_components: int = 1,
+        max_entry_size: Optional[int] = None
+    ):
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._buffer = bytearray()
+        self._strip_components = strip_components
+        self._max_entry_size = max_entry_size
+        self._header: Optional[dict] = None
+        self._pax_path: Optional[str] = None
+        self._skip_size = 0
+        self._finished = False
+        self.skipped_entries = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, chunk: bytes) -> Iterator[tuple[str, bytes]]:
+        while not self._finished:
+            data = self._decompressor.decompress(chunk, DECOMPRESS_CHUNK_SIZE)
+            self._buffer += data
+            yield from self._parse_entries()
+            chunk = self._decompressor.unconsumed_tail
+            if not chunk and len(data) < DECOMPRESS_CHUNK_SIZE:
+                return
+
+    def _parse_entries(self) -> Iterator[tuple[str, bytes]]:
+        while not self._finished:
+            if self._skip_size:
+                skipped = min(self._skip_size, len(self._buffer))
+                del self._buffer[:skipped]
+                self._skip_size -= skipped
+                if self._skip_size:
+                    return
+
+            if self._header is None:
+                if len(self._buffer) < BLOCK_SIZE:
+                    return
+                block = bytes(self._buffer[:BLOCK_SIZE])
+                del self._buffer[:BLOCK_SIZE]
+                if block == bytes(BLOCK_SIZE):
+                    self._finished = True
+                    return
+                self._header = self._parse_header(block)
+
+            size = self._header["size"]
+            padded_size = -(-size // BLOCK_SIZE) * BLOCK_SIZE
+            if self._is_oversized(self._header):
+                self._header, self._pax_path = None, None
+                self._skip_size = padded_size
+                self.skipped_entries += 1
+                continue
+            if len(self._buffer) < padded_size:
+                return
+            data = bytes(self._buffer[:size])
+            del self._buffer[:padded_size]
+            header, self._header = self._header, None
+
+            entry = self._handle_entry(header, data)
+            if entry is not None:
+                yield entry
+
+    def _handle_entry(
+        self, header: dict,
+        data: bytes
+    ) -> Optional[tuple[str, bytes]]:
+        entry_type = header["type"]
+        if entry_type == PAX_HEADER_TYPE:
+            self._pax_path = self._parse_pax_records(data).get("path")
+            return None
+        if entry_type == GNU_LONG_NAME_TYPE:
+            self._pax_path = data.rstrip(b"\0").decode("utf-8")
+            return None
+        if entry_type == PAX_GLOBAL_HEADER_TYPE:
+            return None
+
+        path, self._pax_path = self._pax_path or header["path"], None
+        if entry_type not in REGULAR_FILE_TYPES:
+            return None
+
+        path = "/".join(path.split("/")[self._strip_components:])
+        if not path:
+            return None
+
+        return path, data
+
+    def _is_oversized(self, header: dict) -> bool:
+        return (
+            self._max_entry_size is not None
+            and header["type"] in REGULAR_FILE_TYPES
+            and header["size"] > self._max_entry_size
+        )
+
+    @staticmethod
+    def _parse_header(block: bytes) -> dict:
+        name = block[0:100].split(b"\0", 1)[0].decode("utf-8")
+        prefix = block[345:500].split(b"\0", 1)[0].decode("utf-8")
+        size = block[124:136].rstrip(b"\0 ").strip() or b"0"
+
+        return {
+            "path": f"{prefix}/{name}" if prefix else name,
+            "size": int(size, 8),
+            "type": block[156:157],
+        }
+
+    @staticmethod
+    def _parse_pax_records(data: bytes) -> dict[str, str]:
+        records = {}
+        position = 0
+        while position < len(data):
+            length_end = data.index(b" ", position)
+            length = int(data[position:length_end])
+            record = data[length_end + 1:position + length - 1]
+            key, value = record.split(b"=", 1)
+            records[key.decode("utf-8")] = value.decode("utf-8")
+            position += length
+
+        return records
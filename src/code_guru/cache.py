@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from pydantic import ValidationError
+
+from src.code_guru.metrics import (
+    CACHE_LOOKUPS,
+    LOCAL_CACHE_BYTES,
+    LOCAL_CACHE_ENTRIES,
+)
+from src.code_guru.schemas import CodeReviewResponse, LastReview
+from src.database.base import FailSafeRedis
+from src.settings import (
+    LOCAL_CACHE_MAX_SIZE,
+    LOCAL_CACHE_TTL,
+    REVIEW_CACHE_TTL,
+    REVIEW_HISTORY_TTL,
+    REVIEW_LOCK_POLL_INTERVAL,
+    REVIEW_LOCK_TTL,
+)
+
+
+logger = logging.getLogger("uvicorn.error")
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class ReviewCache:
+    _in_flight: dict[str, asyncio.Task] = {}
+
+    def __init__(self, redis: FailSafeRedis):
+        self._redis = redis
+
+    async def get_or_create(
+        self, key: str,
+        create: Callable[[], Awaitable[CodeReviewResponse]]
+    ) -> CodeReviewResponse:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._get_or_create(key, create))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            logger.info(f"Joining in-flight review for {key}")
+
+        return await asyncio.shield(task)
+
+    async def get(self, key: str) -> Optional[CodeReviewResponse]:
+        review = await self._read(key)
+        cache_stats.record_lookup("review", is_hit=review is not None)
+
+        return review
+
+    async def _read(self, key: str) -> Optional[CodeReviewResponse]:
+        cached_review = await self._redis.get(key)
+        if cached_review is None:
+            return None
+
+        try:
+            return CodeReviewResponse.model_validate_json(cached_review)
+        except ValidationError:
+            logger.warning(f"Dropping unreadable cache entry {key}")
+            return None
+
+    async def set(self, key: str, review: CodeReviewResponse) -> None:
+        await self._redis.set(
+            key,
+            review.model_dump_json(),
+            ex=REVIEW_CACHE_TTL
+        )
+
+    async def get_last_review(self, key: str) -> Optional[LastReview]:
+        last_review = await self._redis.get(key)
+        if last_review is None:
+            return None
+
+        try:
+            return LastReview.model_validate_json(last_review)
+        except ValidationError:
+            logger.warning(f"Dropping unreadable cache entry {key}")
+            return None
+
+    async def set_last_review(
+        self, key: str,
+        last_review: LastReview
+    ) -> None:
+        await self._redis.set(
+            key,
+            last_review.model_dump_json(),
+            ex=REVIEW_HISTORY_TTL
+        )
+
+    async def _get_or_create(
+        self, key: str,
+        create: Callable[[], Awaitable[CodeReviewResponse]]
+    ) -> CodeReviewResponse:
+        lock_key = f"lock:{key}"
+        lock_token = uuid.uuid4().hex
+        deadline = time.monotonic() + REVIEW_LOCK_TTL
+
+        while True:
+            cached_review = await self._read(key)
+            if cached_review is not None:
+                logger.info(f"Cache hit for {key}")
+                cache_stats.record_lookup("review", is_hit=True)
+                return cached_review
+
+            if await self._redis.set(
+                lock_key,
+                lock_token,
+                nx=True,
+                ex=REVIEW_LOCK_TTL
+            ):
+                try:
+                    return await self._create(key, create)
+                finally:
+                    await self._redis.eval(
+                        RELEASE_LOCK_SCRIPT, 1, lock_key, lock_token
+                    )
+
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    f"Timed out waiting for {lock_key}, reviewing anyway"
+                )
+                return await self._create(key, create)
+
+            await asyncio.sleep(REVIEW_LOCK_POLL_INTERVAL)
+
+    async def _create(
+        self, key: str,
+        create: Callable[[], Awaitable[CodeReviewResponse]]
+    ) -> CodeReviewResponse:
+        cache_stats.record_lookup("review", is_hit=False)
+        review = await create()
+        await self.set(key, review)
+
+        return review
+
+
+class CacheStats:
+    def __init__(self):
+        self._hits: Counter[str] = Counter()
+        self._misses: Counter[str] = Counter()
+
+    def record(self, tier: str, hits: int = 0, misses: int = 0) -> None:
+        self._hits[tier] += hits
+        self._misses[tier] += misses
+        CACHE_LOOKUPS.labels(tier, "hit").inc(hits)
+        CACHE_LOOKUPS.labels(tier, "miss").inc(misses)
+
+    def record_lookup(self, tier: str, is_hit: bool) -> None:
+        self.record(tier, hits=int(is_hit), misses=int(not is_hit))
+
+    def get_hit_ratios(self) -> dict[str, dict[str, float]]:
+        return {
+            tier: {
+                "hits": self._hits[tier],
+                "misses": self._misses[tier],
+                "hit_ratio": (
+                    self._hits[tier]
+                    / (self._hits[tier] + self._misses[tier] or 1)
+                ),
+            }
+            for tier in sorted(self._hits.keys() | self._misses.keys())
+        }
+
+
+class LocalCache:
+    def __init__(
+        self, max_size: int = LOCAL_CACHE_MAX_SIZE,
+        ttl: float = LOCAL_CACHE_TTL
+    ):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = (
+            OrderedDict()
+        )
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._pop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, size: int) -> None:
+        if size > self._max_size:
+            return
+
+        self._pop(key)
+        self._entries[key] = (time.monotonic() + self._ttl, size, value)
+        self._size += size
+        while self._size > self._max_size:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+cache_stats = CacheStats()
+local_cache = LocalCache()
+
+LOCAL_CACHE_BYTES.set_function(lambda: local_cache.size)
+LOCAL_CACHE_ENTRIES.set_function(lambda: len(local_cache))
@@ -0,0 +1,43 @@
+import asyncio
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Optional,
+    TypeVar,
+)
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def gather_fail_fast(*awaitables: Awaitable[T]) -> list[T]:
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class ProgressTask(Generic[T, R]):
+    def __init__(self, run: Callable[[Callable[[T], None]], Awaitable[R]]):
+        self._progress: asyncio.Queue[Optional[T]] = asyncio.Queue()
+        self._task = asyncio.ensure_future(run(self._progress.put_nowait))
+        self._task.add_done_callback(
+            lambda _: self._progress.put_nowait(None)
+        )
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        while (progress := await self._progress.get()) is not None:
+            yield progress
+
+    async def result(self) -> R:
+        return await self._task
+
+    def cancel(self) -> None:
+        self._task.cancel()
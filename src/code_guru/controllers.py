@@ -1,8 +1,29 @@
-from fastapi import Depends, HTTPException
+import json
+from typing import AsyncIterator
 
-from src.code_guru.dependencies import get_code_review_service
+from fastapi import BackgroundTasks, Depends, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from src.code_guru.cache import cache_stats, local_cache
+from src.code_guru.dependencies import (
+    get_code_review_service,
+    get_repo_prefetcher,
+    get_review_job_queue,
+)
 from src.code_guru.exceptions import BaseAPIException
-from src.code_guru.schemas import CodeReviewRequest, CodeReviewResponse
+from src.code_guru.jobs import FAILED, SUCCEEDED, ReviewJobQueue
+from src.code_guru.prefetch import RepoPrefetcher
+from src.code_guru.schemas import (
+    BatchReviewRequest,
+    CodeReviewRequest,
+    CodeReviewResponse,
+    PrefetchRequest,
+    PrefetchResponse,
+    ReviewJob,
+    ReviewJobRequest,
+    ReviewJobStatusResponse,
+)
 from src.code_guru.services import CodeReviewService
 
 
@@ -17,3 +38,138 @@ async def code_review_controller(
             status_code=exception.status_code,
             detail=exception.message
         )
+
+
+def _format_server_sent_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_review_events(
+    code_review_request: CodeReviewRequest,
+    review_service: CodeReviewService
+) -> AsyncIterator[str]:
+    try:
+        async for event, data in review_service.review_stream(
+            code_review_request
+        ):
+            yield _format_server_sent_event(event, data)
+    except BaseAPIException as exception:
+        yield _format_server_sent_event(
+            "error",
+            {
+                "status_code": exception.status_code,
+                "detail": exception.message,
+            }
+        )
+
+
+async def code_review_stream_controller(
+    code_review_request: CodeReviewRequest,
+    review_service: CodeReviewService = Depends(get_code_review_service)
+) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_review_events(code_review_request, review_service),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _stream_batch_review_events(
+    batch_review_request: BatchReviewRequest,
+    review_service: CodeReviewService
+) -> AsyncIterator[str]:
+    async for event, data in review_service.review_batch(
+        batch_review_request
+    ):
+        yield _format_server_sent_event(event, data)
+
+
+async def code_review_batch_controller(
+    batch_review_request: BatchReviewRequest,
+    review_service: CodeReviewService = Depends(get_code_review_service)
+) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_batch_review_events(batch_review_request, review_service),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def submit_review_job_controller(
+    review_job_request: ReviewJobRequest,
+    job_queue: ReviewJobQueue = Depends(get_review_job_queue)
+) -> ReviewJobStatusResponse:
+    job = await job_queue.submit(review_job_request)
+
+    return ReviewJobStatusResponse(**job.model_dump())
+
+
+async def _get_review_job(job_id: str, job_queue: ReviewJobQueue) -> ReviewJob:
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Review job {job_id} not found"
+        )
+
+    return job
+
+
+async def review_job_status_controller(
+    job_id: str,
+    job_queue: ReviewJobQueue = Depends(get_review_job_queue)
+) -> ReviewJobStatusResponse:
+    job = await _get_review_job(job_id, job_queue)
+
+    return ReviewJobStatusResponse(**job.model_dump())
+
+
+async def review_job_result_controller(
+    job_id: str,
+    job_queue: ReviewJobQueue = Depends(get_review_job_queue)
+) -> CodeReviewResponse:
+    job = await _get_review_job(job_id, job_queue)
+    if job.status == FAILED:
+        raise HTTPException(
+            status_code=job.error_status_code or 500,
+            detail=job.error
+        )
+    if job.status != SUCCEEDED:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Review job {job_id} is {job.status}"
+        )
+
+    return job.result
+
+
+async def cache_stats_controller() -> dict:
+    return {
+        "tiers": cache_stats.get_hit_ratios(),
+        "local_cache": {
+            "entries": len(local_cache),
+            "size": local_cache.size,
+        },
+    }
+
+
+async def prefetch_controller(
+    prefetch_request: PrefetchRequest,
+    background_tasks: BackgroundTasks,
+    prefetcher: RepoPrefetcher = Depends(get_repo_prefetcher)
+) -> PrefetchResponse:
+    background_tasks.add_task(
+        prefetcher.prefetch,
+        prefetch_request.github_repo_urls
+    )
+
+    return PrefetchResponse(
+        repos_count=len(prefetch_request.github_repo_urls)
+    )
+
+
+async def metrics_controller() -> Response:
+    return Response(
+        content=generate_latest(),
+        media_type=CONTENT_TYPE_LATEST
+    )
@@ -1,18 +1,26 @@
-from fastapi import Depends
-from groq import Groq
+from fastapi import Depends, Request
+from groq import AsyncGroq
+from httpx import AsyncClient
 from redis.asyncio import Redis
 
+from src.code_guru.cache import ReviewCache
 from src.code_guru.interfaces import (
     CodeReviewServiceInterface,
     GitHubServiceInterface,
     GroqAIServiceInterface,
 )
+from src.code_guru.jobs import ReviewJobQueue
+from src.code_guru.prefetch import (
+    RepoPrefetcher,
+    create_prefetch_git_hub_service,
+)
+from src.code_guru.rate_limit import GroqRateLimiter
 from src.code_guru.services import (
     CodeReviewService,
     GitHubService,
     GroqAIService,
 )
-from src.database.base import redis
+from src.database.base import FailSafeRedis, redis
 from src.groq_ai.api import groq_api
 
 
@@ -20,27 +28,67 @@ def get_redis() -> Redis:
     return redis
 
 
-def get_open_ai_api() -> Groq:
+def get_git_hub_client(request: Request) -> AsyncClient:
+    return request.app.state.git_hub_client
+
+
+def get_open_ai_api() -> AsyncGroq:
     return groq_api
 
 
+def get_cache_redis(redis: Redis = Depends(get_redis)) -> FailSafeRedis:
+    return FailSafeRedis(redis=redis)
+
+
 def get_git_hub_service(
-    redis: Redis = Depends(get_redis)
+    redis: FailSafeRedis = Depends(get_cache_redis)
 ) -> GitHubServiceInterface:
     return GitHubService(redis=redis)
 
 
 def get_chat_gpt_service(
-    groq_api: Groq = Depends(get_open_ai_api)
+    groq_api: AsyncGroq = Depends(get_open_ai_api),
+    redis: FailSafeRedis = Depends(get_cache_redis)
 ) -> GroqAIServiceInterface:
-    return GroqAIService(groq_api=groq_api)
+    return GroqAIService(
+        groq_api=groq_api,
+        rate_limiter=GroqRateLimiter(redis=redis)
+    )
+
+
+def get_review_cache(
+    redis: FailSafeRedis = Depends(get_cache_redis)
+) -> ReviewCache:
+    return ReviewCache(redis=redis)
+
+
+def get_review_job_queue(
+    redis: Redis = Depends(get_redis)
+) -> ReviewJobQueue:
+    return ReviewJobQueue(redis=redis)
 
 
 def get_code_review_service(
     git_hub_service: GitHubServiceInterface = Depends(get_git_hub_service),
-    groq_ai_service: GroqAIServiceInterface = Depends(get_chat_gpt_service)
+    groq_ai_service: GroqAIServiceInterface = Depends(get_chat_gpt_service),
+    review_cache: ReviewCache = Depends(get_review_cache),
+    git_hub_client: AsyncClient = Depends(get_git_hub_client),
+    redis: FailSafeRedis = Depends(get_cache_redis)
 ) -> CodeReviewServiceInterface:
     return CodeReviewService(
         git_hub_service=git_hub_service,
-        groq_ai_service=groq_ai_service
+        groq_ai_service=groq_ai_service,
+        review_cache=review_cache,
+        git_hub_client=git_hub_client,
+        create_git_hub_service=lambda: get_git_hub_service(redis=redis)
+    )
+
+
+def get_repo_prefetcher(
+    redis: FailSafeRedis = Depends(get_cache_redis),
+    git_hub_client: AsyncClient = Depends(get_git_hub_client)
+) -> RepoPrefetcher:
+    return RepoPrefetcher(
+        git_hub_service=create_prefetch_git_hub_service(redis=redis),
+        git_hub_client=git_hub_client
     )
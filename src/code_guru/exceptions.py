@@ -11,3 +11,7 @@ class GitHubError(BaseAPIException):
 
 class ChatBotError(BaseAPIException):
     pass
+
+
+class SerializationError(ValueError):
+    pass
@@ -0,0 +1,156 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from src.code_guru.packing import (
+    ASSET_SUFFIXES,
+    GENERATED_DIRS,
+    GENERATED_PATTERNS,
+    ROOT_GENERATED_DIRS,
+)
+from src.settings import (
+    GITHUB_IGNORE_RULES,
+    GITHUB_MAX_FILE_SIZE,
+    GITHUB_MAX_REVIEW_SIZE,
+)
+
+
+BINARY_SNIFF_SIZE = 8000
+
+DEFAULT_IGNORE_RULES = (
+    [f"{directory}/" for directory in sorted(GENERATED_DIRS)]
+    + [f"/{directory}/" for directory in sorted(ROOT_GENERATED_DIRS)]
+    + [f"*{suffix}" for suffix in sorted(ASSET_SUFFIXES)]
+    + list(GENERATED_PATTERNS)
+    + [".git/"]
+)
+
+
+@dataclass
+class IgnoreRule:
+    pattern: re.Pattern
+    negated: bool
+    directory_only: bool
+
+
+def _translate_glob(glob: str) -> str:
+    parts, index = [], 0
+    while index < len(glob):
+        if glob.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+        elif glob.startswith("**", index):
+            parts.append(".*")
+            index += 2
+        elif glob[index] == "*":
+            parts.append("[^/]*")
+            index += 1
+        elif glob[index] == "?":
+            parts.append("[^/]")
+            index += 1
+        elif glob[index] == "[" and "]" in glob[index + 1:]:
+            end = glob.index("]", index + 1)
+            character_class = glob[index + 1:end].replace("\\", "\\\\")
+            if character_class.startswith("!"):
+                character_class = "^" + character_class[1:]
+            parts.append(f"[{character_class}]")
+            index = end + 1
+        else:
+            parts.append(re.escape(glob[index]))
+            index += 1
+
+    return "".join(parts)
+
+
+def parse_ignore_rule(rule: str) -> Optional[IgnoreRule]:
+    rule = rule.strip()
+    if not rule or rule.startswith("#"):
+        return None
+
+    negated = rule.startswith("!")
+    rule = rule.removeprefix("!")
+    directory_only = rule.endswith("/")
+    rule = rule.rstrip("/")
+    anchored = "/" in rule
+    rule = rule.lstrip("/")
+    if not rule:
+        return None
+
+    prefix = "" if anchored else "(?:.*/)?"
+    return IgnoreRule(
+        pattern=re.compile(f"{prefix}{_translate_glob(rule)}", re.IGNORECASE),
+        negated=negated,
+        directory_only=directory_only
+    )
+
+
+def is_binary_content(data: bytes) -> bool:
+    return b"\0" in data[:BINARY_SNIFF_SIZE]
+
+
+class FileFilter:
+    def __init__(
+        self, rules: list[str] = DEFAULT_IGNORE_RULES + GITHUB_IGNORE_RULES,
+        max_file_size: int = GITHUB_MAX_FILE_SIZE
+    ):
+        self._rules = [
+            rule
+            for rule in map(parse_ignore_rule, rules)
+            if rule is not None
+        ]
+        self._max_file_size = max_file_size
+
+    def _matches(self, path: str, is_directory: bool) -> bool:
+        excluded = False
+        for rule in self._rules:
+            if rule.directory_only and not is_directory:
+                continue
+            if rule.pattern.fullmatch(path):
+                excluded = not rule.negated
+
+        return excluded
+
+    def is_directory_excluded(self, path: str) -> bool:
+        parts = path.strip("/").split("/")
+
+        return any(
+            self._matches("/".join(parts[:end]), is_directory=True)
+            for end in range(1, len(parts) + 1)
+        )
+
+    def is_excluded(self, path: str, size: Optional[int] = None) -> bool:
+        if size is not None and size > self._max_file_size:
+            return True
+
+        directory, _, _ = path.rpartition("/")
+        if directory and self.is_directory_excluded(directory):
+            return True
+
+        return self._matches(path, is_directory=False)
+
+    def filter_files(self, files: list[dict]) -> list[dict]:
+        return [
+            item
+            for item in files
+            if not self.is_excluded(item["path"], item.get("size"))
+        ]
+
+
+class ByteBudget:
+    def __init__(self, limit: int = GITHUB_MAX_REVIEW_SIZE):
+        self._limit = limit
+        self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(self._limit - self.used, 0)
+
+    def reserve(self, size: int) -> bool:
+        if self.used + size > self._limit:
+            return False
+
+        self.used += size
+        return True
+
+
+file_filter = FileFilter()
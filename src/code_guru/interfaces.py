@@ -1,8 +1,13 @@
 from abc import abstractmethod, ABC
+from typing import AsyncIterator, Callable, Optional
 
 from httpx import AsyncClient
 
-from src.code_guru.schemas import CodeReviewRequest, CodeReviewResponse
+from src.code_guru.schemas import (
+    BatchReviewRequest,
+    CodeReviewRequest,
+    CodeReviewResponse,
+)
 
 
 class CodeReviewServiceInterface(ABC):
@@ -12,25 +17,117 @@ class CodeReviewServiceInterface(ABC):
     ) -> CodeReviewResponse:
         pass
 
+    @abstractmethod
+    def review_stream(
+        self, code_review_request: CodeReviewRequest
+    ) -> AsyncIterator[tuple[str, dict]]:
+        pass
+
+    @abstractmethod
+    def review_batch(
+        self, batch_review_request: BatchReviewRequest
+    ) -> AsyncIterator[tuple[str, dict]]:
+        pass
+
 
 class GitHubServiceInterface(ABC):
     @abstractmethod
     def get_api_url_from_usual_url(self, usual_url: str) -> str:
         pass
 
+    @abstractmethod
+    async def get_head_sha(self, client: AsyncClient, url: str) -> str:
+        pass
+
     @abstractmethod
     async def get_files_info(
         self, client: AsyncClient,
-        url: str
+        url: str,
+        head_sha: Optional[str] = None,
+        on_file_fetched: Optional[Callable[[str], None]] = None
     ) -> dict[str, str]:
         pass
 
+    @abstractmethod
+    async def get_changed_files_info(
+        self, client: AsyncClient,
+        url: str,
+        base_sha: str,
+        head_sha: str
+    ) -> Optional[tuple[dict[str, str], list[str]]]:
+        pass
+
 
 class GroqAIServiceInterface(ABC):
     @abstractmethod
-    def get_bot_response(
+    def get_prompt_token_budget(
+        self, assignment_description: str,
+        candidate_level: str
+    ) -> int:
+        pass
+
+    @abstractmethod
+    def get_delta_prompt_token_budget(
         self, assignment_description: str,
         candidate_level: str,
-        files_info: dict[str, str]
+        previous_review: str,
+        removed_files: list[str]
+    ) -> int:
+        pass
+
+    @abstractmethod
+    async def get_bot_response(
+        self, assignment_description: str,
+        candidate_level: str,
+        files_info: dict[str, str],
+        skipped_files_summary: Optional[str] = None
     ) -> str:
         pass
+
+    @abstractmethod
+    def stream_bot_response(
+        self, assignment_description: str,
+        candidate_level: str,
+        files_info: dict[str, str],
+        skipped_files_summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        pass
+
+    @abstractmethod
+    async def get_delta_review(
+        self, assignment_description: str,
+        candidate_level: str,
+        previous_review: str,
+        files_info: dict[str, str],
+        removed_files: list[str],
+        skipped_files_summary: Optional[str] = None
+    ) -> str:
+        pass
+
+    @abstractmethod
+    async def get_partial_review(
+        self, assignment_description: str,
+        candidate_level: str,
+        files_info: dict[str, str],
+        part: int,
+        parts_count: int
+    ) -> str:
+        pass
+
+    @abstractmethod
+    async def merge_reviews(
+        self, assignment_description: str,
+        candidate_level: str,
+        partial_reviews: list[str],
+        skipped_files_summary: Optional[str] = None
+    ) -> str:
+        pass
+
+    @abstractmethod
+    def stream_merged_reviews(
+        self, assignment_description: str,
+        candidate_level: str,
+        partial_reviews: list[str],
+        skipped_files_summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        pass
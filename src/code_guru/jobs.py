@@ -0,0 +1,255 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from pydantic import ValidationError
+from redis.asyncio import Redis
+
+from src.code_guru.exceptions import BaseAPIException
+from src.code_guru.schemas import (
+    CodeReviewRequest,
+    CodeReviewResponse,
+    ReviewJob,
+    ReviewJobRequest,
+)
+from src.settings import (
+    JOB_MAX_ATTEMPTS,
+    JOB_PRIORITIES,
+    JOB_RESULT_TTL,
+    JOB_RETRY_DELAY,
+    JOB_VISIBILITY_TIMEOUT,
+)
+
+
+logger = logging.getLogger("uvicorn.error")
+
+QUEUE_KEY = "jobs:queue"
+PROCESSING_KEY = "jobs:processing"
+DELAYED_KEY = "jobs:delayed"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+PRIORITY_SCORE_STEP = 10 ** 10
+
+CLAIM_JOB_SCRIPT = """
+local job_ids = redis.call("zrange", KEYS[1], 0, 0)
+if #job_ids == 0 then
+    return nil
+end
+redis.call("zrem", KEYS[1], job_ids[1])
+redis.call("zadd", KEYS[2], ARGV[1], job_ids[1])
+return job_ids[1]
+"""
+
+REQUEUE_JOB_SCRIPT = """
+if redis.call("zrem", KEYS[1], ARGV[1]) == 1 then
+    return redis.call("zadd", KEYS[2], ARGV[2], ARGV[1])
+end
+return 0
+"""
+
+
+class ReviewJobQueue:
+    def __init__(self, redis: Redis):
+        self._redis = redis
+
+    async def submit(self, review_job_request: ReviewJobRequest) -> ReviewJob:
+        job = ReviewJob(
+            job_id=uuid.uuid4().hex,
+            status=QUEUED,
+            priority=review_job_request.priority,
+            request=CodeReviewRequest(
+                **review_job_request.model_dump(exclude={"priority"})
+            )
+        )
+        await self._save(job)
+        await self._redis.zadd(
+            QUEUE_KEY,
+            {job.job_id: self._get_queue_score(job)}
+        )
+        logger.info(f"Queued review job {job.job_id}")
+
+        return job
+
+    async def get(self, job_id: str) -> Optional[ReviewJob]:
+        job_data = await self._redis.get(self._get_job_key(job_id))
+        if job_data is None:
+            return None
+
+        try:
+            return ReviewJob.model_validate_json(job_data)
+        except ValidationError:
+            logger.warning(f"Dropping unreadable review job {job_id}")
+            return None
+
+    async def claim(self) -> Optional[ReviewJob]:
+        await self.requeue_delayed()
+        await self.requeue_expired()
+
+        while True:
+            job_id = await self._redis.eval(
+                CLAIM_JOB_SCRIPT,
+                2,
+                QUEUE_KEY,
+                PROCESSING_KEY,
+                time.time() + JOB_VISIBILITY_TIMEOUT
+            )
+            if job_id is None:
+                return None
+
+            job = await self.get(job_id.decode("utf-8"))
+            if job is None:
+                await self._redis.zrem(PROCESSING_KEY, job_id)
+                continue
+
+            job.attempts += 1
+            if job.attempts > JOB_MAX_ATTEMPTS:
+                await self._finish(
+                    job,
+                    status=FAILED,
+                    error=f"Gave up after {JOB_MAX_ATTEMPTS} attempts"
+                )
+                continue
+
+            job.status = RUNNING
+            await self._save(job)
+
+            return job
+
+    async def extend(self, job_id: str) -> None:
+        await self._redis.zadd(
+            PROCESSING_KEY,
+            {job_id: time.time() + JOB_VISIBILITY_TIMEOUT},
+            xx=True
+        )
+
+    async def complete(
+        self, job: ReviewJob,
+        review: CodeReviewResponse
+    ) -> None:
+        job.result = review
+        await self._finish(job, status=SUCCEEDED)
+
+    async def fail(self, job: ReviewJob, exception: Exception) -> None:
+        status_code = getattr(exception, "status_code", 500)
+        is_rate_limited = status_code == 429
+        is_retryable = (
+            not isinstance(exception, BaseAPIException)
+            or status_code >= 500
+            or is_rate_limited
+        )
+        if is_retryable and job.attempts < JOB_MAX_ATTEMPTS:
+            job.status = QUEUED
+            await self._save(job)
+            if is_rate_limited:
+                delay = JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+                logger.warning(
+                    f"Delaying review job {job.job_id} by {delay}s"
+                    f" after attempt {job.attempts}: {exception!r}"
+                )
+                await self._move(
+                    job.job_id,
+                    source=PROCESSING_KEY,
+                    destination=DELAYED_KEY,
+                    score=time.time() + delay
+                )
+                return
+
+            logger.warning(
+                f"Retrying review job {job.job_id}"
+                f" after attempt {job.attempts}: {exception!r}"
+            )
+            await self._requeue(job)
+            return
+
+        await self._finish(
+            job,
+            status=FAILED,
+            error=getattr(exception, "message", str(exception)),
+            error_status_code=status_code
+        )
+
+    async def requeue_delayed(self) -> int:
+        return await self._requeue_due(DELAYED_KEY)
+
+    async def requeue_expired(self) -> int:
+        return await self._requeue_due(PROCESSING_KEY)
+
+    async def _requeue_due(self, source: str) -> int:
+        job_ids = await self._redis.zrangebyscore(source, "-inf", time.time())
+        requeued_count = 0
+        for job_id in job_ids:
+            job = await self.get(job_id.decode("utf-8"))
+            if job is None:
+                await self._redis.zrem(source, job_id)
+                continue
+
+            if await self._requeue(job, source=source):
+                logger.info(f"Requeued review job {job.job_id} from {source}")
+                requeued_count += 1
+
+        return requeued_count
+
+    async def _requeue(
+        self, job: ReviewJob,
+        source: str = PROCESSING_KEY
+    ) -> bool:
+        return await self._move(
+            job.job_id,
+            source=source,
+            destination=QUEUE_KEY,
+            score=self._get_queue_score(job)
+        )
+
+    async def _move(
+        self, job_id: str,
+        source: str,
+        destination: str,
+        score: float
+    ) -> bool:
+        return bool(
+            await self._redis.eval(
+                REQUEUE_JOB_SCRIPT,
+                2,
+                source,
+                destination,
+                job_id,
+                score
+            )
+        )
+
+    async def _finish(
+        self, job: ReviewJob,
+        status: str,
+        error: Optional[str] = None,
+        error_status_code: Optional[int] = None
+    ) -> None:
+        job.status = status
+        job.error = error
+        job.error_status_code = error_status_code
+        await self._save(job)
+        await self._redis.zrem(PROCESSING_KEY, job.job_id)
+        logger.info(f"Review job {job.job_id} {status}")
+
+    async def _save(self, job: ReviewJob) -> None:
+        is_finished = job.status in (SUCCEEDED, FAILED)
+        await self._redis.set(
+            self._get_job_key(job.job_id),
+            job.model_dump_json(),
+            ex=JOB_RESULT_TTL if is_finished else None
+        )
+
+    @staticmethod
+    def _get_job_key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _get_queue_score(job: ReviewJob) -> float:
+        return (
+            JOB_PRIORITIES.index(job.priority) * PRIORITY_SCORE_STEP
+            + time.time()
+        )
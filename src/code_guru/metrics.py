@@ -0,0 +1,136 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+from urllib.parse import urlsplit
+
+from prometheus_client import Counter, Gauge, Histogram
+
+
+LATENCY_BUCKETS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300
+)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+TOKEN_BUCKETS = (
+    500, 1000, 2500, 5000, 10_000, 25_000, 50_000, 100_000, 250_000
+)
+
+GITHUB_REQUESTS = Counter(
+    "github_requests_total",
+    "GitHub API requests",
+    ["endpoint", "status", "cached"]
+)
+GITHUB_REQUEST_SECONDS = Histogram(
+    "github_request_duration_seconds",
+    "GitHub API request latency",
+    ["endpoint"],
+    buckets=LATENCY_BUCKETS
+)
+GITHUB_DOWNLOADED_BYTES = Counter(
+    "github_downloaded_bytes_total",
+    "Bytes downloaded from GitHub",
+    ["endpoint"]
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups",
+    ["tier", "result"]
+)
+LOCAL_CACHE_BYTES = Gauge(
+    "local_cache_bytes",
+    "Bytes held in the in-process cache"
+)
+LOCAL_CACHE_ENTRIES = Gauge(
+    "local_cache_entries",
+    "Entries held in the in-process cache"
+)
+REVIEW_FILES = Histogram(
+    "review_files",
+    "Files fetched per review",
+    buckets=COUNT_BUCKETS
+)
+PROMPT_TOKENS = Histogram(
+    "groq_prompt_tokens",
+    "Estimated prompt tokens per Groq request",
+    buckets=TOKEN_BUCKETS
+)
+PROMPT_PREFIXES = Counter(
+    "groq_prompt_prefixes_total",
+    "Groq prompt prefixes by whether they were sent recently",
+    ["result"]
+)
+GROQ_TOKENS = Counter(
+    "groq_tokens_total",
+    "Tokens reported by Groq",
+    ["kind"]
+)
+GROQ_REQUEST_SECONDS = Histogram(
+    "groq_request_duration_seconds",
+    "Groq completion latency",
+    ["model", "status"],
+    buckets=LATENCY_BUCKETS
+)
+GROQ_FALLBACKS = Counter(
+    "groq_model_fallbacks_total",
+    "Groq completions moved off a model",
+    ["model", "status"]
+)
+PREFETCHED_REPOS = Counter(
+    "prefetched_repos_total",
+    "Repositories prefetched into the cache",
+    ["result"]
+)
+REVIEW_STAGE_SECONDS = Histogram(
+    "review_stage_duration_seconds",
+    "Latency of review stages",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+
+server_timings: ContextVar[Optional[dict[str, float]]] = ContextVar(
+    "server_timings",
+    default=None
+)
+
+
+def get_github_endpoint(url: str) -> str:
+    parts = urlsplit(url).path.strip("/").split("/")
+    if parts[0] != "repos":
+        return "other"
+    if len(parts) <= 3:
+        return "repo"
+    if parts[3] == "git" and len(parts) > 4:
+        return parts[4]
+
+    return parts[3]
+
+
+def record_timing(stage: str, seconds: float) -> None:
+    REVIEW_STAGE_SECONDS.labels(stage).observe(seconds)
+    timings = server_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0) + seconds
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(stage, time.perf_counter() - started_at)
+
+
+def record_groq_usage(usage: Any) -> None:
+    if usage is None:
+        return
+
+    GROQ_TOKENS.labels("prompt").inc(usage.prompt_tokens)
+    GROQ_TOKENS.labels("completion").inc(usage.completion_tokens)
+
+
+def format_server_timing(timings: dict[str, float]) -> str:
+    return ", ".join(
+        f"{stage};dur={seconds * 1000:.1f}"
+        for stage, seconds in timings.items()
+    )
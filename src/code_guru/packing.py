@@ -0,0 +1,220 @@
+import math
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import PurePosixPath
+from typing import Iterator
+
+
+CHARS_PER_TOKEN = 3
+MIN_TRUNCATED_FILE_TOKENS = 256
+OMITTED_FILES_BUDGET_SHARE = 0.05
+TRUNCATION_MARKER = "\n... [truncated]"
+FILE_HEADER = "\n--- {path} ---\n"
+
+SOURCE_PRIORITY = 0
+CONFIG_PRIORITY = 1
+GENERATED_PRIORITY = 2
+
+GENERATED_PATTERNS = (
+    "*.lock",
+    "*-lock.json",
+    "*-lock.yaml",
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*.pb.go",
+    "*_pb2.py",
+    "*.generated.*",
+)
+GENERATED_DIRS = {
+    "node_modules",
+    ".venv",
+    "__pycache__",
+    ".idea",
+    ".vscode",
+}
+ROOT_GENERATED_DIRS = {
+    "vendor",
+    "third_party",
+    "venv",
+    "env",
+    "dist",
+    "build",
+    "target",
+    "out",
+    "coverage",
+}
+ASSET_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".svg",
+    ".ttf", ".otf", ".woff", ".woff2", ".eot",
+    ".mp3", ".mp4", ".wav", ".avi", ".mov",
+    ".pdf", ".zip", ".gz", ".tar", ".jar", ".exe", ".dll", ".so",
+    ".pyc", ".class", ".o", ".bin", ".db", ".sqlite3", ".csv",
+}
+CONFIG_SUFFIXES = {
+    ".json", ".yaml", ".yml", ".toml", ".ini", ".cfg", ".conf", ".env",
+    ".xml", ".md", ".rst", ".txt", ".properties", ".gradle",
+}
+CONFIG_NAMES = {
+    "dockerfile", "makefile", "procfile", ".gitignore", ".dockerignore",
+    ".editorconfig", ".env.sample", ".env.example",
+}
+
+
+@dataclass
+class PackedFiles:
+    files_info: dict[str, str] = field(default_factory=dict)
+    truncated_files: list[str] = field(default_factory=list)
+    skipped_files: list[str] = field(default_factory=list)
+    skipped_files_summary: str = ""
+    fits_budget: bool = True
+
+
+@dataclass
+class ChunkedFiles:
+    chunks: list[dict[str, str]] = field(default_factory=list)
+    truncated_files: list[str] = field(default_factory=list)
+    skipped_files: list[str] = field(default_factory=list)
+    skipped_files_summary: str = ""
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def estimate_file_tokens(path: str, content: str) -> int:
+    return math.ceil(
+        (len(FILE_HEADER.format(path=path)) + len(content)) / CHARS_PER_TOKEN
+    )
+
+
+def iter_file_sections(files_info: dict[str, str]) -> Iterator[str]:
+    for path in sorted(files_info):
+        yield FILE_HEADER.format(path=path)
+        yield files_info[path]
+
+
+def get_file_priority(path: str) -> int:
+    file_path = PurePosixPath(path)
+    name = file_path.name.lower()
+
+    if (
+        GENERATED_DIRS.intersection(file_path.parts[:-1])
+        or ROOT_GENERATED_DIRS.intersection(file_path.parts[:-1][:1])
+        or file_path.suffix.lower() in ASSET_SUFFIXES
+        or any(fnmatch(name, pattern) for pattern in GENERATED_PATTERNS)
+    ):
+        return GENERATED_PRIORITY
+    if name in CONFIG_NAMES or file_path.suffix.lower() in CONFIG_SUFFIXES:
+        return CONFIG_PRIORITY
+
+    return SOURCE_PRIORITY
+
+
+def _rank_files(files_info: dict[str, str]) -> list[tuple[int, int, str]]:
+    return sorted(
+        (
+            get_file_priority(path),
+            estimate_file_tokens(path, content),
+            path,
+        )
+        for path, content in files_info.items()
+    )
+
+
+def _truncate_content(path: str, content: str, token_budget: int) -> str:
+    length = token_budget * CHARS_PER_TOKEN
+    while length > 0:
+        truncated = content[:length] + TRUNCATION_MARKER
+        if estimate_file_tokens(path, truncated) <= token_budget:
+            return truncated
+        length = int(length * 0.9)
+
+    return TRUNCATION_MARKER
+
+
+def pack_files_info(
+    files_info: dict[str, str],
+    token_budget: int
+) -> PackedFiles:
+    packed_files = PackedFiles()
+    omitted_files_budget = int(token_budget * OMITTED_FILES_BUDGET_SHARE)
+    remaining = token_budget - omitted_files_budget
+
+    for priority, tokens, path in _rank_files(files_info):
+        if priority == GENERATED_PRIORITY:
+            packed_files.skipped_files.append(path)
+        elif tokens <= remaining:
+            packed_files.files_info[path] = files_info[path]
+            remaining -= tokens
+        elif remaining >= MIN_TRUNCATED_FILE_TOKENS:
+            content = _truncate_content(path, files_info[path], remaining)
+            packed_files.files_info[path] = content
+            packed_files.truncated_files.append(path)
+            packed_files.fits_budget = False
+            remaining -= estimate_file_tokens(path, content)
+        else:
+            packed_files.skipped_files.append(path)
+            packed_files.fits_budget = False
+
+    packed_files.skipped_files_summary = _summarize_skipped_files(
+        skipped_files=packed_files.skipped_files,
+        token_budget=omitted_files_budget
+    )
+
+    return packed_files
+
+
+def chunk_files_info(
+    files_info: dict[str, str],
+    token_budget: int,
+    max_chunks: int
+) -> ChunkedFiles:
+    chunked_files = ChunkedFiles()
+    chunk, remaining = {}, token_budget
+
+    for priority, tokens, path in _rank_files(files_info):
+        if priority == GENERATED_PRIORITY:
+            chunked_files.skipped_files.append(path)
+            continue
+
+        if tokens > remaining and chunk:
+            chunked_files.chunks.append(chunk)
+            chunk, remaining = {}, token_budget
+        if len(chunked_files.chunks) >= max_chunks:
+            chunked_files.skipped_files.append(path)
+            continue
+
+        content = files_info[path]
+        if tokens > remaining:
+            content = _truncate_content(path, content, remaining)
+            tokens = estimate_file_tokens(path, content)
+            chunked_files.truncated_files.append(path)
+        chunk[path] = content
+        remaining -= tokens
+
+    if chunk:
+        chunked_files.chunks.append(chunk)
+
+    chunked_files.skipped_files_summary = _summarize_skipped_files(
+        skipped_files=chunked_files.skipped_files,
+        token_budget=int(token_budget * OMITTED_FILES_BUDGET_SHARE)
+    )
+
+    return chunked_files
+
+
+def _summarize_skipped_files(
+    skipped_files: list[str],
+    token_budget: int
+) -> str:
+    listed_files, length = [], 0
+    for index, path in enumerate(skipped_files):
+        more_files_note = f" (+{len(skipped_files) - index} more)"
+        length += len(path) + len(", ")
+        tokens = math.ceil((length + len(more_files_note)) / CHARS_PER_TOKEN)
+        if tokens > token_budget:
+            return ", ".join(listed_files) + more_files_note
+        listed_files.append(path)
+
+    return ", ".join(listed_files)
@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import logging
+from collections import Counter
+
+from httpx import AsyncClient
+from pydantic import ValidationError
+
+from src.code_guru.exceptions import GitHubError
+from src.code_guru.interfaces import GitHubServiceInterface
+from src.code_guru.metrics import PREFETCHED_REPOS
+from src.code_guru.rate_limit import GitHubRateLimiter
+from src.code_guru.schemas import PrefetchRequest
+from src.code_guru.services import GitHubService
+from src.database.base import FailSafeRedis, redis
+from src.git_hub.api import create_git_hub_client
+from src.settings import (
+    PREFETCH_CONCURRENCY,
+    PREFETCH_REPOS_PER_MINUTE,
+    PREFETCH_RESERVED_TOKENS,
+)
+
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class RepoPrefetcher:
+    def __init__(
+        self, git_hub_service: GitHubServiceInterface,
+        git_hub_client: AsyncClient,
+        concurrency: int = PREFETCH_CONCURRENCY,
+        repos_per_minute: int = PREFETCH_REPOS_PER_MINUTE
+    ):
+        self._git_hub_service = git_hub_service
+        self._git_hub_client = git_hub_client
+        self._concurrency = concurrency
+        self._interval = 60 / repos_per_minute
+
+    async def prefetch(self, github_repo_urls: list[str]) -> dict[str, int]:
+        logger.info(f"Prefetching {len(github_repo_urls)} repositories")
+        semaphore = asyncio.Semaphore(self._concurrency)
+        rate_limited = asyncio.Event()
+        results = Counter()
+
+        async def prefetch_repo(github_repo_url: str) -> None:
+            async with semaphore:
+                if rate_limited.is_set():
+                    return
+                result = await self._prefetch_repo(github_repo_url)
+            if result == "rate_limited":
+                rate_limited.set()
+            results[result] += 1
+            PREFETCHED_REPOS.labels(result).inc()
+
+        tasks = []
+        try:
+            for index, github_repo_url in enumerate(github_repo_urls):
+                if index:
+                    await asyncio.sleep(self._interval)
+                if rate_limited.is_set():
+                    break
+                tasks.append(
+                    asyncio.ensure_future(prefetch_repo(github_repo_url))
+                )
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        results["skipped"] = len(github_repo_urls) - sum(results.values())
+        logger.info(
+            f"Prefetch finished: {results['prefetched']} prefetched,"
+            f" {results['failed'] + results['rate_limited']} failed,"
+            f" {results['skipped']} skipped"
+        )
+        return dict(results)
+
+    async def _prefetch_repo(self, github_repo_url: str) -> str:
+        try:
+            files_info = await self._git_hub_service.get_files_info(
+                client=self._git_hub_client,
+                url=self._git_hub_service.get_api_url_from_usual_url(
+                    github_repo_url
+                )
+            )
+        except GitHubError as exc:
+            logger.warning(
+                f"Failed to prefetch {github_repo_url}: {exc.message}"
+            )
+            if exc.status_code == 429:
+                return "rate_limited"
+            return "failed"
+        except Exception:
+            logger.exception(f"Failed to prefetch {github_repo_url}")
+            return "failed"
+
+        logger.info(f"Prefetched {len(files_info)} files of {github_repo_url}")
+        return "prefetched"
+
+
+def create_prefetch_git_hub_service(redis: FailSafeRedis) -> GitHubService:
+    return GitHubService(
+        redis=redis,
+        rate_limiter=GitHubRateLimiter(
+            redis=redis,
+            reserved_tokens=PREFETCH_RESERVED_TOKENS
+        )
+    )
+
+
+async def main(github_repo_urls: list[str]) -> None:
+    cache_redis = FailSafeRedis(redis=redis)
+    try:
+        async with create_git_hub_client() as git_hub_client:
+            prefetcher = RepoPrefetcher(
+                git_hub_service=create_prefetch_git_hub_service(
+                    redis=cache_redis
+                ),
+                git_hub_client=git_hub_client
+            )
+            await prefetcher.prefetch(github_repo_urls)
+    finally:
+        await redis.aclose(close_connection_pool=True)
+
+
+def parse_args() -> PrefetchRequest:
+    parser = argparse.ArgumentParser(
+        description="Warm the GitHub cache for upcoming reviews"
+    )
+    parser.add_argument("github_repo_urls", nargs="*")
+    parser.add_argument(
+        "--file", type=argparse.FileType("r"),
+        help="read repository URLs from this file, one per line"
+    )
+    args = parser.parse_args()
+
+    github_repo_urls = list(args.github_repo_urls)
+    if args.file is not None:
+        github_repo_urls.extend(
+            line.strip() for line in args.file if line.strip()
+        )
+    try:
+        return PrefetchRequest(github_repo_urls=github_repo_urls)
+    except ValidationError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parse_args().github_repo_urls))
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import textwrap
+
+from src.code_guru.cache import LocalCache
+from src.code_guru.metrics import PROMPT_PREFIXES
+from src.settings import (
+    CANDIDATE_LEVELS,
+    GROQ_PROMPT_PREFIX_CACHE_SIZE,
+    GROQ_PROMPT_PREFIX_TTL,
+)
+
+
+class PromptTemplate:
+    def __init__(self, template: str):
+        self._template = "\n".join(
+            line.rstrip()
+            for line in textwrap.dedent(template).strip().splitlines()
+        )
+        self._prompts = {
+            candidate_level: self._template.format(
+                candidate_level=candidate_level
+            )
+            for candidate_level in CANDIDATE_LEVELS
+        }
+
+    def render(self, candidate_level: str) -> str:
+        prompt = self._prompts.get(candidate_level)
+        if prompt is None:
+            prompt = self._template.format(candidate_level=candidate_level)
+
+        return prompt
+
+
+REVIEW_PROMPT = PromptTemplate("""
+    You are a professional Code Reviewer, tasked with reviewing code
+    quality for a {candidate_level} developer. Users will provide you with:
+    1. An **assignment description** outlining the task requirements.
+    2. The **content of files**, each one preceded by a header line
+       in the format `--- filename ---`.
+
+    Your job is to analyze the provided code and assignment description,
+    then deliver a detailed, structured review.
+
+    Your response must follow this exact format:
+    1. **Downsides**:
+       - List and describe specific downsides or issues with the project
+       (e.g., poor structure, lack of comments, security risks).
+    2. **Rating**:
+       - Provide an overall rating for the code, considering the expected
+       level of a {candidate_level} developer (e.g., "Rating: 3/5").
+    3. **Thoughts**:
+       - Share your overall thoughts and suggestions on the repository,
+       focusing on areas for improvement and strengths.
+
+    Be constructive and provide actionable feedback to help the developer
+    improve. Ensure your feedback is specific and considers the provided
+    code and its context.
+""")
+
+DELTA_REVIEW_PROMPT = PromptTemplate("""
+    You are a professional Code Reviewer, tasked with re-reviewing code
+    quality for a {candidate_level} developer who has pushed changes
+    after a previous review. Users will provide you with:
+    1. An **assignment description** outlining the task requirements.
+    2. The **previous review** of the repository.
+    3. A list of **removed files**.
+    4. The **content of changed files**, each one preceded by a header
+       line in the format `--- filename ---`.
+
+    Your job is to update the previous review: keep the findings that
+    still apply to unchanged files, drop the ones the changes resolved
+    and add new findings about the changed files.
+
+    Your response must follow this exact format:
+    1. **Downsides**:
+       - List and describe specific downsides or issues with the project
+       (e.g., poor structure, lack of comments, security risks).
+    2. **Rating**:
+       - Provide an overall rating for the code, considering the expected
+       level of a {candidate_level} developer (e.g., "Rating: 3/5").
+    3. **Thoughts**:
+       - Share your overall thoughts and suggestions on the repository,
+       focusing on what improved since the previous review.
+
+    Be constructive and provide actionable feedback to help the developer
+    improve.
+""")
+
+PARTIAL_REVIEW_PROMPT = PromptTemplate("""
+    You are a professional Code Reviewer, tasked with reviewing one part
+    of a larger repository written by a {candidate_level} developer.
+    Users will provide you with:
+    1. An **assignment description** outlining the task requirements.
+    2. The **content of some of the files** of the repository, each
+       one preceded by a header line in the format `--- filename ---`.
+
+    Your job is to list the specific issues and strengths you find in
+    these files, referencing the file names. Other parts of the
+    repository are reviewed separately and your findings will be merged
+    with theirs, so do not give a rating and do not comment on files
+    you have not been shown. Be concise.
+""")
+
+MERGE_PROMPT = PromptTemplate("""
+    You are a professional Code Reviewer, tasked with reviewing code
+    quality for a {candidate_level} developer. The repository was too
+    large to review at once, so it was split into parts and each part
+    was reviewed separately. Users will provide you with:
+    1. An **assignment description** outlining the task requirements.
+    2. The **findings** from the reviews of every part.
+
+    Your job is to merge the findings into a single detailed, structured
+    review of the whole repository, removing duplicates.
+
+    Your response must follow this exact format:
+    1. **Downsides**:
+       - List and describe specific downsides or issues with the project
+       (e.g., poor structure, lack of comments, security risks).
+    2. **Rating**:
+       - Provide an overall rating for the code, considering the expected
+       level of a {candidate_level} developer (e.g., "Rating: 3/5").
+    3. **Thoughts**:
+       - Share your overall thoughts and suggestions on the repository,
+       focusing on areas for improvement and strengths.
+
+    Be constructive and provide actionable feedback to help the developer
+    improve.
+""")
+
+prompt_prefixes = LocalCache(
+    max_size=GROQ_PROMPT_PREFIX_CACHE_SIZE,
+    ttl=GROQ_PROMPT_PREFIX_TTL
+)
+
+
+def build_messages(
+    system_prompt: str,
+    assignment_description: str,
+    content: list[str]
+) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": f"1. Assignment description - {assignment_description}"
+        },
+        {"role": "user", "content": "".join(content)},
+    ]
+
+
+def get_prompt_prefix_hash(messages: list[dict[str, str]]) -> str:
+    return hashlib.sha256(
+        json.dumps(messages[:-1]).encode("utf-8")
+    ).hexdigest()
+
+
+def record_prompt_prefix(messages: list[dict[str, str]]) -> str:
+    prefix_hash = get_prompt_prefix_hash(messages)
+    is_reused = prompt_prefixes.get(prefix_hash) is not None
+    PROMPT_PREFIXES.labels("reused" if is_reused else "new").inc()
+    prompt_prefixes.set(prefix_hash, True, size=1)
+
+    return prefix_hash
@@ -0,0 +1,355 @@
+import asyncio
+import hashlib
+import itertools
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from httpx import Response
+
+from src.code_guru.exceptions import GitHubError
+from src.database.base import FailSafeRedis
+from src.settings import (
+    GITHUB_API_TOKENS,
+    GITHUB_RATE_LIMIT_MAX_WAIT,
+    GITHUB_TOKEN_BURST,
+    GITHUB_TOKEN_HOURLY_BUDGET,
+    GROQ_MODEL_CONCURRENCY,
+    GROQ_MODEL_TOKENS_PER_MINUTE,
+    GROQ_TOKENS_PER_MINUTE,
+)
+
+
+logger = logging.getLogger("uvicorn.error")
+
+RATE_LIMIT_STATE_TTL = 60 * 60 * 2
+SECONDARY_RATE_LIMIT_WAIT = 60
+MODEL_LEASE_TTL = 60 * 5
+MODEL_LEASE_POLL_INTERVAL = 1
+
+ACQUIRE_TOKEN_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local required = 1 + tonumber(ARGV[5])
+local best_index, best_tokens, min_wait = 0, 0, -1
+local windows_reset = {}
+
+for index, key in ipairs(KEYS) do
+    local state = redis.call(
+        "hmget", key, "tokens", "updated_at", "blocked_until", "reset_at"
+    )
+    local tokens = tonumber(state[1]) or capacity
+    local updated_at = tonumber(state[2]) or now
+    local blocked_until = tonumber(state[3]) or 0
+    local reset_at = tonumber(state[4]) or 0
+
+    local wait = 0
+    if reset_at > now then
+        if tokens < required then
+            wait = reset_at - now
+        end
+    else
+        if reset_at > 0 then
+            tokens, updated_at = capacity, now
+            windows_reset[index] = true
+        end
+        tokens = math.min(
+            capacity, tokens + math.max(0, now - updated_at) * rate
+        )
+        if tokens < required then
+            wait = (required - tokens) / rate
+        end
+    end
+    if blocked_until > now then
+        wait = math.max(wait, blocked_until - now)
+    end
+
+    if wait == 0 and tokens > best_tokens then
+        best_index, best_tokens = index, tokens
+    elseif wait > 0 and (min_wait < 0 or wait < min_wait) then
+        min_wait = wait
+    end
+end
+
+if best_index > 0 then
+    redis.call(
+        "hset", KEYS[best_index],
+        "tokens", tostring(best_tokens - 1),
+        "updated_at", tostring(now)
+    )
+    if windows_reset[best_index] then
+        redis.call("hdel", KEYS[best_index], "reset_at")
+    end
+    redis.call("expire", KEYS[best_index], ARGV[4])
+    return {best_index, "0"}
+end
+return {0, tostring(min_wait)}
+"""
+
+UPDATE_TOKEN_SCRIPT = """
+local remaining = tonumber(ARGV[1])
+local blocked_until = tonumber(ARGV[2])
+local reset_at = tonumber(ARGV[6])
+if tonumber(ARGV[5]) > 0 then
+    redis.call("hincrbyfloat", KEYS[1], "tokens", ARGV[5])
+end
+local state = redis.call(
+    "hmget", KEYS[1], "tokens", "blocked_until", "reset_at"
+)
+local tokens = tonumber(state[1]) or math.huge
+
+if remaining >= 0 and (
+    tokens > remaining
+    or (reset_at > 0 and tonumber(state[3]) ~= reset_at)
+) then
+    redis.call(
+        "hset", KEYS[1],
+        "tokens", tostring(remaining),
+        "updated_at", ARGV[3]
+    )
+    if reset_at > 0 then
+        redis.call("hset", KEYS[1], "reset_at", tostring(reset_at))
+    end
+end
+if blocked_until > (tonumber(state[2]) or 0) then
+    redis.call("hset", KEYS[1], "blocked_until", tostring(blocked_until))
+end
+redis.call("expire", KEYS[1], ARGV[4])
+return 1
+"""
+
+ACQUIRE_MODEL_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local requested = math.min(tonumber(ARGV[4]), capacity)
+local state = redis.call(
+    "hmget", KEYS[1], "tokens", "updated_at", "blocked_until"
+)
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+local blocked_until = tonumber(state[3]) or 0
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+
+if blocked_until > now then
+    return {0, tostring(blocked_until - now)}
+end
+redis.call("zremrangebyscore", KEYS[2], "-inf", now)
+if redis.call("zcard", KEYS[2]) >= tonumber(ARGV[5]) then
+    local leases = redis.call("zrange", KEYS[2], 0, 0, "WITHSCORES")
+    local wait = math.min(tonumber(leases[2]) - now, tonumber(ARGV[9]))
+    return {0, tostring(wait)}
+end
+if tokens < requested then
+    return {0, tostring((requested - tokens) / rate)}
+end
+
+redis.call(
+    "hset", KEYS[1],
+    "tokens", tostring(tokens - requested),
+    "updated_at", tostring(now)
+)
+redis.call("expire", KEYS[1], ARGV[8])
+redis.call("zadd", KEYS[2], now + tonumber(ARGV[7]), ARGV[6])
+redis.call("expire", KEYS[2], ARGV[7])
+return {1, "0"}
+"""
+
+RELEASE_MODEL_SCRIPT = """
+redis.call("zrem", KEYS[2], ARGV[1])
+local adjustment = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local blocked_until = tonumber(ARGV[4])
+local state = redis.call("hmget", KEYS[1], "tokens", "blocked_until")
+
+if adjustment ~= 0 and state[1] then
+    local tokens = math.min(capacity, tonumber(state[1]) + adjustment)
+    redis.call("hset", KEYS[1], "tokens", tostring(tokens))
+end
+if blocked_until > (tonumber(state[2]) or 0) then
+    redis.call("hset", KEYS[1], "blocked_until", tostring(blocked_until))
+end
+redis.call("expire", KEYS[1], ARGV[5])
+return 1
+"""
+
+
+@dataclass
+class ModelLease:
+    model: str
+    lease_id: str
+    tokens: int
+    used_tokens: Optional[int] = None
+
+
+class GitHubRateLimiter:
+    def __init__(
+        self, redis: FailSafeRedis,
+        tokens: list[str] = GITHUB_API_TOKENS,
+        reserved_tokens: int = 0
+    ):
+        self._redis = redis
+        self._reserved_tokens = reserved_tokens
+        self._tokens = list(dict.fromkeys(tokens))
+        self._keys = {
+            token: (
+                "github_rate:"
+                + hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+            )
+            for token in self._tokens
+        }
+        self._fallback_tokens = itertools.cycle(self._tokens)
+
+    async def acquire(self) -> str:
+        deadline = time.monotonic() + GITHUB_RATE_LIMIT_MAX_WAIT
+        while True:
+            result = await self._redis.eval(
+                ACQUIRE_TOKEN_SCRIPT,
+                len(self._tokens),
+                *self._keys.values(),
+                time.time(),
+                GITHUB_TOKEN_HOURLY_BUDGET / 3600,
+                GITHUB_TOKEN_BURST,
+                RATE_LIMIT_STATE_TTL,
+                self._reserved_tokens
+            )
+            if result is None and self._tokens:
+                return next(self._fallback_tokens)
+
+            index, wait = result or (0, -1)
+            if int(index) > 0:
+                return self._tokens[int(index) - 1]
+
+            wait = float(wait)
+            if wait < 0:
+                raise GitHubError(
+                    status_code=500,
+                    message="No GitHub API tokens configured"
+                )
+            if time.monotonic() + wait > deadline:
+                raise GitHubError(
+                    status_code=429,
+                    message=(
+                        f"GitHub rate limit exhausted,"
+                        f" retry in {math.ceil(wait)} seconds"
+                    )
+                )
+            logger.info(f"GitHub rate limit reached, waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+    async def update(self, token: str, response: Response) -> bool:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_at = response.headers.get("X-RateLimit-Reset")
+        blocked_until = self._get_blocked_until(response)
+
+        await self._redis.eval(
+            UPDATE_TOKEN_SCRIPT,
+            1,
+            self._keys[token],
+            -1 if remaining is None else int(remaining),
+            blocked_until or 0,
+            time.time(),
+            RATE_LIMIT_STATE_TTL,
+            1 if response.status_code == 304 else 0,
+            int(reset_at) if reset_at and reset_at.isdigit() else 0
+        )
+
+        return (
+            response.status_code in (403, 429)
+            and blocked_until is not None
+        )
+
+    @staticmethod
+    def _get_blocked_until(response: Response) -> Optional[float]:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return time.time() + int(retry_after)
+
+        reset_time = response.headers.get("X-RateLimit-Reset")
+        if (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            and reset_time is not None
+        ):
+            return float(reset_time)
+
+        if response.status_code == 429:
+            return time.time() + SECONDARY_RATE_LIMIT_WAIT
+
+        return None
+
+
+class GroqRateLimiter:
+    def __init__(
+        self, redis: FailSafeRedis,
+        concurrency: int = GROQ_MODEL_CONCURRENCY,
+        tokens_per_minute: int = GROQ_TOKENS_PER_MINUTE,
+        model_tokens_per_minute: dict[str, int] = GROQ_MODEL_TOKENS_PER_MINUTE
+    ):
+        self._redis = redis
+        self._concurrency = concurrency
+        self._tokens_per_minute = tokens_per_minute
+        self._model_tokens_per_minute = model_tokens_per_minute
+
+    def _get_keys(self, model: str) -> tuple[str, str]:
+        return f"groq_rate:{model}", f"groq_leases:{model}"
+
+    def _get_capacity(self, model: str) -> int:
+        return self._model_tokens_per_minute.get(
+            model,
+            self._tokens_per_minute
+        )
+
+    async def acquire(
+        self, model: str,
+        tokens: int
+    ) -> tuple[Optional[ModelLease], float]:
+        lease = ModelLease(
+            model=model,
+            lease_id=uuid.uuid4().hex,
+            tokens=min(tokens, self._get_capacity(model))
+        )
+        result = await self._redis.eval(
+            ACQUIRE_MODEL_SCRIPT,
+            2,
+            *self._get_keys(model),
+            time.time(),
+            self._get_capacity(model) / 60,
+            self._get_capacity(model),
+            tokens,
+            self._concurrency,
+            lease.lease_id,
+            MODEL_LEASE_TTL,
+            RATE_LIMIT_STATE_TTL,
+            MODEL_LEASE_POLL_INTERVAL
+        )
+        if result is None:
+            return lease, 0
+
+        acquired, wait = result
+        if int(acquired):
+            return lease, 0
+
+        return None, float(wait)
+
+    async def release(
+        self, lease: ModelLease,
+        retry_after: Optional[float] = None
+    ) -> None:
+        adjustment = 0
+        if lease.used_tokens is not None:
+            adjustment = lease.tokens - lease.used_tokens
+
+        await self._redis.eval(
+            RELEASE_MODEL_SCRIPT,
+            2,
+            *self._get_keys(lease.model),
+            lease.lease_id,
+            adjustment,
+            self._get_capacity(lease.model),
+            0 if retry_after is None else time.time() + retry_after,
+            RATE_LIMIT_STATE_TTL
+        )
@@ -1,8 +1,26 @@
 from fastapi import APIRouter
 
-from src.code_guru.controllers import code_review_controller
+from src.code_guru.controllers import (
+    cache_stats_controller,
+    code_review_batch_controller,
+    code_review_controller,
+    code_review_stream_controller,
+    metrics_controller,
+    prefetch_controller,
+    review_job_result_controller,
+    review_job_status_controller,
+    submit_review_job_controller,
+)
 
 
 router = APIRouter()
 
 router.post("/review/")(code_review_controller)
+router.post("/review/stream/")(code_review_stream_controller)
+router.post("/review/batch/")(code_review_batch_controller)
+router.post("/review/jobs/", status_code=202)(submit_review_job_controller)
+router.get("/review/jobs/{job_id}/")(review_job_status_controller)
+router.get("/review/jobs/{job_id}/result/")(review_job_result_controller)
+router.get("/cache/stats/")(cache_stats_controller)
+router.post("/cache/prefetch/", status_code=202)(prefetch_controller)
+router.get("/metrics")(metrics_controller)
@@ -1,9 +1,14 @@
+from typing import Optional
+
 from pydantic import BaseModel, field_validator
 
 from src.code_guru.validators import (
     validate_candidate_level,
     validate_github_repo_url,
+    validate_github_repo_urls,
+    validate_job_priority,
 )
+from src.settings import PREFETCH_MAX_REPOS
 
 
 class CodeReviewRequest(BaseModel):
@@ -27,3 +32,79 @@ class CodeReviewRequest(BaseModel):
 class CodeReviewResponse(BaseModel):
     filenames: list[str]
     review_result: str
+    truncated_files: list[str] = []
+    skipped_files: list[str] = []
+    base_sha: Optional[str] = None
+
+
+class LastReview(BaseModel):
+    head_sha: str
+    review: CodeReviewResponse
+
+
+class BatchReviewRequest(BaseModel):
+    assignment_description: str
+    github_repo_urls: list[str]
+    candidate_level: str
+
+    @field_validator("candidate_level")
+    @classmethod
+    def validate_candidate_level(cls, candidate_level: str) -> str:
+        validate_candidate_level(candidate_level)
+        return candidate_level
+
+    @field_validator("github_repo_urls")
+    @classmethod
+    def validate_github_repo_urls(
+        cls, github_repo_urls: list[str]
+    ) -> list[str]:
+        validate_github_repo_urls(github_repo_urls)
+        return list(dict.fromkeys(github_repo_urls))
+
+
+class PrefetchRequest(BaseModel):
+    github_repo_urls: list[str]
+
+    @field_validator("github_repo_urls")
+    @classmethod
+    def validate_github_repo_urls(
+        cls, github_repo_urls: list[str]
+    ) -> list[str]:
+        validate_github_repo_urls(
+            github_repo_urls,
+            max_repos=PREFETCH_MAX_REPOS
+        )
+        return list(dict.fromkeys(github_repo_urls))
+
+
+class PrefetchResponse(BaseModel):
+    repos_count: int
+
+
+class ReviewJobRequest(CodeReviewRequest):
+    priority: str = "normal"
+
+    @field_validator("priority")
+    @classmethod
+    def validate_priority(cls, priority: str) -> str:
+        validate_job_priority(priority)
+        return priority
+
+
+class ReviewJob(BaseModel):
+    job_id: str
+    status: str
+    priority: str
+    attempts: int = 0
+    request: CodeReviewRequest
+    result: Optional[CodeReviewResponse] = None
+    error: Optional[str] = None
+    error_status_code: Optional[int] = None
+
+
+class ReviewJobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    priority: str
+    attempts: int
+    error: Optional[str] = None
@@ -0,0 +1,125 @@
+import struct
+import zlib
+
+from src.code_guru.exceptions import SerializationError
+from src.settings import CACHE_COMPRESSION_LEVEL, CACHE_COMPRESSION_MIN_SIZE
+
+
+MAGIC = b"CG"
+VERSION = 1
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+
+HEADER = struct.Struct("<2sBB")
+LENGTH = struct.Struct("<I")
+
+
+def _pack(body: bytes) -> bytes:
+    if len(body) >= CACHE_COMPRESSION_MIN_SIZE:
+        compressed = zlib.compress(body, CACHE_COMPRESSION_LEVEL)
+        if len(compressed) < len(body):
+            return HEADER.pack(MAGIC, VERSION, CODEC_ZLIB) + compressed
+
+    return HEADER.pack(MAGIC, VERSION, CODEC_NONE) + body
+
+
+def _unpack(data: bytes) -> bytes:
+    try:
+        magic, version, codec = HEADER.unpack_from(data)
+    except struct.error as exc:
+        raise SerializationError("Truncated cache entry") from exc
+
+    if magic != MAGIC or version != VERSION:
+        raise SerializationError("Unknown cache entry format")
+
+    body = memoryview(data)[HEADER.size:]
+    if codec == CODEC_ZLIB:
+        try:
+            return zlib.decompress(body)
+        except zlib.error as exc:
+            raise SerializationError("Corrupted cache entry") from exc
+    if codec == CODEC_NONE:
+        return bytes(body)
+
+    raise SerializationError(f"Unknown cache entry codec - {codec}")
+
+
+def _encode_mapping(mapping: dict[str, str]) -> list[bytes]:
+    parts = [LENGTH.pack(len(mapping))]
+    for key, value in mapping.items():
+        for field in (key.encode("utf-8"), value.encode("utf-8")):
+            parts.append(LENGTH.pack(len(field)))
+            parts.append(field)
+
+    return parts
+
+
+def _read_field(body: bytes, position: int) -> tuple[bytes, int]:
+    (length,) = LENGTH.unpack_from(body, position)
+    position += LENGTH.size
+    if position + length > len(body):
+        raise SerializationError("Truncated cache entry")
+
+    return body[position:position + length], position + length
+
+
+def _decode_mapping(
+    body: bytes,
+    position: int = 0
+) -> tuple[dict[str, str], int]:
+    mapping = {}
+    try:
+        (count,) = LENGTH.unpack_from(body, position)
+        position += LENGTH.size
+        for _ in range(count):
+            key, position = _read_field(body, position)
+            value, position = _read_field(body, position)
+            mapping[key.decode("utf-8")] = value.decode("utf-8")
+    except (struct.error, UnicodeDecodeError) as exc:
+        raise SerializationError("Malformed cache entry") from exc
+
+    return mapping, position
+
+
+def serialize_files_info(files_info: dict[str, str]) -> bytes:
+    return _pack(b"".join(_encode_mapping(files_info)))
+
+
+def deserialize_files_info(data: bytes) -> dict[str, str]:
+    files_info, _ = _decode_mapping(_unpack(data))
+
+    return files_info
+
+
+def serialize_cached_response(
+    validators: dict[str, str],
+    content: bytes
+) -> bytes:
+    parts = _encode_mapping(validators)
+    parts.append(LENGTH.pack(len(content)))
+    parts.append(content)
+
+    return _pack(b"".join(parts))
+
+
+def deserialize_cached_response(data: bytes) -> tuple[dict[str, str], bytes]:
+    body = _unpack(data)
+    validators, position = _decode_mapping(body)
+    try:
+        content, _ = _read_field(body, position)
+    except struct.error as exc:
+        raise SerializationError("Malformed cache entry") from exc
+
+    return validators, content
+
+
+def serialize_content(content: str) -> bytes:
+    return _pack(content.encode("utf-8"))
+
+
+def deserialize_content(data: bytes) -> str:
+    try:
+        return _unpack(data).decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise SerializationError("Malformed cache entry") from exc
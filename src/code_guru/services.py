@@ -1,62 +1,702 @@
-import base64
+import asyncio
+import codecs
+import hashlib
+import json
 import logging
+import math
+import random
 import time
-from typing import Optional
+from typing import Any, AsyncIterator, Callable, Optional
 
-from groq import APIStatusError, Groq
-from httpx import AsyncClient
-from redis.asyncio import Redis
+from groq import APIStatusError, AsyncGroq
+from httpx import AsyncClient, Response
 
-from src.code_guru.exceptions import ChatBotError, GitHubError
+from src.code_guru.archives import TarGzStreamParser
+from src.code_guru.cache import (
+    LocalCache,
+    ReviewCache,
+    cache_stats,
+    local_cache as default_local_cache,
+)
+from src.code_guru.concurrency import ProgressTask, gather_fail_fast
+from src.code_guru.exceptions import (
+    BaseAPIException,
+    ChatBotError,
+    GitHubError,
+    SerializationError,
+)
+from src.code_guru.filters import (
+    BINARY_SNIFF_SIZE,
+    ByteBudget,
+    FileFilter,
+    file_filter as default_file_filter,
+    is_binary_content,
+)
 from src.code_guru.interfaces import (
     CodeReviewServiceInterface,
     GitHubServiceInterface,
     GroqAIServiceInterface,
 )
-from src.code_guru.schemas import CodeReviewRequest, CodeReviewResponse
-from src.settings import GITHUB_API_TOKEN
+from src.code_guru.metrics import (
+    GITHUB_DOWNLOADED_BYTES,
+    GITHUB_REQUEST_SECONDS,
+    GITHUB_REQUESTS,
+    GROQ_FALLBACKS,
+    GROQ_REQUEST_SECONDS,
+    PROMPT_TOKENS,
+    REVIEW_FILES,
+    get_github_endpoint,
+    record_groq_usage,
+    record_timing,
+    track_stage,
+)
+from src.code_guru.packing import (
+    ChunkedFiles,
+    PackedFiles,
+    chunk_files_info,
+    estimate_tokens,
+    get_file_priority,
+    iter_file_sections,
+    pack_files_info,
+)
+from src.code_guru.prompts import (
+    DELTA_REVIEW_PROMPT,
+    MERGE_PROMPT,
+    PARTIAL_REVIEW_PROMPT,
+    REVIEW_PROMPT,
+    build_messages,
+    record_prompt_prefix,
+)
+from src.code_guru.rate_limit import (
+    GitHubRateLimiter,
+    GroqRateLimiter,
+    ModelLease,
+)
+from src.code_guru.schemas import (
+    BatchReviewRequest,
+    CodeReviewRequest,
+    CodeReviewResponse,
+    LastReview,
+)
+from src.code_guru.serializers import (
+    deserialize_cached_response,
+    deserialize_content,
+    deserialize_files_info,
+    serialize_cached_response,
+    serialize_content,
+    serialize_files_info,
+)
+from src.database.base import FailSafeRedis
+from src.settings import (
+    BATCH_REVIEW_CONCURRENCY,
+    CACHE_MGET_BATCH_SIZE,
+    GITHUB_ARCHIVE_MIN_REPO_SIZE_KB,
+    GITHUB_BLOB_CACHE_TTL,
+    GITHUB_CONDITIONAL_CACHE_TTL,
+    GITHUB_MAX_CONCURRENCY,
+    GITHUB_MAX_FILE_SIZE,
+    GITHUB_REVIEW_CONCURRENCY,
+    GITHUB_TREE_CACHE_TTL,
+    GROQ_CONTEXT_WINDOW,
+    GROQ_FALLBACK_MODELS,
+    GROQ_LIGHT_MODEL,
+    GROQ_LIGHT_MODEL_LEVELS,
+    GROQ_LIGHT_MODEL_MAX_PROMPT_TOKENS,
+    GROQ_MAX_COMPLETION_TOKENS,
+    GROQ_MAX_RETRIES,
+    GROQ_MODEL,
+    GROQ_PARTIAL_COMPLETION_TOKENS,
+    GROQ_RATE_LIMIT_MAX_WAIT,
+    GROQ_RETRY_BACKOFF,
+    REVIEW_MAP_CHUNK_TOKENS,
+    REVIEW_MAP_CONCURRENCY,
+    REVIEW_MAX_TOTAL_TOKENS,
+)
 
 
 logger = logging.getLogger("uvicorn.error")
 
+GITHUB_COMPARE_MAX_FILES = 300
+GITHUB_COMPARE_FALLBACK_STATUS_CODES = {404, 422}
+GITHUB_RAW_MEDIA_TYPE = "application/vnd.github.raw+json"
+GROQ_RETRY_STATUS_CODES = {429, 503}
+
+github_semaphore = asyncio.Semaphore(GITHUB_MAX_CONCURRENCY)
+
 
 class CodeReviewService(CodeReviewServiceInterface):
     def __init__(
         self, git_hub_service: GitHubServiceInterface,
-        groq_ai_service: GroqAIServiceInterface
+        groq_ai_service: GroqAIServiceInterface,
+        review_cache: ReviewCache,
+        git_hub_client: AsyncClient,
+        create_git_hub_service: Optional[
+            Callable[[], GitHubServiceInterface]
+        ] = None
     ):
         self._git_hub_service = git_hub_service
         self._groq_ai_service = groq_ai_service
+        self._review_cache = review_cache
+        self._git_hub_client = git_hub_client
+        self._create_git_hub_service = create_git_hub_service
+        self._prompt_token_budgets: dict[tuple[str, str], int] = {}
+
+    def _for_repo(self) -> "CodeReviewService":
+        if self._create_git_hub_service is None:
+            return self
+
+        review_service = CodeReviewService(
+            git_hub_service=self._create_git_hub_service(),
+            groq_ai_service=self._groq_ai_service,
+            review_cache=self._review_cache,
+            git_hub_client=self._git_hub_client
+        )
+        review_service._prompt_token_budgets = self._prompt_token_budgets
+        return review_service
 
     async def review(
         self, code_review_request: CodeReviewRequest
     ) -> CodeReviewResponse:
-        async with AsyncClient() as client:
-            files_info = await self._git_hub_service.get_files_info(
+        url = self._git_hub_service.get_api_url_from_usual_url(
+            code_review_request.github_repo_url
+        )
+        with track_stage("review"):
+            with track_stage("head_sha"):
+                head_sha = await self._git_hub_service.get_head_sha(
+                    client=self._git_hub_client,
+                    url=url
+                )
+
+            return await self._review_cache.get_or_create(
+                key=self._get_review_cache_key(
+                    head_sha=head_sha,
+                    code_review_request=code_review_request
+                ),
+                create=lambda: self._create_review(
+                    client=self._git_hub_client,
+                    url=url,
+                    head_sha=head_sha,
+                    code_review_request=code_review_request
+                )
+            )
+
+    async def review_stream(
+        self, code_review_request: CodeReviewRequest
+    ) -> AsyncIterator[tuple[str, dict]]:
+        url = self._git_hub_service.get_api_url_from_usual_url(
+            code_review_request.github_repo_url
+        )
+        started_at = time.perf_counter()
+        with track_stage("head_sha"):
+            head_sha = await self._git_hub_service.get_head_sha(
+                client=self._git_hub_client,
+                url=url
+            )
+        review_task = ProgressTask(
+            lambda on_event: self._review_cache.get_or_create(
+                key=self._get_review_cache_key(
+                    head_sha=head_sha,
+                    code_review_request=code_review_request
+                ),
+                create=lambda: self._create_review(
+                    client=self._git_hub_client,
+                    url=url,
+                    head_sha=head_sha,
+                    code_review_request=code_review_request,
+                    on_event=on_event
+                )
+            )
+        )
+        try:
+            async for event in review_task:
+                yield event
+            review = await review_task.result()
+        finally:
+            review_task.cancel()
+        record_timing("review", time.perf_counter() - started_at)
+
+        yield "result", review.model_dump()
+
+    async def review_batch(
+        self, batch_review_request: BatchReviewRequest
+    ) -> AsyncIterator[tuple[str, dict]]:
+        semaphore = asyncio.Semaphore(BATCH_REVIEW_CONCURRENCY)
+
+        async def review_repo(github_repo_url: str) -> tuple[str, dict]:
+            async with semaphore:
+                try:
+                    review = await self._for_repo().review(
+                        CodeReviewRequest(
+                            assignment_description=(
+                                batch_review_request.assignment_description
+                            ),
+                            github_repo_url=github_repo_url,
+                            candidate_level=(
+                                batch_review_request.candidate_level
+                            )
+                        )
+                    )
+                except BaseAPIException as exc:
+                    return "error", {
+                        "github_repo_url": github_repo_url,
+                        "status_code": exc.status_code,
+                        "detail": exc.message,
+                    }
+                except Exception:
+                    logger.exception(f"Batch review of {github_repo_url}")
+                    return "error", {
+                        "github_repo_url": github_repo_url,
+                        "status_code": 500,
+                        "detail": "Internal error",
+                    }
+
+            return "result", {
+                "github_repo_url": github_repo_url,
+                **review.model_dump(),
+            }
+
+        tasks = [
+            asyncio.ensure_future(review_repo(github_repo_url))
+            for github_repo_url in batch_review_request.github_repo_urls
+        ]
+        failed_count = 0
+        try:
+            for task in asyncio.as_completed(tasks):
+                event, data = await task
+                failed_count += event == "error"
+                yield event, data
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield "done", {
+            "reviewed": len(tasks) - failed_count,
+            "failed": failed_count,
+        }
+
+    def _get_review_cache_key(
+        self, head_sha: str,
+        code_review_request: CodeReviewRequest
+    ) -> str:
+        review_hash = hashlib.sha256(
+            json.dumps([
+                head_sha,
+                code_review_request.assignment_description,
+                code_review_request.candidate_level,
+            ]).encode("utf-8")
+        ).hexdigest()
+
+        return f"review:{review_hash}"
+
+    def _get_last_review_key(
+        self, url: str,
+        code_review_request: CodeReviewRequest
+    ) -> str:
+        review_hash = hashlib.sha256(
+            json.dumps([
+                url,
+                code_review_request.assignment_description,
+                code_review_request.candidate_level,
+            ]).encode("utf-8")
+        ).hexdigest()
+
+        return f"last_review:{review_hash}"
+
+    async def _create_review(
+        self, client: AsyncClient,
+        url: str,
+        head_sha: str,
+        code_review_request: CodeReviewRequest,
+        on_event: Optional[Callable[[tuple[str, dict]], None]] = None
+    ) -> CodeReviewResponse:
+        last_review_key = self._get_last_review_key(
+            url=url,
+            code_review_request=code_review_request
+        )
+        last_review = await self._review_cache.get_last_review(
+            last_review_key
+        )
+
+        review = None
+        if last_review is not None and last_review.head_sha != head_sha:
+            review = await self._get_delta_review(
                 client=client,
-                url=self._git_hub_service.get_api_url_from_usual_url(
-                    code_review_request.github_repo_url
+                url=url,
+                head_sha=head_sha,
+                last_review=last_review,
+                code_review_request=code_review_request
+            )
+        if review is None and on_event is not None:
+            review = await self._review_stream(
+                client=client,
+                url=url,
+                head_sha=head_sha,
+                code_review_request=code_review_request,
+                on_event=on_event
+            )
+        elif review is None:
+            review = await self._review(
+                client=client,
+                url=url,
+                head_sha=head_sha,
+                code_review_request=code_review_request
+            )
+
+        await self._review_cache.set_last_review(
+            last_review_key,
+            LastReview(head_sha=head_sha, review=review)
+        )
+        return review
+
+    async def _get_delta_review(
+        self, client: AsyncClient,
+        url: str,
+        head_sha: str,
+        last_review: LastReview,
+        code_review_request: CodeReviewRequest
+    ) -> Optional[CodeReviewResponse]:
+        with track_stage("files"):
+            changed_files = (
+                await self._git_hub_service.get_changed_files_info(
+                    client=client,
+                    url=url,
+                    base_sha=last_review.head_sha,
+                    head_sha=head_sha
                 )
             )
+        if changed_files is None:
+            return None
+
+        files_info, removed_files = changed_files
+        previous_review = last_review.review
+        if not files_info and not removed_files:
             logger.info(
-                f"Got all files for -"
+                f"No reviewable changes since {last_review.head_sha} for -"
                 f" {code_review_request.github_repo_url}"
             )
-        review_result = self._groq_ai_service.get_bot_response(
-            assignment_description=code_review_request.assignment_description,
-            candidate_level=code_review_request.candidate_level,
+            return previous_review.model_copy(
+                update={"base_sha": last_review.head_sha}
+            )
+
+        packed_files = pack_files_info(
+            files_info=files_info,
+            token_budget=self._groq_ai_service.get_delta_prompt_token_budget(
+                assignment_description=(
+                    code_review_request.assignment_description
+                ),
+                candidate_level=code_review_request.candidate_level,
+                previous_review=previous_review.review_result,
+                removed_files=removed_files
+            )
+        )
+        if not packed_files.fits_budget:
+            logger.info(
+                f"Changes since {last_review.head_sha} do not fit the prompt"
+                f" for - {code_review_request.github_repo_url},"
+                f" reviewing the whole repository"
+            )
+            return None
+
+        logger.info(
+            f"Reviewing {len(files_info)} changed and {len(removed_files)}"
+            f" removed files since {last_review.head_sha} for -"
+            f" {code_review_request.github_repo_url}"
+        )
+        with track_stage("groq"):
+            review_result = await self._groq_ai_service.get_delta_review(
+                assignment_description=(
+                    code_review_request.assignment_description
+                ),
+                candidate_level=code_review_request.candidate_level,
+                previous_review=previous_review.review_result,
+                files_info=packed_files.files_info,
+                removed_files=removed_files,
+                skipped_files_summary=packed_files.skipped_files_summary
+            )
+
+        outdated_files = set(files_info).union(removed_files)
+        return CodeReviewResponse(
+            filenames=[
+                filename
+                for filename in previous_review.filenames
+                if filename not in outdated_files
+            ] + list(files_info),
+            review_result=review_result,
+            truncated_files=packed_files.truncated_files,
+            skipped_files=packed_files.skipped_files,
+            base_sha=last_review.head_sha
+        )
+
+    async def _review(
+        self, client: AsyncClient,
+        url: str,
+        head_sha: str,
+        code_review_request: CodeReviewRequest
+    ) -> CodeReviewResponse:
+        with track_stage("files"):
+            files_info = await self._git_hub_service.get_files_info(
+                client=client,
+                url=url,
+                head_sha=head_sha
+            )
+        REVIEW_FILES.observe(len(files_info))
+        logger.info(
+            f"Got all files for -"
+            f" {code_review_request.github_repo_url}"
+        )
+
+        packed_files = self._pack_files_info(
+            code_review_request=code_review_request,
+            files_info=files_info
+        )
+        if packed_files.fits_budget:
+            with track_stage("groq"):
+                review_result = await self._groq_ai_service.get_bot_response(
+                    assignment_description=(
+                        code_review_request.assignment_description
+                    ),
+                    candidate_level=code_review_request.candidate_level,
+                    files_info=packed_files.files_info,
+                    skipped_files_summary=packed_files.skipped_files_summary
+                )
+
+            return CodeReviewResponse(
+                filenames=files_info.keys(),
+                review_result=review_result,
+                truncated_files=packed_files.truncated_files,
+                skipped_files=packed_files.skipped_files
+            )
+
+        chunked_files = self._chunk_files_info(
+            code_review_request=code_review_request,
+            files_info=files_info
+        )
+        with track_stage("groq"):
+            partial_reviews = await self._get_partial_reviews(
+                code_review_request=code_review_request,
+                chunks=chunked_files.chunks
+            )
+            review_result = await self._groq_ai_service.merge_reviews(
+                assignment_description=(
+                    code_review_request.assignment_description
+                ),
+                candidate_level=code_review_request.candidate_level,
+                partial_reviews=partial_reviews,
+                skipped_files_summary=chunked_files.skipped_files_summary
+            )
+
+        return CodeReviewResponse(
+            filenames=files_info.keys(),
+            review_result=review_result,
+            truncated_files=chunked_files.truncated_files,
+            skipped_files=chunked_files.skipped_files
+        )
+
+    async def _review_stream(
+        self, client: AsyncClient,
+        url: str,
+        head_sha: str,
+        code_review_request: CodeReviewRequest,
+        on_event: Callable[[tuple[str, dict]], None]
+    ) -> CodeReviewResponse:
+        fetched_files = []
+
+        def on_file_fetched(filename: str) -> None:
+            fetched_files.append(filename)
+            on_event(("progress", {
+                "filename": filename,
+                "fetched_files": len(fetched_files),
+            }))
+
+        with track_stage("files"):
+            files_info = await self._git_hub_service.get_files_info(
+                client=client,
+                url=url,
+                head_sha=head_sha,
+                on_file_fetched=on_file_fetched
+            )
+        REVIEW_FILES.observe(len(files_info))
+        logger.info(
+            f"Got all files for -"
+            f" {code_review_request.github_repo_url}"
+        )
+
+        packed_files = self._pack_files_info(
+            code_review_request=code_review_request,
             files_info=files_info
         )
+        if packed_files.fits_budget:
+            truncated_files = packed_files.truncated_files
+            skipped_files = packed_files.skipped_files
+            tokens = self._groq_ai_service.stream_bot_response(
+                assignment_description=(
+                    code_review_request.assignment_description
+                ),
+                candidate_level=code_review_request.candidate_level,
+                files_info=packed_files.files_info,
+                skipped_files_summary=packed_files.skipped_files_summary
+            )
+        else:
+            chunked_files = self._chunk_files_info(
+                code_review_request=code_review_request,
+                files_info=files_info
+            )
+            truncated_files = chunked_files.truncated_files
+            skipped_files = chunked_files.skipped_files
+            with track_stage("groq"):
+                partial_reviews = await self._get_partial_reviews(
+                    code_review_request=code_review_request,
+                    chunks=chunked_files.chunks,
+                    on_part_reviewed=lambda reviewed_parts: on_event((
+                        "progress",
+                        {
+                            "reviewed_parts": reviewed_parts,
+                            "parts": len(chunked_files.chunks),
+                        }
+                    ))
+                )
+            tokens = self._groq_ai_service.stream_merged_reviews(
+                assignment_description=(
+                    code_review_request.assignment_description
+                ),
+                candidate_level=code_review_request.candidate_level,
+                partial_reviews=partial_reviews,
+                skipped_files_summary=chunked_files.skipped_files_summary
+            )
+
+        review_result = []
+        with track_stage("groq"):
+            async for token in tokens:
+                review_result.append(token)
+                on_event(("token", {"content": token}))
 
         return CodeReviewResponse(
             filenames=files_info.keys(),
-            review_result=review_result
+            review_result="".join(review_result),
+            truncated_files=truncated_files,
+            skipped_files=skipped_files
+        )
+
+    def _get_prompt_token_budget(
+        self, code_review_request: CodeReviewRequest
+    ) -> int:
+        prompt_key = (
+            code_review_request.assignment_description,
+            code_review_request.candidate_level,
+        )
+        if prompt_key not in self._prompt_token_budgets:
+            self._prompt_token_budgets[prompt_key] = (
+                self._groq_ai_service.get_prompt_token_budget(
+                    assignment_description=prompt_key[0],
+                    candidate_level=prompt_key[1]
+                )
+            )
+
+        return self._prompt_token_budgets[prompt_key]
+
+    def _pack_files_info(
+        self, code_review_request: CodeReviewRequest,
+        files_info: dict[str, str]
+    ) -> PackedFiles:
+        packed_files = pack_files_info(
+            files_info=files_info,
+            token_budget=self._get_prompt_token_budget(code_review_request)
+        )
+        if packed_files.truncated_files or packed_files.skipped_files:
+            logger.info(
+                f"Packed files for - {code_review_request.github_repo_url}:"
+                f" {len(packed_files.truncated_files)} truncated,"
+                f" {len(packed_files.skipped_files)} skipped"
+            )
+
+        return packed_files
+
+    def _chunk_files_info(
+        self, code_review_request: CodeReviewRequest,
+        files_info: dict[str, str]
+    ) -> ChunkedFiles:
+        token_budget = self._get_prompt_token_budget(code_review_request)
+        chunk_token_budget = min(token_budget, REVIEW_MAP_CHUNK_TOKENS)
+        prompt_tokens = (
+            GROQ_CONTEXT_WINDOW - GROQ_MAX_COMPLETION_TOKENS - token_budget
+        )
+        partial_review_tokens = (
+            prompt_tokens
+            + chunk_token_budget
+            + GROQ_PARTIAL_COMPLETION_TOKENS * 2
+        )
+        merge_tokens = prompt_tokens + GROQ_MAX_COMPLETION_TOKENS
+        max_chunks = max(
+            1,
+            min(
+                (REVIEW_MAX_TOTAL_TOKENS - merge_tokens)
+                // partial_review_tokens,
+                token_budget // GROQ_PARTIAL_COMPLETION_TOKENS
+            )
+        )
+
+        chunked_files = chunk_files_info(
+            files_info=files_info,
+            token_budget=chunk_token_budget,
+            max_chunks=max_chunks
+        )
+        logger.info(
+            f"Reviewing {code_review_request.github_repo_url} in"
+            f" {len(chunked_files.chunks)} parts:"
+            f" {len(chunked_files.truncated_files)} truncated,"
+            f" {len(chunked_files.skipped_files)} skipped"
+        )
+
+        return chunked_files
+
+    async def _get_partial_reviews(
+        self, code_review_request: CodeReviewRequest,
+        chunks: list[dict[str, str]],
+        on_part_reviewed: Optional[Callable[[int], None]] = None
+    ) -> list[str]:
+        semaphore = asyncio.Semaphore(REVIEW_MAP_CONCURRENCY)
+        reviewed_parts = 0
+
+        async def get_partial_review(part: int, chunk: dict[str, str]) -> str:
+            nonlocal reviewed_parts
+            async with semaphore:
+                review = await self._groq_ai_service.get_partial_review(
+                    assignment_description=(
+                        code_review_request.assignment_description
+                    ),
+                    candidate_level=code_review_request.candidate_level,
+                    files_info=chunk,
+                    part=part,
+                    parts_count=len(chunks)
+                )
+            reviewed_parts += 1
+            if on_part_reviewed is not None:
+                on_part_reviewed(reviewed_parts)
+
+            return review
+
+        return await gather_fail_fast(
+            *(
+                get_partial_review(part, chunk)
+                for part, chunk in enumerate(chunks, start=1)
+            )
         )
 
 
 class GitHubService(GitHubServiceInterface):
-    def __init__(self, redis: Redis):
+    def __init__(
+        self, redis: FailSafeRedis,
+        rate_limiter: Optional[GitHubRateLimiter] = None,
+        local_cache: Optional[LocalCache] = None,
+        file_filter: Optional[FileFilter] = None
+    ):
         self._redis = redis
+        self._rate_limiter = rate_limiter or GitHubRateLimiter(redis=redis)
+        self._local_cache = (
+            default_local_cache if local_cache is None else local_cache
+        )
+        self._file_filter = file_filter or default_file_filter
+        self._review_semaphore = asyncio.Semaphore(GITHUB_REVIEW_CONCURRENCY)
 
     def get_api_url_from_usual_url(self, usual_url: str) -> str:
         username, repo_name = usual_url.rstrip("/").split("/")[-2:]
@@ -64,201 +704,1148 @@ class GitHubService(GitHubServiceInterface):
 
         return f"https://api.github.com/repos/{username}/{repo_name}/contents/"
 
-    async def _ensure_rate_limit(self) -> Optional[str]:
-        remaining = await self._redis.get("github_rate_remaining")
-        reset_time = await self._redis.get("github_rate_reset")
-        if remaining is not None and int(remaining) == 0:
-            sleep_time = int(reset_time) - int(time.time())
-            if sleep_time > 0:
-                message = (
-                    f"Rate limit exceeded. "
-                    f"Sleeping for {sleep_time} seconds."
+    def _get_github_headers(self, token: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+    def _raise_github_error(self, response: Response, url: str) -> None:
+        content = response.json()
+        status = int(content["status"])
+        message = content["message"]
+        logger.error(
+            f"GitHubAPI response error, status - {status} |"
+            f" message - '{message}' on url - {url}"
+        )
+        raise GitHubError(
+            status_code=status,
+            message=f"GitHub API error, detailed: '{message}'"
+        )
+
+    def _record_github_request(
+        self, endpoint: str,
+        started_at: float,
+        response: Response,
+        downloaded_bytes: int,
+        cached: bool = False
+    ) -> None:
+        GITHUB_REQUEST_SECONDS.labels(endpoint).observe(
+            time.perf_counter() - started_at
+        )
+        GITHUB_REQUESTS.labels(
+            endpoint,
+            str(response.status_code),
+            str(cached).lower()
+        ).inc()
+        GITHUB_DOWNLOADED_BYTES.labels(endpoint).inc(downloaded_bytes)
+
+    async def _get_github_response(
+        self, client: AsyncClient,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        conditional: bool = False
+    ) -> Response:
+        headers = headers or {}
+        cache_key = self._get_conditional_cache_key(url, headers)
+        cached_response = None
+        if conditional:
+            cached_response = await self._get_cached_response(cache_key)
+        if cached_response is not None:
+            headers = headers | self._get_conditional_headers(
+                cached_response[0]
+            )
+
+        endpoint = get_github_endpoint(url)
+        while True:
+            token = await self._rate_limiter.acquire()
+            async with self._review_semaphore, github_semaphore:
+                started_at = time.perf_counter()
+                response = await client.get(
+                    url=url,
+                    headers=self._get_github_headers(token) | headers
                 )
-                logger.info(message)
+            self._record_github_request(
+                endpoint=endpoint,
+                started_at=started_at,
+                response=response,
+                downloaded_bytes=len(response.content),
+                cached=(
+                    response.status_code == 304
+                    and cached_response is not None
+                )
+            )
+            if not await self._rate_limiter.update(token, response):
+                break
+            logger.warning(f"GitHub rate limit hit on {url}, retrying")
 
-                return message
+        if response.status_code == 304 and cached_response is not None:
+            return Response(
+                200,
+                content=cached_response[1],
+                request=response.request
+            )
+
+        if response.is_error:
+            self._raise_github_error(response=response, url=url)
+
+        if conditional:
+            await self._cache_response(cache_key, response)
+
+        return response
 
     async def _get_github_response_content(
         self, client: AsyncClient,
-        url: str
+        url: str,
+        conditional: bool = False
     ) -> dict:
-        response = await client.get(
+        response = await self._get_github_response(
+            client=client,
             url=url,
-            headers={
-                "Authorization": f"Bearer {GITHUB_API_TOKEN}"
-            }
+            conditional=conditional
         )
-        content = response.json()
 
-        if response.is_error:
-            status = int(content["status"])
-            message = content["message"]
-            logger.error(
-                f"GitHubAPI response error, status - {status} |"
-                f" message - '{message}' on url - {url}"
-            )
-            raise GitHubError(
-                status_code=status,
-                message=f"GitHub API error, detailed: '{message}'"
+        return response.json()
+
+    def _get_conditional_cache_key(
+        self, url: str,
+        headers: dict[str, str]
+    ) -> str:
+        request_hash = hashlib.sha256(
+            json.dumps([url, headers.get("Accept")]).encode("utf-8")
+        ).hexdigest()
+
+        return f"response:{request_hash}"
+
+    def _get_conditional_headers(
+        self, validators: dict[str, str]
+    ) -> dict[str, str]:
+        conditional_headers = {}
+        if "etag" in validators:
+            conditional_headers["If-None-Match"] = validators["etag"]
+        if "last-modified" in validators:
+            conditional_headers["If-Modified-Since"] = (
+                validators["last-modified"]
             )
 
-        remaining = int(response.headers.get("X-RateLimit-Remaining", 0))
-        reset_time = int(
-            response.headers.get("X-RateLimit-Reset", time.time())
-        )
+        return conditional_headers
+
+    async def _get_cached_response(
+        self, cache_key: str
+    ) -> Optional[tuple[dict[str, str], bytes]]:
+        cached_response = await self._redis.get(cache_key)
+        if cached_response is None:
+            return None
+
+        try:
+            return deserialize_cached_response(cached_response)
+        except SerializationError:
+            logger.warning(f"Dropping unreadable cache entry {cache_key}")
+            return None
+
+    async def _cache_response(
+        self, cache_key: str,
+        response: Response
+    ) -> None:
+        validators = {
+            name: response.headers[name]
+            for name in ("etag", "last-modified")
+            if name in response.headers
+        }
+        if not validators:
+            return
 
         await self._redis.set(
-            "github_rate_remaining",
-            remaining,
-            ex=reset_time - int(time.time())
+            cache_key,
+            serialize_cached_response(validators, response.content),
+            ex=GITHUB_CONDITIONAL_CACHE_TTL
         )
-        await self._redis.set(
-            "github_rate_reset",
-            reset_time,
-            ex=reset_time - int(time.time())
+
+    def _get_repo_api_url(self, api_url: str) -> str:
+        return api_url.rstrip("/").removesuffix("/contents")
+
+    async def get_head_sha(self, client: AsyncClient, url: str) -> str:
+        response = await self._get_github_response(
+            client=client,
+            url=f"{self._get_repo_api_url(url)}/commits/HEAD",
+            headers={"Accept": "application/vnd.github.sha"},
+            conditional=True
         )
 
-        return content
+        return response.text.strip()
 
     async def get_files_info(
         self, client: AsyncClient,
         url: str,
-        parent_dir: Optional[str] = None
+        head_sha: Optional[str] = None,
+        on_file_fetched: Optional[Callable[[str], None]] = None
     ) -> dict[str, str]:
-        rate_limit_message = await self._ensure_rate_limit()
-        if rate_limit_message is not None:
-            return {"detail": rate_limit_message}
+        repo_url = self._get_repo_api_url(url)
+        if head_sha is None:
+            head_sha = await self.get_head_sha(client=client, url=url)
 
-        cache_key = f"files_info:{url}:{parent_dir}"
-        cached_content = await self._redis.get(cache_key)
+        cache_key = f"tree:{head_sha}"
+        cached_tree = await self._get_cached_files_sha(cache_key)
 
-        if cached_content:
+        if cached_tree is not None:
             logger.info(f"Cache hit for {cache_key}")
-            return eval(cached_content)
+            files = self._file_filter.filter_files([
+                {
+                    "path": path,
+                    "sha": sha,
+                    "url": f"{repo_url}/git/blobs/{sha}"
+                }
+                for path, sha in cached_tree.items()
+            ])
+            return await self._get_files_content(
+                client=client,
+                files=files,
+                on_file_fetched=on_file_fetched
+            )
 
-        content = await self._get_github_response_content(
+        repo_info = await self._get_github_response_content(
             client=client,
-            url=url
+            url=repo_url,
+            conditional=True
         )
 
-        files_info = await self._find_files_info(
-            client=client,
-            content=content,
-            parent_dir=parent_dir
+        if repo_info["size"] >= GITHUB_ARCHIVE_MIN_REPO_SIZE_KB:
+            files_info, files_sha = await self._get_archive_files_info(
+                client=client,
+                repo_url=repo_url,
+                head_sha=head_sha,
+                on_file_fetched=on_file_fetched
+            )
+        else:
+            files = await self._get_tree_files(
+                client=client,
+                url=url,
+                head_sha=head_sha
+            )
+            files_info = await self._get_files_content(
+                client=client,
+                files=files,
+                on_file_fetched=on_file_fetched
+            )
+            files_sha = {
+                item["path"]: item["sha"]
+                for item in files
+                if item["path"] in files_info
+            }
+
+        await self._redis.set(
+            cache_key,
+            serialize_files_info(files_sha),
+            ex=GITHUB_TREE_CACHE_TTL
         )
-        await self._redis.set(cache_key, str(files_info))
+        self._cache_tree_locally(cache_key, files_sha)
 
         return files_info
 
-    async def _find_files_info(
+    async def get_changed_files_info(
         self, client: AsyncClient,
-        content: dict,
-        parent_dir: Optional[str] = None
-    ) -> dict[str, str]:
-        files = {}
-        for item in content:
-            if item["type"] == "dir":
-                sub_dir_path = (
-                    f"{parent_dir}/{item['name']}"
-                    if parent_dir else item["name"]
-                )
-                files.update(
-                    await self.get_files_info(
-                        client=client,
-                        url=item["url"],
-                        parent_dir=sub_dir_path
+        url: str,
+        base_sha: str,
+        head_sha: str
+    ) -> Optional[tuple[dict[str, str], list[str]]]:
+        repo_url = self._get_repo_api_url(url)
+        try:
+            comparison = await self._get_github_response_content(
+                client=client,
+                url=f"{repo_url}/compare/{base_sha}...{head_sha}"
+            )
+        except GitHubError as exc:
+            if exc.status_code not in GITHUB_COMPARE_FALLBACK_STATUS_CODES:
+                raise
+            logger.info(
+                f"Cannot compare {base_sha}...{head_sha} for {repo_url}:"
+                f" {exc.message}"
+            )
+            return None
+
+        changed_files = comparison.get("files", [])
+        if (
+            comparison["status"] != "ahead"
+            or len(changed_files) >= GITHUB_COMPARE_MAX_FILES
+        ):
+            logger.info(
+                f"Cannot compare {base_sha}...{head_sha} for {repo_url}"
+                f" ({comparison['status']}, {len(changed_files)} files)"
+            )
+            return None
+
+        files, removed_files = [], []
+        for item in changed_files:
+            if item["status"] == "removed":
+                removed_files.append(item["filename"])
+                continue
+            if item["status"] == "renamed":
+                removed_files.append(item["previous_filename"])
+            files.append({
+                "path": item["filename"],
+                "sha": item["sha"],
+                "url": f"{repo_url}/git/blobs/{item['sha']}"
+            })
+
+        files_info = await self._get_files_content(
+            client=client,
+            files=self._file_filter.filter_files(files)
+        )
+
+        return files_info, removed_files
+
+    async def _get_cached_files_sha(
+        self, cache_key: str
+    ) -> Optional[dict[str, str]]:
+        files_sha = self._local_cache.get(cache_key)
+        cache_stats.record_lookup("local", is_hit=files_sha is not None)
+        if files_sha is not None:
+            return files_sha
+
+        cached_tree = await self._redis.get(cache_key)
+        cache_stats.record_lookup("redis", is_hit=cached_tree is not None)
+        if cached_tree is None:
+            return None
+
+        try:
+            files_sha = deserialize_files_info(cached_tree)
+        except SerializationError:
+            logger.warning(f"Dropping unreadable cache entry {cache_key}")
+            return None
+
+        self._cache_tree_locally(cache_key, files_sha)
+        return files_sha
+
+    def _cache_tree_locally(
+        self, cache_key: str,
+        files_sha: dict[str, str]
+    ) -> None:
+        self._local_cache.set(
+            cache_key,
+            files_sha,
+            size=sum(len(path) + len(sha) for path, sha in files_sha.items())
+        )
+
+    def _cache_blob_locally(self, sha: str, content: str) -> None:
+        self._local_cache.set(f"blob:{sha}", content, size=len(content))
+
+    async def _get_cached_contents(self, shas: set[str]) -> dict[str, str]:
+        contents, missing_shas = {}, []
+        for sha in shas:
+            content = self._local_cache.get(f"blob:{sha}")
+            if content is None:
+                missing_shas.append(sha)
+            else:
+                contents[sha] = content
+        cache_stats.record(
+            "local",
+            hits=len(contents),
+            misses=len(missing_shas)
+        )
+        if not missing_shas:
+            return contents
+
+        batches = [
+            missing_shas[start:start + CACHE_MGET_BATCH_SIZE]
+            for start in range(0, len(missing_shas), CACHE_MGET_BATCH_SIZE)
+        ]
+        cached_batches = await asyncio.gather(
+            *(
+                self._redis.mget([f"blob:{sha}" for sha in batch])
+                for batch in batches
+            )
+        )
+
+        redis_hits = 0
+        for batch, cached_contents in zip(batches, cached_batches):
+            for sha, cached_content in zip(batch, cached_contents):
+                if cached_content is None:
+                    continue
+                try:
+                    content = deserialize_content(cached_content)
+                except SerializationError:
+                    logger.warning(f"Dropping unreadable cache entry {sha}")
+                    continue
+                contents[sha] = content
+                redis_hits += 1
+                self._cache_blob_locally(sha, content)
+        cache_stats.record(
+            "redis",
+            hits=redis_hits,
+            misses=len(missing_shas) - redis_hits
+        )
+
+        return contents
+
+    async def _get_archive_files_info(
+        self, client: AsyncClient,
+        repo_url: str,
+        head_sha: str,
+        on_file_fetched: Optional[Callable[[str], None]] = None
+    ) -> tuple[dict[str, str], dict[str, str]]:
+        url = f"{repo_url}/tarball/{head_sha}"
+        while True:
+            token = await self._rate_limiter.acquire()
+            async with self._review_semaphore, github_semaphore:
+                started_at = time.perf_counter()
+                async with client.stream(
+                    "GET",
+                    url=url,
+                    headers=self._get_github_headers(token),
+                    follow_redirects=True
+                ) as response:
+                    should_retry = await self._rate_limiter.update(
+                        token,
+                        response.history[0] if response.history else response
                     )
+                    GITHUB_REQUESTS.labels(
+                        "tarball",
+                        str(response.status_code),
+                        "false"
+                    ).inc()
+                    if should_retry or response.is_error:
+                        await response.aread()
+                    else:
+                        files_info, files_sha, blobs, skipped_count = (
+                            await self._read_archive(
+                                response=response,
+                                url=url,
+                                on_file_fetched=on_file_fetched
+                            )
+                        )
+                    GITHUB_DOWNLOADED_BYTES.labels("tarball").inc(
+                        response.num_bytes_downloaded
+                    )
+                GITHUB_REQUEST_SECONDS.labels("tarball").observe(
+                    time.perf_counter() - started_at
                 )
-            else:
-                files[
-                    f"{parent_dir}/{item['name']}"
-                    if parent_dir else item["name"]
-                ] = await self._get_file_content(client, item)
+            if not should_retry:
+                break
+            logger.warning(f"GitHub rate limit hit on {url}, retrying")
+
+        if response.is_error:
+            self._raise_github_error(response=response, url=url)
+
+        blob_shas = list(blobs)
+        for start in range(0, len(blob_shas), CACHE_MGET_BATCH_SIZE):
+            await self._redis.set_many(
+                {
+                    f"blob:{sha}": serialize_content(blobs[sha])
+                    for sha in blob_shas[start:start + CACHE_MGET_BATCH_SIZE]
+                },
+                ex=GITHUB_BLOB_CACHE_TTL
+            )
+
+        logger.info(
+            f"Extracted {len(files_info)} files from {url},"
+            f" {skipped_count} skipped"
+        )
+        return files_info, files_sha
+
+    async def _read_archive(
+        self, response: Response,
+        url: str,
+        on_file_fetched: Optional[Callable[[str], None]] = None
+    ) -> tuple[dict[str, str], dict[str, str], dict[str, str], int]:
+        parser = TarGzStreamParser(max_entry_size=GITHUB_MAX_FILE_SIZE)
+        budget = ByteBudget()
+        budget_exhausted = False
+        files_info, files_sha, blobs = {}, {}, {}
+        skipped_count = 0
+
+        async for chunk in response.aiter_bytes():
+            if budget_exhausted:
+                logger.info(
+                    f"Review size budget exhausted, stopped reading {url}"
+                )
+                break
+            for path, data in parser.feed(chunk):
+                if self._file_filter.is_excluded(path, len(data)):
+                    skipped_count += 1
+                    continue
+                content = self._decode_file_content(data)
+                if content is None:
+                    skipped_count += 1
+                    continue
+                if not budget.reserve(len(data)):
+                    budget_exhausted = True
+                    break
+                sha = self._get_blob_sha(data)
+                files_info[path] = content
+                files_sha[path] = sha
+                blobs[sha] = content
+                self._cache_blob_locally(sha, content)
+                if on_file_fetched is not None:
+                    on_file_fetched(path)
+
+        return (
+            files_info,
+            files_sha,
+            blobs,
+            skipped_count + parser.skipped_entries
+        )
+
+    async def _get_tree_files(
+        self, client: AsyncClient,
+        url: str,
+        head_sha: str
+    ) -> list[dict]:
+        tree = await self._get_github_response_content(
+            client=client,
+            url=(
+                f"{self._get_repo_api_url(url)}/git/trees/{head_sha}"
+                f"?recursive=1"
+            ),
+            conditional=True
+        )
+
+        if tree["truncated"]:
+            logger.info(
+                f"Tree listing is truncated for {url},"
+                f" falling back to contents walk"
+            )
+            files = await self._get_contents_files(
+                client=client,
+                url=f"{url}?ref={head_sha}"
+            )
+        else:
+            files = [item for item in tree["tree"] if item["type"] == "blob"]
+
+        filtered_files = self._file_filter.filter_files(files)
+        logger.info(
+            f"Skipping {len(files) - len(filtered_files)} of {len(files)}"
+            f" files for {url}"
+        )
+        return filtered_files
+
+    async def _get_contents_files(
+        self, client: AsyncClient,
+        url: str
+    ) -> list[dict]:
+        content = await self._get_github_response_content(
+            client=client,
+            url=url,
+            conditional=True
+        )
+
+        sub_dirs_files = await gather_fail_fast(
+            *(
+                self._get_contents_files(client=client, url=item["url"])
+                for item in content
+                if item["type"] == "dir"
+                and not self._file_filter.is_directory_excluded(item["path"])
+            )
+        )
+
+        files = [item for item in content if item["type"] == "file"]
+        for sub_dir_files in sub_dirs_files:
+            files.extend(sub_dir_files)
 
         return files
 
-    async def _get_file_content(
+    async def _get_files_content(
         self, client: AsyncClient,
-        item_data: dict
-    ) -> str:
-        cache_key = f"file_content:{item_data['url']}"
-        cached_content = await self._redis.get(cache_key)
+        files: list[dict],
+        on_file_fetched: Optional[Callable[[str], None]] = None
+    ) -> dict[str, str]:
+        cached_contents = await self._get_cached_contents(
+            {item["sha"] for item in files}
+        )
+        budget = ByteBudget()
+
+        def get_size(item_data: dict) -> int:
+            content = cached_contents.get(item_data["sha"])
+            if content is not None:
+                return len(content)
 
-        if cached_content:
-            return cached_content
+            return item_data.get("size", 0)
 
-        file_data = await self._get_github_response_content(
+        async def get_file_content(item_data: dict) -> Optional[str]:
+            content = cached_contents.get(item_data["sha"])
+            if content is None:
+                content = await self._get_file_content(client, item_data)
+                if (
+                    content is not None
+                    and item_data.get("size") is None
+                    and not budget.reserve(len(content))
+                ):
+                    logger.info(
+                        f"Review size budget exhausted,"
+                        f" skipping {item_data['path']}"
+                    )
+                    return None
+            if on_file_fetched is not None:
+                on_file_fetched(item_data["path"])
+
+            return content
+
+        selected_files = []
+        for item in sorted(
+            files,
+            key=lambda item: (get_file_priority(item["path"]), get_size(item))
+        ):
+            if budget.reserve(get_size(item)):
+                selected_files.append(item)
+        if len(selected_files) < len(files):
+            logger.info(
+                f"Review size budget exhausted, skipping"
+                f" {len(files) - len(selected_files)} of {len(files)} files"
+            )
+
+        contents = await gather_fail_fast(
+            *(get_file_content(item) for item in selected_files)
+        )
+        fetched_contents = {
+            item["path"]: content
+            for item, content in zip(selected_files, contents)
+            if content is not None
+        }
+
+        return {
+            item["path"]: fetched_contents[item["path"]]
+            for item in files
+            if item["path"] in fetched_contents
+        }
+
+    async def _get_file_content(
+        self, client: AsyncClient,
+        item_data: dict
+    ) -> Optional[str]:
+        content = await self._download_text(
             client=client,
-            url=item_data["url"]
+            url=item_data["url"],
+            max_size=GITHUB_MAX_FILE_SIZE
         )
+        if content is None:
+            logger.info(
+                f"Skipping binary or oversized file {item_data['path']}"
+            )
+            return None
 
+        await self._redis.set(
+            f"blob:{item_data['sha']}",
+            serialize_content(content),
+            ex=GITHUB_BLOB_CACHE_TTL
+        )
+        self._cache_blob_locally(item_data["sha"], content)
+        return content
+
+    async def _download_text(
+        self, client: AsyncClient,
+        url: str,
+        max_size: int
+    ) -> Optional[str]:
+        endpoint = get_github_endpoint(url)
+        while True:
+            token = await self._rate_limiter.acquire()
+            async with self._review_semaphore, github_semaphore:
+                started_at = time.perf_counter()
+                async with client.stream(
+                    "GET",
+                    url=url,
+                    headers=self._get_github_headers(token) | {
+                        "Accept": GITHUB_RAW_MEDIA_TYPE
+                    }
+                ) as response:
+                    should_retry = await self._rate_limiter.update(
+                        token,
+                        response
+                    )
+                    if should_retry or response.is_error:
+                        await response.aread()
+                        content = None
+                    else:
+                        content = await self._read_text(response, max_size)
+                self._record_github_request(
+                    endpoint=endpoint,
+                    started_at=started_at,
+                    response=response,
+                    downloaded_bytes=response.num_bytes_downloaded
+                )
+            if not should_retry:
+                break
+            logger.warning(f"GitHub rate limit hit on {url}, retrying")
+
+        if response.is_error:
+            self._raise_github_error(response=response, url=url)
+
+        return content
+
+    async def _read_text(
+        self, response: Response,
+        max_size: int
+    ) -> Optional[str]:
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None and int(content_length) > max_size:
+            return None
+
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        parts, size = [], 0
         try:
-            content = base64.b64decode(file_data["content"]).decode("utf-8")
+            async for chunk in response.aiter_bytes():
+                if size < BINARY_SNIFF_SIZE and is_binary_content(
+                    chunk[:BINARY_SNIFF_SIZE - size]
+                ):
+                    return None
+                size += len(chunk)
+                if size > max_size:
+                    return None
+                parts.append(decoder.decode(chunk))
+            parts.append(decoder.decode(b"", final=True))
         except UnicodeDecodeError:
-            content = file_data["name"]
+            return None
 
-        await self._redis.set(cache_key, content)
-        return content
+        return "".join(parts)
+
+    def _decode_file_content(self, data: bytes) -> Optional[str]:
+        if is_binary_content(data):
+            return None
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+    def _get_blob_sha(self, data: bytes) -> str:
+        blob_sha = hashlib.sha1(f"blob {len(data)}\0".encode())
+        blob_sha.update(data)
+
+        return blob_sha.hexdigest()
 
 
 class GroqAIService(GroqAIServiceInterface):
-    def __init__(self, groq_api: Groq):
+    def __init__(
+        self, groq_api: AsyncGroq,
+        rate_limiter: Optional[GroqRateLimiter] = None
+    ):
         self._groq_api = groq_api
+        self._rate_limiter = rate_limiter
 
-    def get_bot_response(
+    def get_prompt_token_budget(
+        self, assignment_description: str,
+        candidate_level: str
+    ) -> int:
+        prompt_tokens = sum(
+            estimate_tokens(message["content"])
+            for message in self._get_messages(
+                assignment_description=assignment_description,
+                candidate_level=candidate_level,
+                files_info={},
+                skipped_files_summary=" "
+            )
+        )
+
+        return GROQ_CONTEXT_WINDOW - GROQ_MAX_COMPLETION_TOKENS - prompt_tokens
+
+    def get_delta_prompt_token_budget(
         self, assignment_description: str,
         candidate_level: str,
-        files_info: dict[str, str]
-    ) -> str:
-        system_prompt = f"""
-        You are a professional Code Reviewer, tasked with reviewing code 
-        quality for a {candidate_level} developer. Users will provide you with:
-        1. An **assignment description** outlining the task requirements.
-        2. A dictionary containing the **content of files** in the format:
-           - `dict[filename: content, filename: content, ...]`.
-
-        Your job is to analyze the provided code and assignment description, 
-        then deliver a detailed, structured review.
-
-        Your response must follow this exact format:
-        1. **Downsides**:
-           - List and describe specific downsides or issues with the project 
-           (e.g., poor structure, lack of comments, security risks).
-        2. **Rating**:
-           - Provide an overall rating for the code, considering the expected 
-           level of a {candidate_level} developer (e.g., "Rating: 3/5").
-        3. **Thoughts**:
-           - Share your overall thoughts and suggestions on the repository, 
-           focusing on areas for improvement and strengths.
-
-        Be constructive and provide actionable feedback to help the developer 
-        improve. Ensure your feedback is specific and considers the provided 
-        code and its context.
-        """
-
-        user_prompt = f"""
-        1. Assigment description - {assignment_description}
-        2. Content of files - {files_info}
-        """
+        previous_review: str,
+        removed_files: list[str]
+    ) -> int:
+        prompt_tokens = sum(
+            estimate_tokens(message["content"])
+            for message in self._get_delta_review_messages(
+                assignment_description=assignment_description,
+                candidate_level=candidate_level,
+                previous_review=previous_review,
+                files_info={},
+                removed_files=removed_files,
+                skipped_files_summary=" "
+            )
+        )
 
-        try:
-            completion = self._groq_api.chat.completions.create(
-                model="llama-3.1-70b-versatile",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ]
+        return GROQ_CONTEXT_WINDOW - GROQ_MAX_COMPLETION_TOKENS - prompt_tokens
+
+    def _get_messages(
+        self, assignment_description: str,
+        candidate_level: str,
+        files_info: dict[str, str],
+        skipped_files_summary: Optional[str] = None
+    ) -> list[dict[str, str]]:
+        content = ["2. Content of files -\n", *iter_file_sections(files_info)]
+        if skipped_files_summary:
+            content.append(
+                f"\n3. Files left out of the review because of size limits"
+                f" or generated code - {skipped_files_summary}\n"
             )
-        except APIStatusError as exc:
-            status = exc.status_code
-            message = exc.body["error"]["message"]
-            logger.error(
-                f"ChatBotAPI response error, status - {status} |"
-                f" message - '{message}'"
+
+        return build_messages(
+            system_prompt=REVIEW_PROMPT.render(candidate_level),
+            assignment_description=assignment_description,
+            content=content
+        )
+
+    def _get_delta_review_messages(
+        self, assignment_description: str,
+        candidate_level: str,
+        previous_review: str,
+        files_info: dict[str, str],
+        removed_files: list[str],
+        skipped_files_summary: Optional[str] = None
+    ) -> list[dict[str, str]]:
+        content = [
+            f"2. Previous review - {previous_review}\n",
+            f"3. Removed files - {sorted(removed_files)}\n",
+            "4. Content of changed files -\n",
+            *iter_file_sections(files_info),
+        ]
+        if skipped_files_summary:
+            content.append(
+                f"\n5. Changed files left out of the review because of size"
+                f" limits or generated code - {skipped_files_summary}\n"
             )
-            raise ChatBotError(
-                status_code=status,
-                message=message
+
+        return build_messages(
+            system_prompt=DELTA_REVIEW_PROMPT.render(candidate_level),
+            assignment_description=assignment_description,
+            content=content
+        )
+
+    def _get_partial_review_messages(
+        self, assignment_description: str,
+        candidate_level: str,
+        files_info: dict[str, str],
+        part: int,
+        parts_count: int
+    ) -> list[dict[str, str]]:
+        return build_messages(
+            system_prompt=PARTIAL_REVIEW_PROMPT.render(candidate_level),
+            assignment_description=assignment_description,
+            content=[
+                f"2. Content of files (part {part} of {parts_count}) -\n",
+                *iter_file_sections(files_info),
+            ]
+        )
+
+    def _get_merge_messages(
+        self, assignment_description: str,
+        candidate_level: str,
+        partial_reviews: list[str],
+        skipped_files_summary: Optional[str] = None
+    ) -> list[dict[str, str]]:
+        content = ["2. Findings -\n"]
+        for part, partial_review in enumerate(partial_reviews, start=1):
+            content.append(f"\nPart {part} findings:\n{partial_review}\n")
+        if skipped_files_summary:
+            content.append(
+                f"\n3. Files left out of the review because of size limits"
+                f" or generated code - {skipped_files_summary}\n"
+            )
+
+        return build_messages(
+            system_prompt=MERGE_PROMPT.render(candidate_level),
+            assignment_description=assignment_description,
+            content=content
+        )
+
+    def _raise_chat_bot_error(self, exc: APIStatusError) -> None:
+        status = exc.status_code
+        message = exc.body["error"]["message"]
+        logger.error(
+            f"ChatBotAPI response error, status - {status} |"
+            f" message - '{message}'"
+        )
+        raise ChatBotError(
+            status_code=status,
+            message=message
+        )
+
+    def _get_models(
+        self, prompt_tokens: int,
+        candidate_level: str
+    ) -> list[str]:
+        models = [GROQ_MODEL, *GROQ_FALLBACK_MODELS]
+        if (
+            candidate_level in GROQ_LIGHT_MODEL_LEVELS
+            and prompt_tokens <= GROQ_LIGHT_MODEL_MAX_PROMPT_TOKENS
+        ):
+            models.insert(0, GROQ_LIGHT_MODEL)
+
+        return list(dict.fromkeys(models))
+
+    async def _acquire_model(
+        self, model: str,
+        tokens: int
+    ) -> tuple[Optional[ModelLease], float]:
+        if self._rate_limiter is None:
+            return ModelLease(model=model, lease_id="", tokens=tokens), 0
+
+        return await self._rate_limiter.acquire(model, tokens)
+
+    async def _release_model(
+        self, lease: ModelLease,
+        retry_after: Optional[float] = None
+    ) -> None:
+        if self._rate_limiter is not None:
+            await self._rate_limiter.release(lease, retry_after)
+
+    def _get_retry_after(self, exc: APIStatusError) -> Optional[float]:
+        retry_after = exc.response.headers.get("retry-after")
+        if retry_after is None:
+            return None
+        try:
+            return float(retry_after)
+        except ValueError:
+            return None
+
+    def _is_context_error(self, exc: APIStatusError) -> bool:
+        error = exc.body.get("error", {}) if isinstance(exc.body, dict) else {}
+
+        return exc.status_code == 413 or (
+            exc.status_code == 400
+            and error.get("code") == "context_length_exceeded"
+        )
+
+    def _get_backoff_delay(self, attempt: int, wait: float) -> float:
+        delay = GROQ_RETRY_BACKOFF * 2 ** attempt
+
+        return max(wait, delay) + random.uniform(0, delay)
+
+    def _record_usage(self, lease: ModelLease, usage: Any) -> None:
+        record_groq_usage(usage)
+        if usage is not None:
+            lease.used_tokens = usage.prompt_tokens + usage.completion_tokens
+
+    def _observe_completion(
+        self, model: str,
+        started_at: float,
+        status: int
+    ) -> None:
+        GROQ_REQUEST_SECONDS.labels(model, str(status)).observe(
+            time.perf_counter() - started_at
+        )
+
+    async def _start_completion(
+        self, messages: list[dict[str, str]],
+        max_tokens: int,
+        candidate_level: str,
+        stream: bool = False
+    ) -> tuple[Any, ModelLease, float]:
+        prompt_tokens = sum(
+            estimate_tokens(message["content"]) for message in messages
+        )
+        PROMPT_TOKENS.observe(prompt_tokens)
+        record_prompt_prefix(messages)
+        models = self._get_models(prompt_tokens, candidate_level)
+        deadline = time.monotonic() + GROQ_RATE_LIMIT_MAX_WAIT
+        last_error = None
+        retries = 0
+
+        while True:
+            wait = math.inf
+            has_failed = False
+            for model in list(models):
+                lease, model_wait = await self._acquire_model(
+                    model,
+                    prompt_tokens + max_tokens
+                )
+                if lease is None:
+                    wait = min(wait, model_wait)
+                    continue
+
+                started_at = time.perf_counter()
+                try:
+                    completion = await self._groq_api.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        stream=stream
+                    )
+                except APIStatusError as exc:
+                    self._observe_completion(
+                        model,
+                        started_at,
+                        exc.status_code
+                    )
+                    last_error = exc
+                    if exc.status_code in GROQ_RETRY_STATUS_CODES:
+                        has_failed = True
+                        retry_after = self._get_retry_after(exc)
+                        await self._release_model(lease, retry_after)
+                        wait = min(wait, retry_after or 0)
+                    elif self._is_context_error(exc):
+                        await self._release_model(lease)
+                        models.remove(model)
+                    else:
+                        await self._release_model(lease)
+                        self._raise_chat_bot_error(exc)
+                    GROQ_FALLBACKS.labels(model, str(exc.status_code)).inc()
+                    logger.warning(
+                        f"Groq model {model} failed with {exc.status_code},"
+                        f" trying the next one"
+                    )
+                    continue
+                except Exception:
+                    await self._release_model(lease)
+                    raise
+
+                return completion, lease, started_at
+
+            if not models:
+                break
+            if has_failed:
+                retries += 1
+                if retries > GROQ_MAX_RETRIES:
+                    break
+            delay = self._get_backoff_delay(
+                max(retries - 1, 0),
+                0 if wait == math.inf else wait
             )
+            if time.monotonic() + delay > deadline:
+                break
+            logger.info(f"All Groq models are busy, waiting {delay:.1f}s")
+            await asyncio.sleep(delay)
 
+        if last_error is not None:
+            self._raise_chat_bot_error(last_error)
+        raise ChatBotError(
+            status_code=429,
+            message="Groq rate limit exhausted, retry later"
+        )
+
+    async def _create_completion(
+        self, messages: list[dict[str, str]],
+        max_tokens: int,
+        candidate_level: str
+    ) -> str:
+        completion, lease, started_at = await self._start_completion(
+            messages=messages,
+            max_tokens=max_tokens,
+            candidate_level=candidate_level
+        )
+
+        self._observe_completion(lease.model, started_at, 200)
+        self._record_usage(lease, completion.usage)
+        await self._release_model(lease)
         return completion.choices[0].message.content
+
+    async def _stream_completion(
+        self, messages: list[dict[str, str]],
+        max_tokens: int,
+        candidate_level: str
+    ) -> AsyncIterator[str]:
+        stream, lease, started_at = await self._start_completion(
+            messages=messages,
+            max_tokens=max_tokens,
+            candidate_level=candidate_level,
+            stream=True
+        )
+        try:
+            async for chunk in stream:
+                if chunk.x_groq is not None:
+                    self._record_usage(lease, chunk.x_groq.usage)
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        except APIStatusError as exc:
+            self._observe_completion(lease.model, started_at, exc.status_code)
+            self._raise_chat_bot_error(exc)
+        finally:
+            await self._release_model(lease)
+
+        self._observe_completion(lease.model, started_at, 200)
+
+    async def get_bot_response(
+        self, assignment_description: str,
+        candidate_level: str,
+        files_info: dict[str, str],
+        skipped_files_summary: Optional[str] = None
+    ) -> str:
+        return await self._create_completion(
+            messages=self._get_messages(
+                assignment_description=assignment_description,
+                candidate_level=candidate_level,
+                files_info=files_info,
+                skipped_files_summary=skipped_files_summary
+            ),
+            max_tokens=GROQ_MAX_COMPLETION_TOKENS,
+            candidate_level=candidate_level
+        )
+
+    def stream_bot_response(
+        self, assignment_description: str,
+        candidate_level: str,
+        files_info: dict[str, str],
+        skipped_files_summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        return self._stream_completion(
+            messages=self._get_messages(
+                assignment_description=assignment_description,
+                candidate_level=candidate_level,
+                files_info=files_info,
+                skipped_files_summary=skipped_files_summary
+            ),
+            max_tokens=GROQ_MAX_COMPLETION_TOKENS,
+            candidate_level=candidate_level
+        )
+
+    async def get_delta_review(
+        self, assignment_description: str,
+        candidate_level: str,
+        previous_review: str,
+        files_info: dict[str, str],
+        removed_files: list[str],
+        skipped_files_summary: Optional[str] = None
+    ) -> str:
+        return await self._create_completion(
+            messages=self._get_delta_review_messages(
+                assignment_description=assignment_description,
+                candidate_level=candidate_level,
+                previous_review=previous_review,
+                files_info=files_info,
+                removed_files=removed_files,
+                skipped_files_summary=skipped_files_summary
+            ),
+            max_tokens=GROQ_MAX_COMPLETION_TOKENS,
+            candidate_level=candidate_level
+        )
+
+    async def get_partial_review(
+        self, assignment_description: str,
+        candidate_level: str,
+        files_info: dict[str, str],
+        part: int,
+        parts_count: int
+    ) -> str:
+        return await self._create_completion(
+            messages=self._get_partial_review_messages(
+                assignment_description=assignment_description,
+                candidate_level=candidate_level,
+                files_info=files_info,
+                part=part,
+                parts_count=parts_count
+            ),
+            max_tokens=GROQ_PARTIAL_COMPLETION_TOKENS,
+            candidate_level=candidate_level
+        )
+
+    async def merge_reviews(
+        self, assignment_description: str,
+        candidate_level: str,
+        partial_reviews: list[str],
+        skipped_files_summary: Optional[str] = None
+    ) -> str:
+        return await self._create_completion(
+            messages=self._get_merge_messages(
+                assignment_description=assignment_description,
+                candidate_level=candidate_level,
+                partial_reviews=partial_reviews,
+                skipped_files_summary=skipped_files_summary
+            ),
+            max_tokens=GROQ_MAX_COMPLETION_TOKENS,
+            candidate_level=candidate_level
+        )
+
+    def stream_merged_reviews(
+        self, assignment_description: str,
+        candidate_level: str,
+        partial_reviews: list[str],
+        skipped_files_summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        return self._stream_completion(
+            messages=self._get_merge_messages(
+                assignment_description=assignment_description,
+                candidate_level=candidate_level,
+                partial_reviews=partial_reviews,
+                skipped_files_summary=skipped_files_summary
+            ),
+            max_tokens=GROQ_MAX_COMPLETION_TOKENS,
+            candidate_level=candidate_level
+        )
@@ -0,0 +1,15 @@
+import os
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+
+os.environ.setdefault("GROQ_API_TOKEN", "test-groq-token")
+os.environ.setdefault("GITHUB_API_TOKEN", "test-github-token")
+os.environ.setdefault("REDIS_HOST", "localhost")
+os.environ.setdefault("REDIS_PORT", "6379")
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeAsyncRedis()
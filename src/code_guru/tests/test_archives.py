@@ -0,0 +1,75 @@
+import io
+import tarfile
+
+import pytest
+
+from src.code_guru.archives import TarGzStreamParser
+
+
+def make_tarball(
+    files: dict[str, bytes],
+    tar_format: int = tarfile.PAX_FORMAT
+) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(
+        fileobj=buffer,
+        mode="w:gz",
+        format=tar_format,
+        pax_headers={"comment": "abc123"}
+    ) as archive:
+        directory = tarfile.TarInfo("user-repo-abc123")
+        directory.type = tarfile.DIRTYPE
+        archive.addfile(directory)
+        for path, data in files.items():
+            info = tarfile.TarInfo(f"user-repo-abc123/{path}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    return buffer.getvalue()
+
+
+def parse(archive: bytes, chunk_size: int) -> dict[str, bytes]:
+    parser = TarGzStreamParser()
+    files = {}
+    for position in range(0, len(archive), chunk_size):
+        for path, data in parser.feed(archive[position:position + chunk_size]):
+            files[path] = data
+
+    assert parser.finished
+    return files
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 512, 65536])
+def test_parse_in_chunks(chunk_size):
+    files = {
+        "README.md": b"# Repo",
+        "src/main.py": b"print('Hello World')\n" * 100,
+        "empty.txt": b"",
+    }
+
+    assert parse(make_tarball(files), chunk_size) == files
+
+
+@pytest.mark.parametrize(
+    "tar_format",
+    [tarfile.PAX_FORMAT, tarfile.GNU_FORMAT]
+)
+def test_parse_long_paths(tar_format):
+    files = {f"{'nested/' * 30}file.py": b"x = 1"}
+
+    assert parse(make_tarball(files, tar_format), 1024) == files
+
+
+def test_parse_skips_oversized_entries():
+    files = {
+        "big.sql": b"\0" * (4 * 1024 * 1024),
+        "src/main.py": b"print('Hello World')\n",
+    }
+    archive = make_tarball(files)
+    parser = TarGzStreamParser(max_entry_size=1024)
+
+    entries = dict(parser.feed(archive))
+
+    assert entries == {"src/main.py": files["src/main.py"]}
+    assert parser.skipped_entries == 1
+    assert parser.finished
@@ -0,0 +1,173 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.code_guru.cache import CacheStats, RELEASE_LOCK_SCRIPT, ReviewCache
+from src.code_guru.schemas import CodeReviewResponse, LastReview
+from src.database.base import FailSafeRedis
+from src.settings import REVIEW_CACHE_TTL, REVIEW_HISTORY_TTL
+
+
+@pytest.fixture
+def redis_mock():
+    mock = AsyncMock()
+    mock.get.return_value = None
+    mock.set.return_value = True
+    return mock
+
+
+@pytest.fixture
+def review_cache(redis_mock):
+    return ReviewCache(redis=redis_mock)
+
+
+@pytest.fixture
+def review():
+    return CodeReviewResponse(
+        filenames=["file1.py"],
+        review_result="Mocked Review Response"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_cache_hit(review_cache, redis_mock, review):
+    redis_mock.get.return_value = review.model_dump_json()
+    create = AsyncMock()
+
+    result = await review_cache.get_or_create(key="review:1", create=create)
+
+    assert result == review
+    create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_cache_miss(review_cache, redis_mock, review):
+    create = AsyncMock(return_value=review)
+
+    result = await review_cache.get_or_create(key="review:1", create=create)
+
+    assert result == review
+    create.assert_awaited_once()
+    redis_mock.set.assert_any_call(
+        "review:1",
+        review.model_dump_json(),
+        ex=REVIEW_CACHE_TTL
+    )
+    redis_mock.eval.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_coalesces_in_process(review_cache, review):
+    calls = 0
+
+    async def create():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return review
+
+    results = await asyncio.gather(
+        *(
+            review_cache.get_or_create(key="review:1", create=create)
+            for _ in range(5)
+        )
+    )
+
+    assert results == [review] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_waits_for_other_worker(
+    review_cache,
+    redis_mock,
+    review,
+    monkeypatch
+):
+    monkeypatch.setattr(
+        "src.code_guru.cache.REVIEW_LOCK_POLL_INTERVAL", 0
+    )
+    redis_mock.get.side_effect = [None, None, review.model_dump_json()]
+    redis_mock.set.return_value = None
+    create = AsyncMock()
+
+    result = await review_cache.get_or_create(key="review:1", create=create)
+
+    assert result == review
+    create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_records_one_lookup_per_request(
+    review_cache,
+    redis_mock,
+    review,
+    monkeypatch
+):
+    cache_stats = CacheStats()
+    monkeypatch.setattr("src.code_guru.cache.cache_stats", cache_stats)
+    monkeypatch.setattr(
+        "src.code_guru.cache.REVIEW_LOCK_POLL_INTERVAL", 0
+    )
+    redis_mock.get.side_effect = [None, None, None, review.model_dump_json()]
+    redis_mock.set.return_value = None
+
+    await review_cache.get_or_create(key="review:1", create=AsyncMock())
+
+    assert cache_stats.get_hit_ratios()["review"] == {
+        "hits": 1,
+        "misses": 0,
+        "hit_ratio": 1.0,
+    }
+
+    redis_mock.get.side_effect = None
+    redis_mock.get.return_value = None
+    redis_mock.set.return_value = True
+    await review_cache.get_or_create(
+        key="review:2",
+        create=AsyncMock(return_value=review)
+    )
+
+    assert cache_stats.get_hit_ratios()["review"] == {
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_last_review_round_trip(review_cache, redis_mock, review):
+    last_review = LastReview(head_sha="head_sha", review=review)
+
+    await review_cache.set_last_review("last_review:1", last_review)
+    redis_mock.get.return_value = redis_mock.set.call_args.args[1]
+
+    assert await review_cache.get_last_review("last_review:1") == last_review
+    assert redis_mock.set.call_args.kwargs == {"ex": REVIEW_HISTORY_TTL}
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_releases_lock(fake_redis, review):
+    review_cache = ReviewCache(redis=FailSafeRedis(redis=fake_redis))
+
+    result = await review_cache.get_or_create(
+        key="review:1",
+        create=AsyncMock(return_value=review)
+    )
+
+    assert result == review
+    assert await fake_redis.get("lock:review:1") is None
+    assert await fake_redis.get("review:1") == (
+        review.model_dump_json().encode()
+    )
+
+
+@pytest.mark.asyncio
+async def test_release_lock_keeps_lock_of_other_worker(fake_redis):
+    await fake_redis.set("lock:review:1", "other")
+
+    assert await fake_redis.eval(
+        RELEASE_LOCK_SCRIPT, 1, "lock:review:1", "mine"
+    ) == 0
+    assert await fake_redis.get("lock:review:1") == b"other"
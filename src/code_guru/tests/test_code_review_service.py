@@ -1,7 +1,18 @@
+import asyncio
+import uuid
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
+from src.code_guru.cache import ReviewCache
+from src.code_guru.exceptions import GitHubError
 from src.code_guru.services import CodeReviewService
-from src.code_guru.schemas import CodeReviewRequest, CodeReviewResponse
+from src.code_guru.schemas import (
+    BatchReviewRequest,
+    CodeReviewRequest,
+    CodeReviewResponse,
+    LastReview,
+)
+from src.database.base import FailSafeRedis
 
 
 @pytest.fixture
@@ -10,6 +21,7 @@ def git_hub_service_mock():
     mock.get_api_url_from_usual_url.return_value = (
         "https://api.github.com/repos/user/repo/contents/"
     )
+    mock.get_head_sha = AsyncMock(return_value="head_sha")
     mock.get_files_info = AsyncMock(
         return_value={"file1.py": "print('Hello World')"}
     )
@@ -19,15 +31,34 @@ def git_hub_service_mock():
 @pytest.fixture
 def groq_service_mock():
     mock = MagicMock()
-    mock.get_bot_response.return_value = "Mocked Review Response"
+    mock.get_prompt_token_budget.return_value = 100_000
+    mock.get_bot_response = AsyncMock(return_value="Mocked Review Response")
     return mock
 
 
 @pytest.fixture
-def code_review_service(git_hub_service_mock, groq_service_mock):
+def review_cache_mock():
+    async def get_or_create(key, create):
+        return await create()
+
+    mock = MagicMock()
+    mock.get_or_create = AsyncMock(side_effect=get_or_create)
+    mock.get_last_review = AsyncMock(return_value=None)
+    mock.set_last_review = AsyncMock()
+    return mock
+
+
+@pytest.fixture
+def code_review_service(
+    git_hub_service_mock,
+    groq_service_mock,
+    review_cache_mock
+):
     return CodeReviewService(
         git_hub_service=git_hub_service_mock,
-        groq_ai_service=groq_service_mock
+        groq_ai_service=groq_service_mock,
+        review_cache=review_cache_mock,
+        git_hub_client=MagicMock()
     )
 
 
@@ -56,8 +87,436 @@ async def test_review_success(
         url
     )
     git_hub_service_mock.get_files_info.assert_called_once()
-    groq_service_mock.get_bot_response.assert_called_once_with(
+    assert (
+        git_hub_service_mock.get_files_info.call_args.kwargs["head_sha"]
+        == "head_sha"
+    )
+    groq_service_mock.get_bot_response.assert_awaited_once_with(
         assignment_description=assignment_description,
         candidate_level=candidate_level,
-        files_info={"file1.py": "print('Hello World')"}
+        files_info={"file1.py": "print('Hello World')"},
+        skipped_files_summary=""
+    )
+
+
+@pytest.mark.asyncio
+async def test_review_cache_key(code_review_service, review_cache_mock):
+    requests = [
+        CodeReviewRequest(
+            github_repo_url="https://github.com/user/repo.git",
+            assignment_description=assignment_description,
+            candidate_level=candidate_level
+        )
+        for assignment_description, candidate_level in (
+            ("Implement a REST API.", "Junior"),
+            ("Implement a REST API.", "Junior"),
+            ("Implement a REST API.", "Senior"),
+            ("Implement a CLI.", "Junior"),
+        )
+    ]
+
+    for request in requests:
+        await code_review_service.review(code_review_request=request)
+
+    keys = [
+        call.kwargs["key"]
+        for call in review_cache_mock.get_or_create.call_args_list
+    ]
+    assert keys[0] == keys[1]
+    assert len(set(keys)) == 3
+    assert all(key.startswith("review:") for key in keys)
+
+
+@pytest.mark.asyncio
+async def test_review_stream(
+    code_review_service,
+    git_hub_service_mock,
+    groq_service_mock,
+    review_cache_mock
+):
+    files_info = {"file1.py": "print('Hello')", "file2.py": "print('World')"}
+
+    async def get_files_info(client, url, head_sha, on_file_fetched):
+        for filename in files_info:
+            on_file_fetched(filename)
+        return files_info
+
+    async def stream_bot_response(**kwargs):
+        for token in ("Mocked ", "Review"):
+            yield token
+
+    git_hub_service_mock.get_files_info = AsyncMock(
+        side_effect=get_files_info
+    )
+    groq_service_mock.stream_bot_response = stream_bot_response
+    request = CodeReviewRequest(
+        github_repo_url="https://github.com/user/repo.git",
+        assignment_description="Implement a REST API for a library system.",
+        candidate_level="Junior"
+    )
+
+    events = [
+        event
+        async for event in code_review_service.review_stream(request)
+    ]
+
+    assert events == [
+        ("progress", {"filename": "file1.py", "fetched_files": 1}),
+        ("progress", {"filename": "file2.py", "fetched_files": 2}),
+        ("token", {"content": "Mocked "}),
+        ("token", {"content": "Review"}),
+        (
+            "result",
+            {
+                "filenames": ["file1.py", "file2.py"],
+                "review_result": "Mocked Review",
+                "truncated_files": [],
+                "skipped_files": [],
+                "base_sha": None,
+            }
+        ),
+    ]
+    review_cache_mock.get_or_create.assert_awaited_once()
+    review_cache_mock.set_last_review.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_review_stream_cache_hit(
+    code_review_service,
+    git_hub_service_mock,
+    review_cache_mock
+):
+    review = CodeReviewResponse(
+        filenames=["file1.py"],
+        review_result="Cached Review"
+    )
+    review_cache_mock.get_or_create = AsyncMock(return_value=review)
+    request = CodeReviewRequest(
+        github_repo_url="https://github.com/user/repo.git",
+        assignment_description="Implement a REST API for a library system.",
+        candidate_level="Junior"
+    )
+
+    events = [
+        event
+        async for event in code_review_service.review_stream(request)
+    ]
+
+    assert events == [("result", review.model_dump())]
+    git_hub_service_mock.get_files_info.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_review_stream_joins_in_flight_review(
+    git_hub_service_mock,
+    groq_service_mock,
+    fake_redis
+):
+    stream_calls = 0
+
+    async def stream_bot_response(**kwargs):
+        nonlocal stream_calls
+        stream_calls += 1
+        for token in ("Mocked ", "Review"):
+            await asyncio.sleep(0)
+            yield token
+
+    groq_service_mock.stream_bot_response = stream_bot_response
+    code_review_service = CodeReviewService(
+        git_hub_service=git_hub_service_mock,
+        groq_ai_service=groq_service_mock,
+        review_cache=ReviewCache(redis=FailSafeRedis(redis=fake_redis)),
+        git_hub_client=MagicMock()
     )
+    request = CodeReviewRequest(
+        github_repo_url="https://github.com/user/repo.git",
+        assignment_description=uuid.uuid4().hex,
+        candidate_level="Junior"
+    )
+
+    async def collect_events():
+        return [
+            event
+            async for event in code_review_service.review_stream(request)
+        ]
+
+    first_events, second_events = await asyncio.gather(
+        collect_events(),
+        collect_events()
+    )
+
+    assert stream_calls == 1
+    assert ("token", {"content": "Review"}) in first_events
+    assert second_events == [first_events[-1]]
+    assert first_events[-1][1]["review_result"] == "Mocked Review"
+
+
+@pytest.mark.asyncio
+async def test_review_packs_files_info(
+    code_review_service,
+    git_hub_service_mock,
+    groq_service_mock
+):
+    files_info = {
+        "main.py": "print('Hello World')\n" * 10,
+        "poetry.lock": "[[package]]\n" * 100,
+    }
+    git_hub_service_mock.get_files_info.return_value = files_info
+    groq_service_mock.get_prompt_token_budget.return_value = 1000
+    request = CodeReviewRequest(
+        github_repo_url="https://github.com/user/repo.git",
+        assignment_description="Implement a REST API for a library system.",
+        candidate_level="Junior"
+    )
+
+    response = await code_review_service.review(code_review_request=request)
+
+    assert response.filenames == ["main.py", "poetry.lock"]
+    assert response.skipped_files == ["poetry.lock"]
+    call_kwargs = groq_service_mock.get_bot_response.call_args.kwargs
+    assert call_kwargs["files_info"] == {"main.py": files_info["main.py"]}
+    assert call_kwargs["skipped_files_summary"] == "poetry.lock"
+
+
+@pytest.mark.asyncio
+async def test_review_map_reduce(
+    code_review_service,
+    git_hub_service_mock,
+    groq_service_mock,
+    monkeypatch
+):
+    monkeypatch.setattr("src.code_guru.services.REVIEW_MAP_CONCURRENCY", 2)
+    monkeypatch.setattr("src.code_guru.services.GROQ_CONTEXT_WINDOW", 10_000)
+    files_info = {
+        f"src/module{index}.py": "x = 1\n" * 350 for index in range(12)
+    }
+    git_hub_service_mock.get_files_info.return_value = files_info
+    groq_service_mock.get_prompt_token_budget.return_value = 4096
+    in_flight = max_in_flight = 0
+
+    async def get_partial_review(part, parts_count, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"Findings {part}/{parts_count}"
+
+    groq_service_mock.get_partial_review = AsyncMock(
+        side_effect=get_partial_review
+    )
+    groq_service_mock.merge_reviews = AsyncMock(return_value="Merged Review")
+    request = CodeReviewRequest(
+        github_repo_url="https://github.com/user/repo.git",
+        assignment_description="Implement a REST API for a library system.",
+        candidate_level="Junior"
+    )
+
+    response = await code_review_service.review(code_review_request=request)
+
+    assert response.review_result == "Merged Review"
+    assert response.skipped_files == []
+    groq_service_mock.get_bot_response.assert_not_called()
+    parts_count = groq_service_mock.get_partial_review.await_count
+    assert parts_count == 3
+    assert max_in_flight == 2
+    reviewed_files = [
+        path
+        for call in groq_service_mock.get_partial_review.call_args_list
+        for path in call.kwargs["files_info"]
+    ]
+    assert sorted(reviewed_files) == sorted(files_info)
+    assert groq_service_mock.merge_reviews.call_args.kwargs[
+        "partial_reviews"
+    ] == ["Findings 1/3", "Findings 2/3", "Findings 3/3"]
+
+
+@pytest.mark.asyncio
+async def test_review_batch(
+    code_review_service,
+    git_hub_service_mock,
+    groq_service_mock
+):
+    async def get_files_info(client, url, head_sha):
+        if head_sha == "missing":
+            raise GitHubError(status_code=404, message="Not Found")
+        return {"file1.py": "print('Hello World')"}
+
+    git_hub_service_mock.get_api_url_from_usual_url.side_effect = (
+        lambda url: url
+    )
+    git_hub_service_mock.get_head_sha = AsyncMock(
+        side_effect=lambda client, url: (
+            "missing" if "missing" in url else "head_sha"
+        )
+    )
+    git_hub_service_mock.get_files_info = AsyncMock(
+        side_effect=get_files_info
+    )
+    batch_review_request = BatchReviewRequest(
+        assignment_description="Implement a REST API.",
+        github_repo_urls=[
+            "https://github.com/user/repo1.git",
+            "https://github.com/user/missing.git",
+            "https://github.com/user/repo2.git",
+        ],
+        candidate_level="Junior"
+    )
+
+    events = [
+        event
+        async for event in code_review_service.review_batch(
+            batch_review_request
+        )
+    ]
+
+    results = [data for event, data in events if event == "result"]
+    errors = [data for event, data in events if event == "error"]
+    assert {result["github_repo_url"] for result in results} == {
+        "https://github.com/user/repo1.git",
+        "https://github.com/user/repo2.git",
+    }
+    assert errors == [{
+        "github_repo_url": "https://github.com/user/missing.git",
+        "status_code": 404,
+        "detail": "Not Found",
+    }]
+    assert events[-1] == ("done", {"reviewed": 2, "failed": 1})
+    groq_service_mock.get_prompt_token_budget.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_review_batch_uses_git_hub_service_per_repo(
+    git_hub_service_mock,
+    groq_service_mock,
+    review_cache_mock
+):
+    git_hub_services = []
+
+    def create_git_hub_service():
+        git_hub_service = MagicMock()
+        git_hub_service.get_api_url_from_usual_url.side_effect = (
+            lambda url: url
+        )
+        git_hub_service.get_head_sha = AsyncMock(return_value="head_sha")
+        git_hub_service.get_files_info = AsyncMock(
+            return_value={"file1.py": "print('Hello World')"}
+        )
+        git_hub_services.append(git_hub_service)
+        return git_hub_service
+
+    code_review_service = CodeReviewService(
+        git_hub_service=git_hub_service_mock,
+        groq_ai_service=groq_service_mock,
+        review_cache=review_cache_mock,
+        git_hub_client=MagicMock(),
+        create_git_hub_service=create_git_hub_service
+    )
+    batch_review_request = BatchReviewRequest(
+        assignment_description="Implement a REST API.",
+        github_repo_urls=[
+            "https://github.com/user/repo1.git",
+            "https://github.com/user/repo2.git",
+        ],
+        candidate_level="Junior"
+    )
+
+    events = [
+        event
+        async for event in code_review_service.review_batch(
+            batch_review_request
+        )
+    ]
+
+    assert events[-1] == ("done", {"reviewed": 2, "failed": 0})
+    assert len(git_hub_services) == 2
+    for git_hub_service in git_hub_services:
+        git_hub_service.get_files_info.assert_awaited_once()
+    git_hub_service_mock.get_files_info.assert_not_awaited()
+    groq_service_mock.get_prompt_token_budget.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_review_delta(
+    code_review_service,
+    git_hub_service_mock,
+    groq_service_mock,
+    review_cache_mock
+):
+    review_cache_mock.get_last_review.return_value = LastReview(
+        head_sha="old_sha",
+        review=CodeReviewResponse(
+            filenames=["file0.py", "file1.py", "file2.py"],
+            review_result="Previous Review"
+        )
+    )
+    git_hub_service_mock.get_changed_files_info = AsyncMock(
+        return_value=({"file2.py": "print('Fixed')"}, ["file0.py"])
+    )
+    groq_service_mock.get_delta_prompt_token_budget.return_value = 100_000
+    groq_service_mock.get_delta_review = AsyncMock(
+        return_value="Delta Review"
+    )
+    request = CodeReviewRequest(
+        github_repo_url="https://github.com/user/repo.git",
+        assignment_description="Implement a REST API.",
+        candidate_level="Junior"
+    )
+
+    response = await code_review_service.review(code_review_request=request)
+
+    assert response == CodeReviewResponse(
+        filenames=["file1.py", "file2.py"],
+        review_result="Delta Review",
+        base_sha="old_sha"
+    )
+    git_hub_service_mock.get_changed_files_info.assert_awaited_once_with(
+        client=code_review_service._git_hub_client,
+        url="https://api.github.com/repos/user/repo/contents/",
+        base_sha="old_sha",
+        head_sha="head_sha"
+    )
+    git_hub_service_mock.get_files_info.assert_not_called()
+    groq_service_mock.get_delta_review.assert_awaited_once_with(
+        assignment_description="Implement a REST API.",
+        candidate_level="Junior",
+        previous_review="Previous Review",
+        files_info={"file2.py": "print('Fixed')"},
+        removed_files=["file0.py"],
+        skipped_files_summary=""
+    )
+    review_cache_mock.set_last_review.assert_awaited_once()
+    assert review_cache_mock.set_last_review.call_args.args[1] == LastReview(
+        head_sha="head_sha",
+        review=response
+    )
+
+
+@pytest.mark.asyncio
+async def test_review_delta_falls_back_to_full_review(
+    code_review_service,
+    git_hub_service_mock,
+    groq_service_mock,
+    review_cache_mock
+):
+    review_cache_mock.get_last_review.return_value = LastReview(
+        head_sha="old_sha",
+        review=CodeReviewResponse(
+            filenames=["file1.py"],
+            review_result="Previous Review"
+        )
+    )
+    git_hub_service_mock.get_changed_files_info = AsyncMock(
+        return_value=None
+    )
+    request = CodeReviewRequest(
+        github_repo_url="https://github.com/user/repo.git",
+        assignment_description="Implement a REST API.",
+        candidate_level="Junior"
+    )
+
+    response = await code_review_service.review(code_review_request=request)
+
+    assert response.review_result == "Mocked Review Response"
+    assert response.base_sha is None
+    git_hub_service_mock.get_files_info.assert_awaited_once()
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from src.code_guru.concurrency import gather_fail_fast
+from src.code_guru.exceptions import GitHubError
+
+
+@pytest.mark.asyncio
+async def test_gather_fail_fast_success():
+    async def double(value):
+        await asyncio.sleep(0)
+        return value * 2
+
+    result = await gather_fail_fast(*(double(value) for value in range(3)))
+
+    assert result == [0, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_gather_fail_fast_cancels_pending():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failing():
+        raise GitHubError(status_code=404, message="Not Found")
+
+    with pytest.raises(GitHubError):
+        await gather_fail_fast(slow(), failing())
+
+    assert cancelled.is_set()
@@ -0,0 +1,296 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.code_guru.dependencies import (
+    get_code_review_service,
+    get_repo_prefetcher,
+    get_review_job_queue,
+)
+from src.code_guru.exceptions import GitHubError
+from src.code_guru.metrics import record_timing
+from src.code_guru.schemas import (
+    CodeReviewRequest,
+    CodeReviewResponse,
+    ReviewJob,
+)
+from src.main import app
+
+
+REQUEST_DATA = {
+    "assignment_description": "Implement a REST API.",
+    "github_repo_url": "https://github.com/user/repo.git",
+    "candidate_level": "Junior",
+}
+
+
+@pytest.fixture
+def review_service_mock():
+    return MagicMock()
+
+
+@pytest.fixture
+def job_queue_mock():
+    return MagicMock()
+
+
+@pytest.fixture
+def prefetcher_mock():
+    prefetcher = MagicMock()
+    prefetcher.prefetch = AsyncMock()
+    return prefetcher
+
+
+@pytest.fixture
+def client(review_service_mock, job_queue_mock, prefetcher_mock):
+    app.dependency_overrides = {
+        get_code_review_service: lambda: review_service_mock,
+        get_review_job_queue: lambda: job_queue_mock,
+        get_repo_prefetcher: lambda: prefetcher_mock,
+    }
+    yield AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    )
+    app.dependency_overrides = {}
+
+
+@pytest.mark.asyncio
+async def test_code_review_stream_controller(client, review_service_mock):
+    async def review_stream(code_review_request):
+        yield "progress", {"filename": "file1.py", "fetched_files": 1}
+        yield "token", {"content": "Review"}
+        yield "result", {"filenames": ["file1.py"], "review_result": "Review"}
+
+    review_service_mock.review_stream = review_stream
+
+    async with client:
+        response = await client.post("/review/stream/", json=REQUEST_DATA)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == (
+        'event: progress\n'
+        'data: {"filename": "file1.py", "fetched_files": 1}\n\n'
+        'event: token\n'
+        'data: {"content": "Review"}\n\n'
+        'event: result\n'
+        'data: {"filenames": ["file1.py"], "review_result": "Review"}\n\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_code_review_stream_controller_error(
+    client,
+    review_service_mock
+):
+    async def review_stream(code_review_request):
+        raise GitHubError(status_code=404, message="Not Found")
+        yield
+
+    review_service_mock.review_stream = review_stream
+
+    async with client:
+        response = await client.post("/review/stream/", json=REQUEST_DATA)
+
+    assert response.text == (
+        'event: error\n'
+        'data: {"status_code": 404, "detail": "Not Found"}\n\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_code_review_batch_controller(client, review_service_mock):
+    async def review_batch(batch_review_request):
+        for github_repo_url in batch_review_request.github_repo_urls:
+            yield "error", {"github_repo_url": github_repo_url}
+        yield "done", {"reviewed": 0, "failed": 1}
+
+    review_service_mock.review_batch = review_batch
+
+    async with client:
+        response = await client.post(
+            "/review/batch/",
+            json={
+                "assignment_description": "Implement a REST API.",
+                "github_repo_urls": [
+                    "https://github.com/user/repo.git",
+                    "https://github.com/user/repo.git",
+                ],
+                "candidate_level": "Junior",
+            }
+        )
+
+    assert response.status_code == 200
+    assert response.text == (
+        'event: error\n'
+        'data: {"github_repo_url": "https://github.com/user/repo.git"}\n\n'
+        'event: done\n'
+        'data: {"reviewed": 0, "failed": 1}\n\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_code_review_batch_controller_rejects_bad_url(client):
+    async with client:
+        response = await client.post(
+            "/review/batch/",
+            json={
+                "assignment_description": "Implement a REST API.",
+                "github_repo_urls": ["https://gitlab.com/user/repo.git"],
+                "candidate_level": "Junior",
+            }
+        )
+
+    assert response.status_code == 422
+
+
+def make_review_job(status: str, **kwargs) -> ReviewJob:
+    return ReviewJob(
+        job_id="job1",
+        status=status,
+        priority="normal",
+        request=CodeReviewRequest(**REQUEST_DATA),
+        **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_submit_review_job_controller(client, job_queue_mock):
+    job_queue_mock.submit = AsyncMock(return_value=make_review_job("queued"))
+
+    async with client:
+        response = await client.post(
+            "/review/jobs/",
+            json={**REQUEST_DATA, "priority": "high"}
+        )
+
+    assert response.status_code == 202
+    assert response.json()["job_id"] == "job1"
+    assert job_queue_mock.submit.await_args.args[0].priority == "high"
+
+
+@pytest.mark.asyncio
+async def test_review_job_status_controller_not_found(client, job_queue_mock):
+    job_queue_mock.get = AsyncMock(return_value=None)
+
+    async with client:
+        response = await client.get("/review/jobs/job1/")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_review_job_result_controller(client, job_queue_mock):
+    review = CodeReviewResponse(filenames=["file1.py"], review_result="Ok")
+    job_queue_mock.get = AsyncMock(
+        return_value=make_review_job("succeeded", result=review)
+    )
+
+    async with client:
+        response = await client.get("/review/jobs/job1/result/")
+
+    assert response.status_code == 200
+    assert response.json() == review.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_review_job_result_controller_pending(client, job_queue_mock):
+    job_queue_mock.get = AsyncMock(return_value=make_review_job("running"))
+
+    async with client:
+        response = await client.get("/review/jobs/job1/result/")
+
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_review_job_result_controller_failed(client, job_queue_mock):
+    job_queue_mock.get = AsyncMock(
+        return_value=make_review_job(
+            "failed",
+            error="Not Found",
+            error_status_code=404
+        )
+    )
+
+    async with client:
+        response = await client.get("/review/jobs/job1/result/")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Not Found"}
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_controller(client):
+    async with client:
+        response = await client.get("/cache/stats/")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"tiers", "local_cache"}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_controller(client, prefetcher_mock):
+    async with client:
+        response = await client.post(
+            "/cache/prefetch/",
+            json={
+                "github_repo_urls": [
+                    "https://github.com/user/repo1.git",
+                    "https://github.com/user/repo2.git",
+                    "https://github.com/user/repo1.git",
+                ]
+            }
+        )
+
+    assert response.status_code == 202
+    assert response.json() == {"repos_count": 2}
+    prefetcher_mock.prefetch.assert_awaited_once_with([
+        "https://github.com/user/repo1.git",
+        "https://github.com/user/repo2.git",
+    ])
+
+
+@pytest.mark.asyncio
+async def test_prefetch_controller_rejects_bad_url(client, prefetcher_mock):
+    async with client:
+        response = await client.post(
+            "/cache/prefetch/",
+            json={"github_repo_urls": ["https://gitlab.com/user/repo.git"]}
+        )
+
+    assert response.status_code == 422
+    prefetcher_mock.prefetch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_code_review_controller_server_timing(
+    client,
+    review_service_mock
+):
+    async def review(code_review_request):
+        record_timing("groq", 0.25)
+        return CodeReviewResponse(filenames=["file1.py"], review_result="ok")
+
+    review_service_mock.review = review
+
+    async with client:
+        response = await client.post("/review/", json=REQUEST_DATA)
+
+    assert response.status_code == 200
+    groq_timing, total_timing = response.headers["Server-Timing"].split(", ")
+    assert groq_timing == "groq;dur=250.0"
+    assert total_timing.startswith("total;dur=")
+
+
+@pytest.mark.asyncio
+async def test_metrics_controller(client):
+    async with client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "review_stage_duration_seconds" in response.text
+    assert "local_cache_bytes" in response.text
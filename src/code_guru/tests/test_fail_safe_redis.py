@@ -0,0 +1,78 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError, TimeoutError
+
+from src.code_guru.cache import ReviewCache
+from src.code_guru.schemas import CodeReviewResponse
+from src.database.base import FailSafeRedis
+
+
+@pytest.fixture(autouse=True)
+def reset_availability(monkeypatch):
+    monkeypatch.setattr(FailSafeRedis, "_unavailable_until", 0)
+
+
+@pytest.fixture
+def redis_mock():
+    return AsyncMock()
+
+
+@pytest.fixture
+def fail_safe_redis(redis_mock):
+    return FailSafeRedis(redis=redis_mock)
+
+
+@pytest.mark.asyncio
+async def test_fail_safe_redis_passes_through(fail_safe_redis, redis_mock):
+    redis_mock.get.return_value = b"value"
+
+    assert await fail_safe_redis.get("key") == b"value"
+    redis_mock.get.assert_awaited_once_with("key")
+
+
+@pytest.mark.asyncio
+async def test_fail_safe_redis_bypasses_unavailable_redis(
+    fail_safe_redis,
+    redis_mock
+):
+    redis_mock.get.side_effect = ConnectionError("Connection refused")
+
+    assert await fail_safe_redis.get("key") is None
+    assert not fail_safe_redis.is_available
+    assert await fail_safe_redis.mget(["key1", "key2"]) == [None, None]
+    assert await fail_safe_redis.set("key", b"value", ex=60) is True
+    assert await fail_safe_redis.eval("script", 0) is None
+    redis_mock.mget.assert_not_awaited()
+    redis_mock.set.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_fail_safe_redis_set_many_pipelines_writes(
+    fail_safe_redis,
+    redis_mock
+):
+    pipeline = MagicMock()
+    pipeline.execute = AsyncMock()
+    redis_mock.pipeline = MagicMock(return_value=pipeline)
+    pipeline.__aenter__ = AsyncMock(return_value=pipeline)
+    pipeline.__aexit__ = AsyncMock(return_value=None)
+
+    await fail_safe_redis.set_many({"key1": b"1", "key2": b"2"}, ex=60)
+
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    assert pipeline.set.call_count == 2
+    pipeline.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_review_cache_reviews_without_redis(redis_mock):
+    redis_mock.get.side_effect = TimeoutError("Timeout reading from socket")
+    review = CodeReviewResponse(filenames=["file1.py"], review_result="Ok")
+    create = AsyncMock(return_value=review)
+    review_cache = ReviewCache(redis=FailSafeRedis(redis=redis_mock))
+
+    result = await review_cache.get_or_create(key="review:1", create=create)
+
+    assert result == review
+    create.assert_awaited_once()
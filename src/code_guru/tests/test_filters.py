@@ -0,0 +1,56 @@
+from src.code_guru.filters import ByteBudget, FileFilter, is_binary_content
+
+
+def test_file_filter_skips_default_rules():
+    file_filter = FileFilter()
+
+    assert not file_filter.is_excluded("src/main.py")
+    assert file_filter.is_excluded("node_modules/react/index.js")
+    assert file_filter.is_excluded("web/node_modules/react/index.js")
+    assert file_filter.is_excluded("static/logo.PNG")
+    assert file_filter.is_excluded("poetry.lock")
+    assert file_filter.is_excluded("build/app.js")
+    assert file_filter.is_excluded("vendor/github.com/pkg/errors/errors.go")
+    assert not file_filter.is_excluded(
+        "src/main/java/com/acme/build/Builder.java"
+    )
+    assert not file_filter.is_excluded("pkg/env/config.go")
+    assert not file_filter.is_excluded("internal/target/target.go")
+
+
+def test_file_filter_applies_gitignore_rules():
+    file_filter = FileFilter(
+        rules=["build/", "*.log", "!keep.log", "/docs/**/*.md", "!build/a"]
+    )
+
+    assert file_filter.is_excluded("build/a")
+    assert file_filter.is_excluded("src/build/b.py")
+    assert not file_filter.is_excluded("build.py")
+    assert file_filter.is_excluded("logs/debug.log")
+    assert not file_filter.is_excluded("keep.log")
+    assert file_filter.is_excluded("docs/guide/intro.md")
+    assert file_filter.is_excluded("docs/index.md")
+    assert not file_filter.is_excluded("src/docs/index.md")
+    assert file_filter.is_directory_excluded("src/build")
+
+
+def test_file_filter_caps_file_size():
+    file_filter = FileFilter(rules=[], max_file_size=100)
+
+    assert not file_filter.is_excluded("main.py", size=100)
+    assert file_filter.is_excluded("main.py", size=101)
+    assert not file_filter.is_excluded("main.py")
+
+
+def test_is_binary_content():
+    assert is_binary_content(b"\x89PNG\x00\x00")
+    assert not is_binary_content("print('привіт')".encode("utf-8"))
+
+
+def test_byte_budget_reserve():
+    budget = ByteBudget(limit=100)
+
+    assert budget.reserve(60)
+    assert not budget.reserve(50)
+    assert budget.reserve(40)
+    assert budget.remaining == 0
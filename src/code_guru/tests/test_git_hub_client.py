@@ -0,0 +1,92 @@
+import httpx
+import pytest
+from httpx import AsyncHTTPTransport, Request, Response
+
+from src.git_hub.api import RetryTransport
+from src.main import app, lifespan
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = {"count": 0, "outcomes": []}
+
+    async def handle_async_request(self, request):
+        outcome = calls["outcomes"][calls["count"]]
+        calls["count"] += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return Response(outcome, request=request)
+
+    monkeypatch.setattr(
+        AsyncHTTPTransport,
+        "handle_async_request",
+        handle_async_request
+    )
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_retries_server_errors(upstream):
+    upstream["outcomes"] = [
+        503,
+        httpx.ConnectError("Connection refused"),
+        200,
+    ]
+    transport = RetryTransport(max_retries=3, backoff=0)
+
+    response = await transport.handle_async_request(
+        Request("GET", "https://api.github.com/repos/user/repo")
+    )
+
+    assert response.status_code == 200
+    assert upstream["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_gives_up_after_max_retries(upstream):
+    upstream["outcomes"] = [502, 502, 502]
+    transport = RetryTransport(max_retries=2, backoff=0)
+
+    response = await transport.handle_async_request(
+        Request("GET", "https://api.github.com/repos/user/repo")
+    )
+
+    assert response.status_code == 502
+    assert upstream["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_does_not_retry_client_errors(upstream):
+    upstream["outcomes"] = [404]
+    transport = RetryTransport(max_retries=3, backoff=0)
+
+    response = await transport.handle_async_request(
+        Request("GET", "https://api.github.com/repos/user/repo")
+    )
+
+    assert response.status_code == 404
+    assert upstream["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_does_not_retry_unsafe_methods(upstream):
+    upstream["outcomes"] = [503]
+    transport = RetryTransport(max_retries=3, backoff=0)
+
+    response = await transport.handle_async_request(
+        Request("POST", "https://api.github.com/graphql")
+    )
+
+    assert response.status_code == 503
+    assert upstream["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_git_hub_client_is_shared_for_app_lifetime():
+    async with lifespan(app):
+        client = app.state.git_hub_client
+        assert isinstance(client, httpx.AsyncClient)
+        assert not client.is_closed
+
+    assert client.is_closed
+
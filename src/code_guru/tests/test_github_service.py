@@ -1,15 +1,52 @@
-import base64
-import time
+import asyncio
+import hashlib
+import io
+import tarfile
 
 import pytest
 from unittest.mock import AsyncMock
-from httpx import Response
-from src.code_guru.services import GitHubService, GitHubError
+from httpx import AsyncClient, MockTransport, Request, Response
+from src.code_guru.cache import LocalCache
+from src.code_guru.filters import ByteBudget
+from src.code_guru.serializers import (
+    deserialize_cached_response,
+    serialize_cached_response,
+    serialize_content,
+    serialize_files_info,
+)
+from src.code_guru.metrics import GITHUB_REQUESTS
+from src.code_guru.services import (
+    GitHubError,
+    GitHubService,
+)
+from src.settings import (
+    GITHUB_BLOB_CACHE_TTL,
+    GITHUB_CONDITIONAL_CACHE_TTL,
+    GITHUB_MAX_FILE_SIZE,
+    GITHUB_TREE_CACHE_TTL,
+)
+
+
+def make_tarball(files: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for path, data in files.items():
+            info = tarfile.TarInfo(path)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    return buffer.getvalue()
 
 
 @pytest.fixture
 def redis_mock():
-    return AsyncMock()
+    mock = AsyncMock()
+
+    async def mget(keys):
+        return [await mock.get(key) for key in keys]
+
+    mock.mget.side_effect = mget
+    return mock
 
 
 @pytest.fixture
@@ -18,8 +55,25 @@ def client_mock():
 
 
 @pytest.fixture
-def github_service(redis_mock):
-    return GitHubService(redis=redis_mock)
+def rate_limiter_mock():
+    mock = AsyncMock()
+    mock.acquire.return_value = "token"
+    mock.update.return_value = False
+    return mock
+
+
+@pytest.fixture
+def local_cache():
+    return LocalCache()
+
+
+@pytest.fixture
+def github_service(redis_mock, rate_limiter_mock, local_cache):
+    return GitHubService(
+        redis=redis_mock,
+        rate_limiter=rate_limiter_mock,
+        local_cache=local_cache
+    )
 
 
 @pytest.mark.asyncio
@@ -33,44 +87,103 @@ async def test_get_api_url_from_usual_url(github_service):
 
 
 @pytest.mark.asyncio
-async def test_ensure_rate_limit_no_limit_exceeded(github_service, redis_mock):
-    redis_mock.get.side_effect = lambda key: {
-        "github_rate_remaining": "10",
-        "github_rate_reset": "0"
-    }.get(key)
+async def test_get_github_response_content_success(
+    github_service,
+    client_mock,
+    redis_mock
+):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    response_data = {"status": 200, "content": {"key": "value"}}
+    client_mock.get.return_value = Response(200, json=response_data)
 
-    message = await github_service._ensure_rate_limit()
+    result = await github_service._get_github_response_content(
+        client=client_mock,
+        url=url
+    )
 
-    assert message is None
+    assert result["content"] == response_data["content"]
 
 
 @pytest.mark.asyncio
-async def test_ensure_rate_limit_limit_exceeded(github_service, redis_mock):
-    redis_mock.get.side_effect = lambda key: {
-        "github_rate_remaining": "0",
-        "github_rate_reset": str(int(time.time()) + 60)
-    }.get(key)
+async def test_get_github_response_waits_out_rate_limit(
+    github_service,
+    client_mock,
+    rate_limiter_mock
+):
+    url = "https://api.github.com/repos/user/repo"
+    limited_response = Response(429, json={"message": "Slow down"})
+    client_mock.get.side_effect = [
+        limited_response,
+        Response(200, json={"size": 1}),
+    ]
+    rate_limiter_mock.acquire.side_effect = ["token1", "token2"]
+    rate_limiter_mock.update.side_effect = [True, False]
+
+    result = await github_service._get_github_response_content(
+        client=client_mock,
+        url=url
+    )
 
-    message = await github_service._ensure_rate_limit()
-    assert message.startswith("Rate limit exceeded.")
+    assert result == {"size": 1}
+    assert client_mock.get.call_args.kwargs["headers"] == {
+        "Authorization": "Bearer token2"
+    }
+    rate_limiter_mock.update.assert_any_await("token1", limited_response)
 
 
 @pytest.mark.asyncio
-async def test_get_github_response_content_success(
+async def test_get_head_sha_stores_validators(
     github_service,
     client_mock,
     redis_mock
 ):
     url = "https://api.github.com/repos/user/repo/contents/"
-    response_data = {"status": 200, "content": {"key": "value"}}
-    client_mock.get.return_value = Response(200, json=response_data)
+    redis_mock.get.return_value = None
+    client_mock.get.return_value = Response(
+        200,
+        text="head_sha",
+        headers={"ETag": '"etag1"'}
+    )
 
-    result = await github_service._get_github_response_content(
-        client=client_mock,
-        url=url
+    assert await github_service.get_head_sha(client_mock, url) == "head_sha"
+
+    cache_key, cached_response = redis_mock.set.await_args.args
+    assert cache_key.startswith("response:")
+    assert deserialize_cached_response(cached_response) == (
+        {"etag": '"etag1"'},
+        b"head_sha"
     )
+    assert redis_mock.set.await_args.kwargs == {
+        "ex": GITHUB_CONDITIONAL_CACHE_TTL
+    }
 
-    assert result["content"] == response_data["content"]
+
+@pytest.mark.asyncio
+async def test_get_head_sha_served_from_cache_on_not_modified(
+    github_service,
+    client_mock,
+    redis_mock
+):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    redis_mock.get.return_value = serialize_cached_response(
+        {"etag": '"etag1"'},
+        b"head_sha"
+    )
+    client_mock.get.return_value = Response(
+        304,
+        request=Request("GET", url)
+    )
+    not_modified = GITHUB_REQUESTS.labels("commits", "304", "true")
+    not_modified_count = not_modified._value.get()
+
+    assert await github_service.get_head_sha(client_mock, url) == "head_sha"
+
+    assert client_mock.get.call_args.kwargs["headers"][
+        "If-None-Match"
+    ] == '"etag1"'
+    assert not_modified._value.get() == not_modified_count + 1
+    redis_mock.hincrby.assert_not_awaited()
+    redis_mock.set.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -87,17 +200,26 @@ async def test_get_github_response_content_error(github_service, client_mock):
 
 
 @pytest.mark.asyncio
-async def test_get_files_info_cache_hit(github_service, redis_mock):
+async def test_get_files_info_cache_hit(
+    github_service,
+    client_mock,
+    redis_mock
+):
     url = "https://api.github.com/repos/user/repo/contents/"
+    client_mock.get.return_value = Response(200, text="head_sha")
 
     redis_mock.get.side_effect = lambda key: {
-        "github_rate_remaining": "10",
-        "github_rate_reset": str(int(time.time()) + 60),
-        f"files_info:{url}:None": str({"file1": "content1"})
+        "tree:head_sha": serialize_files_info({"file1": "blob_sha"}),
+        "blob:blob_sha": serialize_content("content1"),
     }.get(key)
 
-    result = await github_service.get_files_info(client=AsyncMock(), url=url)
+    result = await github_service.get_files_info(client=client_mock, url=url)
+
     assert result == {"file1": "content1"}
+    client_mock.get.assert_called_once()
+    assert client_mock.get.call_args.kwargs["url"] == (
+        "https://api.github.com/repos/user/repo/commits/HEAD"
+    )
 
 
 @pytest.mark.asyncio
@@ -106,49 +228,524 @@ async def test_get_files_info_no_cache(
 ):
     url = "https://api.github.com/repos/user/repo/contents/"
     redis_mock.get.return_value = None
-    client_mock.get.return_value = Response(
-        200, json=[
-            {
-                "type": "file",
-                "name": "file1",
-                "url": "file_url"
+    client_mock.get.side_effect = [
+        Response(200, text="head_sha"),
+        Response(200, json={"size": 10}),
+        Response(
+            200, json={
+                "sha": "tree_sha",
+                "truncated": False,
+                "tree": [
+                    {"type": "tree", "path": "src", "url": "tree_url"},
+                    {
+                        "type": "blob",
+                        "path": "src/file1",
+                        "sha": "blob_sha",
+                        "url": "blob_url"
+                    },
+                    {"type": "commit", "path": "submodule", "url": None},
+                ]
             }
-        ]
+        ),
+    ]
+    github_service._get_file_content = AsyncMock(return_value="content1")
+
+    result = await github_service.get_files_info(client=client_mock, url=url)
+
+    assert result == {"src/file1": "content1"}
+    assert client_mock.get.call_count == 3
+    assert client_mock.get.call_args.kwargs["url"] == (
+        "https://api.github.com/repos/user/repo/git/trees/head_sha"
+        "?recursive=1"
+    )
+    redis_mock.set.assert_any_call(
+        "tree:head_sha",
+        serialize_files_info({"src/file1": "blob_sha"}),
+        ex=GITHUB_TREE_CACHE_TTL
     )
+
+
+@pytest.mark.asyncio
+async def test_get_files_info_truncated_tree(
+    github_service, client_mock, redis_mock
+):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    redis_mock.get.return_value = None
+    client_mock.get.side_effect = [
+        Response(200, text="head_sha"),
+        Response(200, json={"size": 10}),
+        Response(200, json={"sha": "tree_sha", "truncated": True, "tree": []}),
+        Response(
+            200, json=[
+                {
+                    "type": "dir",
+                    "name": "src",
+                    "path": "src",
+                    "url": "dir_url"
+                },
+                {
+                    "type": "file",
+                    "name": "file1",
+                    "path": "file1",
+                    "sha": "blob_sha_1",
+                    "url": "file_url"
+                },
+            ]
+        ),
+        Response(
+            200, json=[
+                {
+                    "type": "file",
+                    "name": "file2",
+                    "path": "src/file2",
+                    "sha": "blob_sha_2",
+                    "url": "file_url"
+                }
+            ]
+        ),
+    ]
     github_service._get_file_content = AsyncMock(return_value="content1")
 
     result = await github_service.get_files_info(client=client_mock, url=url)
 
+    assert result == {"file1": "content1", "src/file2": "content1"}
+
+
+@pytest.mark.asyncio
+async def test_get_files_info_archive(github_service, redis_mock):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    redis_mock.get.return_value = None
+    archive = make_tarball({
+        "user-repo-abc123/src/file1.py": b"print('Hello World')",
+        "user-repo-abc123/logo.png": b"\x89PNG\xff\xfe",
+        "user-repo-abc123/data": b"\x00\x01\x02",
+        "user-repo-abc123/node_modules/lib.js": b"module.exports = {}",
+    })
+
+    def handler(request):
+        if request.url.path == "/repos/user/repo/commits/HEAD":
+            return Response(200, text="head_sha")
+        if request.url.path == "/repos/user/repo":
+            return Response(200, json={"size": 10 ** 6})
+        if request.url.path == "/repos/user/repo/tarball/head_sha":
+            return Response(
+                302,
+                headers={"Location": "https://codeload.github.com/archive"}
+            )
+        return Response(200, content=archive)
+
+    async with AsyncClient(transport=MockTransport(handler)) as client:
+        result = await github_service.get_files_info(client=client, url=url)
+
+    assert result == {"src/file1.py": "print('Hello World')"}
+    blob_sha = hashlib.sha1(b"blob 20\0print('Hello World')").hexdigest()
+    redis_mock.set_many.assert_awaited_once_with(
+        {f"blob:{blob_sha}": serialize_content("print('Hello World')")},
+        ex=GITHUB_BLOB_CACHE_TTL
+    )
+    redis_mock.set.assert_any_call(
+        "tree:head_sha",
+        serialize_files_info({"src/file1.py": blob_sha}),
+        ex=GITHUB_TREE_CACHE_TTL
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_files_info_archive_retries_rate_limits(
+    github_service, redis_mock, rate_limiter_mock
+):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    redis_mock.get.return_value = None
+    archive = make_tarball({
+        "user-repo-abc123/src/file1.py": b"print('Hello World')",
+    })
+    tarball_requests = []
+
+    def handler(request):
+        if request.url.path == "/repos/user/repo/commits/HEAD":
+            return Response(200, text="head_sha")
+        if request.url.path == "/repos/user/repo":
+            return Response(200, json={"size": 10 ** 6})
+        if request.url.path == "/repos/user/repo/tarball/head_sha":
+            tarball_requests.append(request)
+            if len(tarball_requests) == 1:
+                return Response(
+                    403,
+                    headers={"Retry-After": "0"},
+                    json={"message": "You have exceeded a secondary limit"}
+                )
+            return Response(
+                302,
+                headers={"Location": "https://codeload.github.com/archive"}
+            )
+        return Response(200, content=archive)
+
+    async def update(token, response):
+        return response.status_code == 403
+
+    rate_limiter_mock.update.side_effect = update
+
+    async with AsyncClient(transport=MockTransport(handler)) as client:
+        result = await github_service.get_files_info(client=client, url=url)
+
+    assert result == {"src/file1.py": "print('Hello World')"}
+    assert len(tarball_requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_files_info_never_fetches_filtered_files(
+    github_service, client_mock, redis_mock
+):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    redis_mock.get.return_value = None
+    client_mock.get.side_effect = [
+        Response(200, text="head_sha"),
+        Response(200, json={"size": 10}),
+        Response(
+            200, json={
+                "sha": "tree_sha",
+                "truncated": False,
+                "tree": [
+                    {
+                        "type": "blob",
+                        "path": "src/app.py",
+                        "sha": "app_sha",
+                        "size": 100,
+                        "url": "app_url"
+                    },
+                    {
+                        "type": "blob",
+                        "path": "static/logo.png",
+                        "sha": "logo_sha",
+                        "size": 100,
+                        "url": "logo_url"
+                    },
+                    {
+                        "type": "blob",
+                        "path": "data/dump.sql",
+                        "sha": "dump_sha",
+                        "size": 10 ** 8,
+                        "url": "dump_url"
+                    },
+                ]
+            }
+        ),
+    ]
+    github_service._get_file_content = AsyncMock(return_value="content1")
+
+    result = await github_service.get_files_info(client=client_mock, url=url)
+
+    assert result == {"src/app.py": "content1"}
+    github_service._get_file_content.assert_awaited_once()
+    redis_mock.mget.assert_awaited_once_with(["blob:app_sha"])
+
+
+@pytest.mark.asyncio
+async def test_get_files_info_served_from_local_cache(
+    github_service,
+    client_mock,
+    redis_mock
+):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    client_mock.get.return_value = Response(200, text="head_sha")
+    redis_mock.get.side_effect = lambda key: {
+        "tree:head_sha": serialize_files_info({"file1": "blob_sha"}),
+        "blob:blob_sha": serialize_content("content1"),
+    }.get(key)
+
+    await github_service.get_files_info(client=client_mock, url=url)
+    redis_mock.get.reset_mock()
+    redis_mock.mget.reset_mock()
+    result = await github_service.get_files_info(client=client_mock, url=url)
+
     assert result == {"file1": "content1"}
+    assert all(
+        call.args[0].startswith("response:")
+        for call in redis_mock.get.call_args_list
+    )
+    redis_mock.mget.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_get_file_content_cache_hit(github_service, redis_mock):
-    file_url = "https://api.github.com/repos/user/repo/contents/file1"
-    redis_mock.get.return_value = "cached_content"
+async def test_get_cached_contents_reads_redis_in_bulk(
+    github_service,
+    redis_mock,
+    local_cache,
+    monkeypatch
+):
+    monkeypatch.setattr(
+        "src.code_guru.services.CACHE_MGET_BATCH_SIZE", 2
+    )
+    local_cache.set("blob:sha1", "content1", size=8)
+    redis_mock.get.side_effect = lambda key: {
+        "blob:sha2": serialize_content("content2"),
+        "blob:sha3": serialize_content("content3"),
+        "blob:sha4": b"corrupted",
+    }.get(key)
+
+    result = await github_service._get_cached_contents(
+        {"sha1", "sha2", "sha3", "sha4", "sha5"}
+    )
+
+    assert result == {
+        "sha1": "content1",
+        "sha2": "content2",
+        "sha3": "content3",
+    }
+    assert redis_mock.mget.await_count == 2
+    assert local_cache.get("blob:sha2") == "content2"
+
+
+@pytest.mark.asyncio
+async def test_get_file_content_no_cache(github_service, redis_mock):
+    file_url = "https://api.github.com/repos/user/repo/git/blobs/blob_sha"
+    redis_mock.get.return_value = None
+
+    def handler(request):
+        assert request.headers["Accept"] == "application/vnd.github.raw+json"
+        return Response(200, content=b"file_content")
+
+    async with AsyncClient(transport=MockTransport(handler)) as client:
+        result = await github_service._get_file_content(
+            client=client,
+            item_data={"url": file_url, "path": "file1", "sha": "blob_sha"}
+        )
+
+    assert result == "file_content"
+    redis_mock.set.assert_any_call(
+        "blob:blob_sha",
+        serialize_content("file_content"),
+        ex=GITHUB_BLOB_CACHE_TTL
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "content",
+    [b"\x00\x01", b"\xff\xfe", b"x" * (GITHUB_MAX_FILE_SIZE + 1)]
+)
+async def test_get_file_content_skips_binary_and_oversized(
+    github_service,
+    redis_mock,
+    content
+):
+    file_url = "https://api.github.com/repos/user/repo/git/blobs/blob_sha"
+
+    async def stream():
+        yield content
+
+    def handler(request):
+        return Response(200, content=stream())
+
+    async with AsyncClient(transport=MockTransport(handler)) as client:
+        result = await github_service._get_file_content(
+            client=client,
+            item_data={"url": file_url, "path": "file1", "sha": "blob_sha"}
+        )
+
+    assert result is None
+    redis_mock.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_file_content_decodes_split_characters(github_service):
+    file_url = "https://api.github.com/repos/user/repo/git/blobs/blob_sha"
+    data = "привіт".encode()
+
+    async def stream():
+        for index in range(len(data)):
+            yield data[index:index + 1]
+
+    def handler(request):
+        return Response(200, content=stream())
+
+    async with AsyncClient(transport=MockTransport(handler)) as client:
+        result = await github_service._get_file_content(
+            client=client,
+            item_data={"url": file_url, "path": "file1", "sha": "blob_sha"}
+        )
+
+    assert result == "привіт"
+
+
+@pytest.mark.asyncio
+async def test_get_files_content_respects_review_budget(
+    github_service,
+    redis_mock,
+    monkeypatch
+):
+    monkeypatch.setattr(
+        "src.code_guru.services.ByteBudget",
+        lambda: ByteBudget(limit=250)
+    )
+    redis_mock.get.return_value = None
+    github_service._get_file_content = AsyncMock(return_value="content1")
 
-    result = await github_service._get_file_content(
+    result = await github_service._get_files_content(
         client=AsyncMock(),
-        item_data={"url": file_url}
+        files=[
+            {"path": "README.md", "sha": "readme_sha", "size": 100},
+            {"path": "src/big.py", "sha": "big_sha", "size": 200},
+            {"path": "src/app.py", "sha": "app_sha", "size": 100},
+            {"path": "src/util.py", "sha": "util_sha", "size": 100},
+        ]
     )
 
-    assert result == "cached_content"
+    assert list(result) == ["src/app.py", "src/util.py"]
 
 
 @pytest.mark.asyncio
-async def test_get_file_content_no_cache(
+async def test_get_files_info_archive_stops_at_review_budget(
     github_service,
-    client_mock,
-    redis_mock
+    redis_mock,
+    monkeypatch
 ):
-    file_url = "https://api.github.com/repos/user/repo/contents/file1"
-    file_data = {"content": base64.b64encode(b"file_content").decode("utf-8")}
+    monkeypatch.setattr(
+        "src.code_guru.services.ByteBudget",
+        lambda: ByteBudget(limit=250)
+    )
+    url = "https://api.github.com/repos/user/repo/contents/"
     redis_mock.get.return_value = None
-    client_mock.get.return_value = Response(200, json=file_data)
+    archive = make_tarball({
+        f"user-repo-abc123/src/file{index}.py": b"x" * 100
+        for index in range(10)
+    })
 
-    result = await github_service._get_file_content(
+    def handler(request):
+        if request.url.path == "/repos/user/repo/commits/HEAD":
+            return Response(200, text="head_sha")
+        if request.url.path == "/repos/user/repo":
+            return Response(200, json={"size": 10 ** 6})
+        return Response(200, content=archive)
+
+    async with AsyncClient(transport=MockTransport(handler)) as client:
+        result = await github_service.get_files_info(client=client, url=url)
+
+    assert list(result) == ["src/file0.py", "src/file1.py"]
+
+
+@pytest.mark.asyncio
+async def test_get_github_response_content_bounded_concurrency(
+    github_service,
+    redis_mock,
+    monkeypatch
+):
+    monkeypatch.setattr(
+        github_service, "_review_semaphore", asyncio.Semaphore(2)
+    )
+    in_flight = max_in_flight = 0
+
+    async def get(url, headers):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Response(200, json={})
+
+    client_mock = AsyncMock()
+    client_mock.get.side_effect = get
+
+    await asyncio.gather(
+        *(
+            github_service._get_github_response_content(
+                client=client_mock,
+                url=f"file_url_{index}"
+            )
+            for index in range(6)
+        )
+    )
+
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_get_changed_files_info(
+    github_service, client_mock, redis_mock
+):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    redis_mock.get.return_value = None
+    client_mock.get.return_value = Response(
+        200, json={
+            "status": "ahead",
+            "files": [
+                {
+                    "filename": "src/app.py",
+                    "status": "modified",
+                    "sha": "app_sha"
+                },
+                {
+                    "filename": "src/old.py",
+                    "status": "removed",
+                    "sha": "old_sha"
+                },
+                {
+                    "filename": "src/new.py",
+                    "previous_filename": "src/renamed.py",
+                    "status": "renamed",
+                    "sha": "new_sha"
+                },
+                {
+                    "filename": "static/logo.png",
+                    "status": "added",
+                    "sha": "logo_sha"
+                },
+            ]
+        }
+    )
+    github_service._get_file_content = AsyncMock(return_value="content1")
+
+    result = await github_service.get_changed_files_info(
         client=client_mock,
-        item_data={"url": file_url}
+        url=url,
+        base_sha="base_sha",
+        head_sha="head_sha"
     )
 
-    assert result == "file_content"
+    assert result == (
+        {"src/app.py": "content1", "src/new.py": "content1"},
+        ["src/old.py", "src/renamed.py"],
+    )
+    assert client_mock.get.call_args.kwargs["url"] == (
+        "https://api.github.com/repos/user/repo/compare/base_sha...head_sha"
+    )
+    assert github_service._get_file_content.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_changed_files_info_diverged(github_service, client_mock):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    client_mock.get.return_value = Response(
+        200, json={"status": "diverged", "files": []}
+    )
+
+    result = await github_service.get_changed_files_info(
+        client=client_mock,
+        url=url,
+        base_sha="base_sha",
+        head_sha="head_sha"
+    )
+
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_get_changed_files_info_without_common_ancestor(
+    github_service, client_mock
+):
+    url = "https://api.github.com/repos/user/repo/contents/"
+    client_mock.get.return_value = Response(
+        404, json={
+            "message": "No common ancestor between base_sha and head_sha.",
+            "status": "404"
+        }
+    )
+
+    result = await github_service.get_changed_files_info(
+        client=client_mock,
+        url=url,
+        base_sha="base_sha",
+        head_sha="head_sha"
+    )
+
+    assert result is None
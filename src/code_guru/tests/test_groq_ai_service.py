@@ -1,18 +1,45 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from groq import APIStatusError
+from httpx import Request, Response
 
 from src.code_guru.exceptions import ChatBotError
+from src.code_guru.rate_limit import GroqRateLimiter, ModelLease
 from src.code_guru.services import GroqAIService
+from src.database.base import FailSafeRedis
+from src.settings import (
+    GROQ_FALLBACK_MODELS,
+    GROQ_LIGHT_MODEL,
+    GROQ_MAX_RETRIES,
+    GROQ_MODEL,
+)
+
+
+def make_api_error(
+    status_code: int,
+    code: str = "rate_limit_exceeded",
+    headers: dict[str, str] = None
+) -> APIStatusError:
+    return APIStatusError(
+        response=Response(
+            status_code,
+            headers=headers,
+            request=Request("POST", "https://api.groq.com")
+        ),
+        body={"error": {"message": "Groq error", "code": code}},
+        message="Groq error"
+    )
 
 
 @pytest.fixture
 def groq_api_mock():
     groq_mock = MagicMock()
+    groq_mock.chat.completions.create = AsyncMock()
     groq_mock.chat.completions.create.return_value = MagicMock(
         choices=[
-            MagicMock(message=MagicMock(content="Mocked Review Response"))]
+            MagicMock(message=MagicMock(content="Mocked Review Response"))],
+        usage=MagicMock(prompt_tokens=100, completion_tokens=10)
     )
     return groq_mock
 
@@ -22,22 +49,24 @@ def groq_service(groq_api_mock):
     return GroqAIService(groq_api=groq_api_mock)
 
 
-def test_get_bot_response_success(groq_service, groq_api_mock):
+@pytest.mark.asyncio
+async def test_get_bot_response_success(groq_service, groq_api_mock):
     assignment_description = "Implement a REST API for a library system."
     candidate_level = "Junior"
     files_info = {"file1.py": "print('Hello World')"}
 
-    response = groq_service.get_bot_response(
+    response = await groq_service.get_bot_response(
         assignment_description=assignment_description,
         candidate_level=candidate_level,
         files_info=files_info
     )
 
     assert response == "Mocked Review Response"
-    groq_api_mock.chat.completions.create.assert_called_once()
+    groq_api_mock.chat.completions.create.assert_awaited_once()
 
 
-def test_get_bot_response_api_error(groq_service, groq_api_mock):
+@pytest.mark.asyncio
+async def test_get_bot_response_api_error(groq_service, groq_api_mock):
     message = "Internal Server Error"
 
     mock_response = MagicMock()
@@ -55,7 +84,7 @@ def test_get_bot_response_api_error(groq_service, groq_api_mock):
     files_info = {"file1.py": "print('Hello World')"}
 
     with pytest.raises(ChatBotError) as exc_info:
-        groq_service.get_bot_response(
+        await groq_service.get_bot_response(
             assignment_description=assignment_description,
             candidate_level=candidate_level,
             files_info=files_info
@@ -63,3 +92,219 @@ def test_get_bot_response_api_error(groq_service, groq_api_mock):
 
     assert exc_info.value.status_code == 500
     assert exc_info.value.message == message
+
+
+@pytest.mark.asyncio
+async def test_stream_bot_response(groq_service, groq_api_mock):
+    async def stream():
+        for content in ("Mocked ", None, "Review"):
+            yield MagicMock(
+                choices=[MagicMock(delta=MagicMock(content=content))],
+                x_groq=None
+            )
+
+    groq_api_mock.chat.completions.create.return_value = stream()
+
+    tokens = [
+        token
+        async for token in groq_service.stream_bot_response(
+            assignment_description="Implement a REST API.",
+            candidate_level="Junior",
+            files_info={"file1.py": "print('Hello World')"}
+        )
+    ]
+
+    assert tokens == ["Mocked ", "Review"]
+    assert groq_api_mock.chat.completions.create.call_args.kwargs["stream"]
+
+
+@pytest.fixture
+def groq_rate_limiter_mock():
+    mock = AsyncMock()
+    mock.acquire.side_effect = lambda model, tokens: (
+        ModelLease(model=model, lease_id="lease", tokens=tokens), 0
+    )
+    return mock
+
+
+@pytest.fixture
+def routed_groq_service(groq_api_mock, groq_rate_limiter_mock):
+    return GroqAIService(
+        groq_api=groq_api_mock,
+        rate_limiter=groq_rate_limiter_mock
+    )
+
+
+@pytest.fixture
+def sleep_mock(monkeypatch):
+    mock = AsyncMock()
+    monkeypatch.setattr("src.code_guru.services.asyncio.sleep", mock)
+    monkeypatch.setattr(
+        "src.code_guru.services.random.uniform",
+        lambda low, high: 0
+    )
+    return mock
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "candidate_level, files_info, model",
+    [
+        ("Junior", {"file1.py": "print('Hello World')"}, GROQ_LIGHT_MODEL),
+        ("Senior", {"file1.py": "print('Hello World')"}, GROQ_MODEL),
+        ("Junior", {"file1.py": "x = 1\n" * 10 ** 5}, GROQ_MODEL),
+    ]
+)
+async def test_get_bot_response_picks_model(
+    routed_groq_service,
+    groq_api_mock,
+    groq_rate_limiter_mock,
+    candidate_level,
+    files_info,
+    model
+):
+    await routed_groq_service.get_bot_response(
+        assignment_description="Implement a REST API.",
+        candidate_level=candidate_level,
+        files_info=files_info
+    )
+
+    assert groq_api_mock.chat.completions.create.call_args.kwargs[
+        "model"
+    ] == model
+    lease = groq_rate_limiter_mock.release.await_args.args[0]
+    assert lease.used_tokens == 110
+
+
+@pytest.mark.asyncio
+async def test_get_bot_response_falls_back_on_rate_limit(
+    routed_groq_service,
+    groq_api_mock,
+    groq_rate_limiter_mock
+):
+    completion = groq_api_mock.chat.completions.create.return_value
+    groq_api_mock.chat.completions.create.side_effect = [
+        make_api_error(429, headers={"retry-after": "7"}),
+        completion,
+    ]
+
+    response = await routed_groq_service.get_bot_response(
+        assignment_description="Implement a REST API.",
+        candidate_level="Senior",
+        files_info={"file1.py": "print('Hello World')"}
+    )
+
+    assert response == "Mocked Review Response"
+    models = [
+        call.kwargs["model"]
+        for call in groq_api_mock.chat.completions.create.call_args_list
+    ]
+    assert models == [GROQ_MODEL, GROQ_FALLBACK_MODELS[0]]
+    lease, retry_after = groq_rate_limiter_mock.release.await_args_list[
+        0
+    ].args
+    assert lease.model == GROQ_MODEL
+    assert retry_after == 7
+
+
+@pytest.mark.asyncio
+async def test_get_bot_response_skips_model_on_context_error(
+    routed_groq_service,
+    groq_api_mock,
+    sleep_mock
+):
+    groq_api_mock.chat.completions.create.side_effect = make_api_error(
+        400,
+        code="context_length_exceeded"
+    )
+
+    with pytest.raises(ChatBotError) as exc_info:
+        await routed_groq_service.get_bot_response(
+            assignment_description="Implement a REST API.",
+            candidate_level="Senior",
+            files_info={"file1.py": "print('Hello World')"}
+        )
+
+    assert exc_info.value.status_code == 400
+    assert groq_api_mock.chat.completions.create.await_count == len(
+        {GROQ_MODEL, *GROQ_FALLBACK_MODELS}
+    )
+    sleep_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_bot_response_waits_for_busy_models(
+    routed_groq_service,
+    groq_rate_limiter_mock,
+    sleep_mock
+):
+    models = list(dict.fromkeys([GROQ_MODEL, *GROQ_FALLBACK_MODELS]))
+    groq_rate_limiter_mock.acquire.side_effect = [
+        *((None, wait) for wait in [5, 3, 4][:len(models)]),
+        (ModelLease(model=GROQ_MODEL, lease_id="lease", tokens=100), 0),
+    ]
+
+    response = await routed_groq_service.get_bot_response(
+        assignment_description="Implement a REST API.",
+        candidate_level="Senior",
+        files_info={"file1.py": "print('Hello World')"}
+    )
+
+    assert response == "Mocked Review Response"
+    sleep_mock.assert_awaited_once_with(min([5, 3, 4][:len(models)]))
+
+
+@pytest.mark.asyncio
+async def test_get_bot_response_gives_up_when_overloaded(
+    routed_groq_service,
+    groq_api_mock,
+    sleep_mock
+):
+    groq_api_mock.chat.completions.create.side_effect = make_api_error(503)
+
+    with pytest.raises(ChatBotError) as exc_info:
+        await routed_groq_service.get_bot_response(
+            assignment_description="Implement a REST API.",
+            candidate_level="Senior",
+            files_info={"file1.py": "print('Hello World')"}
+        )
+
+    assert exc_info.value.status_code == 503
+    assert sleep_mock.await_count == GROQ_MAX_RETRIES
+
+
+@pytest.mark.asyncio
+async def test_get_bot_response_queues_for_leased_slots(
+    groq_api_mock,
+    sleep_mock,
+    fake_redis
+):
+    rate_limiter = GroqRateLimiter(
+        redis=FailSafeRedis(redis=fake_redis),
+        concurrency=1,
+        tokens_per_minute=10 ** 6,
+        model_tokens_per_minute={}
+    )
+    models = {GROQ_MODEL, *GROQ_FALLBACK_MODELS}
+    leases = [(await rate_limiter.acquire(model, 100))[0] for model in models]
+    busy_polls = GROQ_MAX_RETRIES * 3
+
+    async def sleep(delay):
+        if sleep_mock.await_count == busy_polls:
+            for lease in leases:
+                await rate_limiter.release(lease)
+
+    sleep_mock.side_effect = sleep
+    groq_service = GroqAIService(
+        groq_api=groq_api_mock,
+        rate_limiter=rate_limiter
+    )
+
+    response = await groq_service.get_bot_response(
+        assignment_description="Implement a REST API.",
+        candidate_level="Senior",
+        files_info={"file1.py": "print('Hello World')"}
+    )
+
+    assert response == "Mocked Review Response"
+    assert sleep_mock.await_count == busy_polls
@@ -0,0 +1,307 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.code_guru.exceptions import GitHubError
+from src.code_guru.jobs import (
+    CLAIM_JOB_SCRIPT,
+    DELAYED_KEY,
+    FAILED,
+    PROCESSING_KEY,
+    QUEUE_KEY,
+    QUEUED,
+    REQUEUE_JOB_SCRIPT,
+    RUNNING,
+    ReviewJobQueue,
+)
+from src.code_guru.schemas import (
+    CodeReviewRequest,
+    CodeReviewResponse,
+    ReviewJob,
+    ReviewJobRequest,
+)
+from src.code_guru.worker import ReviewWorker
+from src.settings import JOB_MAX_ATTEMPTS, JOB_RESULT_TTL, JOB_RETRY_DELAY
+
+
+REQUEST_DATA = {
+    "assignment_description": "Implement a REST API.",
+    "github_repo_url": "https://github.com/user/repo.git",
+    "candidate_level": "Junior",
+}
+
+
+@pytest.fixture
+def redis_mock():
+    mock = AsyncMock()
+    mock.get.return_value = None
+    mock.zrangebyscore.return_value = []
+    return mock
+
+
+@pytest.fixture
+def job_queue(redis_mock):
+    return ReviewJobQueue(redis=redis_mock)
+
+
+@pytest.fixture
+def job():
+    return ReviewJob(
+        job_id="job1",
+        status=QUEUED,
+        priority="normal",
+        request=CodeReviewRequest(**REQUEST_DATA)
+    )
+
+
+@pytest.mark.asyncio
+async def test_submit_queues_higher_priority_first(job_queue, redis_mock):
+    low_job = await job_queue.submit(
+        ReviewJobRequest(**REQUEST_DATA, priority="low")
+    )
+    high_job = await job_queue.submit(
+        ReviewJobRequest(**REQUEST_DATA, priority="high")
+    )
+
+    (low_call, high_call) = redis_mock.zadd.await_args_list
+    assert low_call.args[0] == QUEUE_KEY
+    assert (
+        high_call.args[1][high_job.job_id]
+        < low_call.args[1][low_job.job_id]
+    )
+    assert high_job.status == QUEUED
+    redis_mock.set.assert_any_await(
+        f"job:{high_job.job_id}",
+        high_job.model_dump_json(),
+        ex=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_claim_marks_job_running(job_queue, redis_mock, job):
+    redis_mock.eval.return_value = b"job1"
+    redis_mock.get.return_value = job.model_dump_json()
+
+    claimed_job = await job_queue.claim()
+
+    assert claimed_job.job_id == "job1"
+    assert claimed_job.status == RUNNING
+    assert claimed_job.attempts == 1
+    assert redis_mock.eval.await_args.args[:4] == (
+        CLAIM_JOB_SCRIPT, 2, QUEUE_KEY, PROCESSING_KEY
+    )
+
+
+@pytest.mark.asyncio
+async def test_claim_returns_none_for_empty_queue(job_queue, redis_mock):
+    redis_mock.eval.return_value = None
+
+    assert await job_queue.claim() is None
+
+
+@pytest.mark.asyncio
+async def test_claim_gives_up_after_max_attempts(job_queue, redis_mock, job):
+    job.attempts = JOB_MAX_ATTEMPTS
+    redis_mock.eval.side_effect = [b"job1", None]
+    redis_mock.get.return_value = job.model_dump_json()
+
+    assert await job_queue.claim() is None
+
+    saved_job = ReviewJob.model_validate_json(
+        redis_mock.set.await_args.args[1]
+    )
+    assert saved_job.status == FAILED
+    redis_mock.zrem.assert_awaited_with(PROCESSING_KEY, "job1")
+
+
+@pytest.mark.asyncio
+async def test_claim_requeues_expired_jobs(job_queue, redis_mock, job):
+    redis_mock.zrangebyscore.side_effect = [[], [b"job1"]]
+    redis_mock.get.return_value = job.model_dump_json()
+    redis_mock.eval.side_effect = [1, None]
+
+    assert await job_queue.claim() is None
+
+    requeue_call = redis_mock.eval.await_args_list[0]
+    assert requeue_call.args[:5] == (
+        REQUEUE_JOB_SCRIPT, 2, PROCESSING_KEY, QUEUE_KEY, "job1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_fail_retries_server_errors(job_queue, redis_mock, job):
+    job.attempts = 1
+
+    await job_queue.fail(job, GitHubError(status_code=502, message="Down"))
+
+    assert job.status == QUEUED
+    assert redis_mock.eval.await_args.args[0] == REQUEUE_JOB_SCRIPT
+
+
+@pytest.mark.asyncio
+async def test_fail_delays_rate_limited_jobs(job_queue, redis_mock, job):
+    job.attempts = 2
+
+    await job_queue.fail(
+        job,
+        GitHubError(status_code=429, message="Rate limit exhausted")
+    )
+
+    assert job.status == QUEUED
+    script, _, source, destination, job_id, score = (
+        redis_mock.eval.await_args.args
+    )
+    assert script == REQUEUE_JOB_SCRIPT
+    assert (source, destination, job_id) == (
+        PROCESSING_KEY, DELAYED_KEY, "job1"
+    )
+    assert score == pytest.approx(time.time() + JOB_RETRY_DELAY * 2, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_fail_does_not_retry_client_errors(job_queue, redis_mock, job):
+    job.attempts = 1
+
+    await job_queue.fail(job, GitHubError(status_code=404, message="Gone"))
+
+    assert job.status == FAILED
+    assert job.error == "Gone"
+    assert job.error_status_code == 404
+    redis_mock.eval.assert_not_awaited()
+    redis_mock.zrem.assert_awaited_with(PROCESSING_KEY, "job1")
+
+
+@pytest.mark.asyncio
+async def test_queue_claims_by_priority_and_requeues(fake_redis):
+    job_queue = ReviewJobQueue(redis=fake_redis)
+    low_job = await job_queue.submit(
+        ReviewJobRequest(**REQUEST_DATA, priority="low")
+    )
+    high_job = await job_queue.submit(
+        ReviewJobRequest(**REQUEST_DATA, priority="high")
+    )
+
+    assert (await job_queue.claim()).job_id == high_job.job_id
+    claimed_job = await job_queue.claim()
+    assert claimed_job.job_id == low_job.job_id
+    assert await job_queue.claim() is None
+
+    await job_queue.fail(
+        claimed_job,
+        GitHubError(status_code=502, message="Down")
+    )
+    claimed_job = await job_queue.claim()
+
+    assert claimed_job.job_id == low_job.job_id
+    assert claimed_job.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_queue_requeues_expired_job(fake_redis):
+    job_queue = ReviewJobQueue(redis=fake_redis)
+    job = await job_queue.submit(ReviewJobRequest(**REQUEST_DATA))
+    await job_queue.claim()
+    await fake_redis.zadd(PROCESSING_KEY, {job.job_id: 0})
+
+    assert await job_queue.requeue_expired() == 1
+    assert await fake_redis.zscore(PROCESSING_KEY, job.job_id) is None
+    assert (await job_queue.claim()).job_id == job.job_id
+
+
+@pytest.mark.asyncio
+async def test_queue_claims_delayed_job_when_due(fake_redis):
+    job_queue = ReviewJobQueue(redis=fake_redis)
+    job = await job_queue.submit(ReviewJobRequest(**REQUEST_DATA))
+    job = await job_queue.claim()
+
+    await job_queue.fail(
+        job,
+        GitHubError(status_code=429, message="Rate limit exhausted")
+    )
+
+    assert await job_queue.claim() is None
+    assert (await job_queue.get(job.job_id)).status == QUEUED
+    await fake_redis.zadd(DELAYED_KEY, {job.job_id: 0})
+    assert (await job_queue.claim()).job_id == job.job_id
+
+
+@pytest.mark.asyncio
+async def test_queue_expires_only_finished_jobs(fake_redis):
+    job_queue = ReviewJobQueue(redis=fake_redis)
+    job = await job_queue.submit(ReviewJobRequest(**REQUEST_DATA))
+    job_key = f"job:{job.job_id}"
+
+    assert await fake_redis.ttl(job_key) == -1
+    job = await job_queue.claim()
+    assert await fake_redis.ttl(job_key) == -1
+
+    await job_queue.complete(
+        job,
+        CodeReviewResponse(filenames=["file1.py"], review_result="Ok")
+    )
+
+    assert 0 < await fake_redis.ttl(job_key) <= JOB_RESULT_TTL
+
+
+@pytest.mark.asyncio
+async def test_worker_completes_claimed_job(job):
+    review = CodeReviewResponse(filenames=["file1.py"], review_result="Ok")
+    job_queue = MagicMock()
+    job_queue.claim = AsyncMock(return_value=job)
+    job_queue.complete = AsyncMock()
+    review_service = MagicMock()
+    review_service.review = AsyncMock(return_value=review)
+    worker = ReviewWorker(
+        job_queue=job_queue,
+        create_review_service=lambda: review_service,
+        concurrency=1
+    )
+
+    assert await worker.run_once()
+    await asyncio.gather(*worker._tasks)
+
+    review_service.review.assert_awaited_once_with(job.request)
+    job_queue.complete.assert_awaited_once_with(job, review)
+
+
+@pytest.mark.asyncio
+async def test_worker_reports_failed_job(job):
+    error = GitHubError(status_code=502, message="Down")
+    job_queue = MagicMock()
+    job_queue.claim = AsyncMock(return_value=job)
+    job_queue.fail = AsyncMock()
+    review_service = MagicMock()
+    review_service.review = AsyncMock(side_effect=error)
+    worker = ReviewWorker(
+        job_queue=job_queue,
+        create_review_service=lambda: review_service,
+        concurrency=1
+    )
+
+    assert await worker.run_once()
+    await asyncio.gather(*worker._tasks)
+
+    job_queue.fail.assert_awaited_once_with(job, error)
+
+
+
+@pytest.mark.asyncio
+async def test_worker_creates_review_service_per_job(job):
+    job_queue = MagicMock()
+    job_queue.claim = AsyncMock(return_value=job)
+    job_queue.complete = AsyncMock()
+    create_review_service = MagicMock()
+    create_review_service.return_value.review = AsyncMock()
+    worker = ReviewWorker(
+        job_queue=job_queue,
+        create_review_service=create_review_service,
+        concurrency=2
+    )
+
+    assert await worker.run_once()
+    assert await worker.run_once()
+    await asyncio.gather(*worker._tasks)
+
+    assert create_review_service.call_count == 2
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.code_guru.dependencies import (
+    get_git_hub_client,
+    get_git_hub_service,
+    get_open_ai_api,
+    get_redis,
+)
+from src.main import app
+
+
+LLM_LATENCY = 0.2
+CONCURRENT_REVIEWS = 10
+
+
+@pytest.fixture
+def overlap_tracker():
+    return {"in_flight": 0, "max_in_flight": 0}
+
+
+@pytest.fixture
+def groq_api_fake(overlap_tracker):
+    async def create(**kwargs):
+        overlap_tracker["in_flight"] += 1
+        overlap_tracker["max_in_flight"] = max(
+            overlap_tracker["max_in_flight"],
+            overlap_tracker["in_flight"]
+        )
+        await asyncio.sleep(LLM_LATENCY)
+        overlap_tracker["in_flight"] -= 1
+        return MagicMock(
+            choices=[MagicMock(message=MagicMock(content="Review"))],
+            usage=None
+        )
+
+    groq_api = MagicMock()
+    groq_api.chat.completions.create = create
+    return groq_api
+
+
+@pytest.fixture
+def git_hub_service_fake():
+    git_hub_service = MagicMock()
+    git_hub_service.get_api_url_from_usual_url.side_effect = (
+        lambda url: url
+    )
+    git_hub_service.get_head_sha = AsyncMock(
+        side_effect=lambda client, url: url
+    )
+    git_hub_service.get_files_info = AsyncMock(
+        return_value={"file1.py": "print('Hello World')"}
+    )
+    return git_hub_service
+
+
+@pytest.fixture
+def redis_fake():
+    redis = AsyncMock()
+    redis.get.return_value = None
+    redis.set.return_value = True
+    redis.eval.return_value = None
+    return redis
+
+
+@pytest.fixture
+def client(groq_api_fake, git_hub_service_fake, redis_fake):
+    app.dependency_overrides = {
+        get_open_ai_api: lambda: groq_api_fake,
+        get_git_hub_service: lambda: git_hub_service_fake,
+        get_git_hub_client: lambda: MagicMock(),
+        get_redis: lambda: redis_fake,
+    }
+    yield AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    )
+    app.dependency_overrides = {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reviews_overlap_in_one_worker(
+    client,
+    overlap_tracker
+):
+    started = time.monotonic()
+    async with client:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/review/",
+                    json={
+                        "assignment_description": "Implement a REST API.",
+                        "github_repo_url": (
+                            f"https://github.com/user/repo{index}.git"
+                        ),
+                        "candidate_level": "Junior",
+                    }
+                )
+                for index in range(CONCURRENT_REVIEWS)
+            )
+        )
+    elapsed = time.monotonic() - started
+
+    assert all(response.status_code == 200 for response in responses)
+    assert overlap_tracker["max_in_flight"] == CONCURRENT_REVIEWS
+    assert elapsed < LLM_LATENCY * CONCURRENT_REVIEWS / 2
@@ -0,0 +1,48 @@
+from src.code_guru.cache import CacheStats, LocalCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    local_cache = LocalCache(max_size=10, ttl=60)
+    local_cache.set("a", "aaaa", size=4)
+    local_cache.set("b", "bbbb", size=4)
+    local_cache.get("a")
+    local_cache.set("c", "cccc", size=4)
+
+    assert local_cache.get("a") == "aaaa"
+    assert local_cache.get("b") is None
+    assert local_cache.get("c") == "cccc"
+    assert local_cache.size == 8
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(
+        "src.code_guru.cache.time.monotonic",
+        lambda: now
+    )
+    local_cache = LocalCache(max_size=10, ttl=60)
+    local_cache.set("a", "aaaa", size=4)
+
+    now += 61
+
+    assert local_cache.get("a") is None
+    assert local_cache.size == 0
+
+
+def test_local_cache_skips_oversized_values():
+    local_cache = LocalCache(max_size=10, ttl=60)
+    local_cache.set("a", "a" * 11, size=11)
+
+    assert local_cache.get("a") is None
+    assert len(local_cache) == 0
+
+
+def test_cache_stats_hit_ratios():
+    cache_stats = CacheStats()
+    cache_stats.record("local", hits=3, misses=1)
+    cache_stats.record_lookup("redis", is_hit=False)
+
+    assert cache_stats.get_hit_ratios() == {
+        "local": {"hits": 3, "misses": 1, "hit_ratio": 0.75},
+        "redis": {"hits": 0, "misses": 1, "hit_ratio": 0.0},
+    }
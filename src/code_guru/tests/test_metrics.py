@@ -0,0 +1,49 @@
+import pytest
+
+from src.code_guru.metrics import (
+    format_server_timing,
+    get_github_endpoint,
+    server_timings,
+    track_stage,
+)
+
+
+@pytest.mark.parametrize(
+    "url, endpoint",
+    [
+        ("https://api.github.com/repos/user/repo", "repo"),
+        ("https://api.github.com/repos/user/repo/commits/HEAD", "commits"),
+        (
+            "https://api.github.com/repos/user/repo/git/trees/sha"
+            "?recursive=1",
+            "trees"
+        ),
+        ("https://api.github.com/repos/user/repo/git/blobs/sha", "blobs"),
+        ("https://api.github.com/repos/user/repo/contents/src", "contents"),
+        ("https://api.github.com/repos/user/repo/compare/a...b", "compare"),
+        ("https://api.github.com/rate_limit", "other"),
+    ]
+)
+def test_get_github_endpoint(url, endpoint):
+    assert get_github_endpoint(url) == endpoint
+
+
+def test_track_stage_accumulates_server_timings():
+    timings = {}
+    context_token = server_timings.set(timings)
+    try:
+        with track_stage("groq"):
+            pass
+        with track_stage("groq"):
+            pass
+    finally:
+        server_timings.reset(context_token)
+
+    assert list(timings) == ["groq"]
+    assert timings["groq"] >= 0
+
+
+def test_format_server_timing():
+    assert format_server_timing({"files": 0.1234, "total": 1.5}) == (
+        "files;dur=123.4, total;dur=1500.0"
+    )
@@ -0,0 +1,122 @@
+import pytest
+
+from src.code_guru.packing import (
+    CONFIG_PRIORITY,
+    GENERATED_PRIORITY,
+    SOURCE_PRIORITY,
+    TRUNCATION_MARKER,
+    chunk_files_info,
+    estimate_file_tokens,
+    estimate_tokens,
+    get_file_priority,
+    pack_files_info,
+)
+
+
+@pytest.mark.parametrize(
+    "path, priority",
+    [
+        ("src/main.py", SOURCE_PRIORITY),
+        ("tests/test_main.py", SOURCE_PRIORITY),
+        ("Dockerfile", CONFIG_PRIORITY),
+        ("pyproject.toml", CONFIG_PRIORITY),
+        ("README.md", CONFIG_PRIORITY),
+        ("poetry.lock", GENERATED_PRIORITY),
+        ("package-lock.json", GENERATED_PRIORITY),
+        ("node_modules/react/index.js", GENERATED_PRIORITY),
+        ("web/node_modules/react/index.js", GENERATED_PRIORITY),
+        ("build/app.js", GENERATED_PRIORITY),
+        ("src/main/java/com/acme/build/Builder.java", SOURCE_PRIORITY),
+        ("pkg/env/config.go", SOURCE_PRIORITY),
+        ("static/app.min.js", GENERATED_PRIORITY),
+        ("static/logo.png", GENERATED_PRIORITY),
+    ]
+)
+def test_get_file_priority(path, priority):
+    assert get_file_priority(path) == priority
+
+
+def test_pack_files_info_fits_everything():
+    files_info = {"main.py": "print('Hello World')", "README.md": "# Repo"}
+
+    packed_files = pack_files_info(files_info, token_budget=10_000)
+
+    assert packed_files.files_info == files_info
+    assert packed_files.truncated_files == []
+    assert packed_files.skipped_files == []
+    assert packed_files.skipped_files_summary == ""
+
+
+def test_pack_files_info_prefers_source_and_fits_budget():
+    files_info = {
+        "README.md": "docs " * 2000,
+        "main.py": "x = 1\n" * 500,
+        "utils.py": "y = 2\n" * 2000,
+        "yarn.lock": "lock " * 10,
+    }
+    token_budget = 2000
+
+    packed_files = pack_files_info(files_info, token_budget=token_budget)
+
+    assert packed_files.files_info["main.py"] == files_info["main.py"]
+    assert packed_files.files_info["utils.py"].endswith(TRUNCATION_MARKER)
+    assert packed_files.truncated_files == ["utils.py"]
+    assert packed_files.skipped_files == ["README.md", "yarn.lock"]
+    assert sum(
+        estimate_file_tokens(path, content)
+        for path, content in packed_files.files_info.items()
+    ) + estimate_tokens(packed_files.skipped_files_summary) <= token_budget
+
+
+def test_pack_files_info_summarizes_many_skipped_files():
+    files_info = {f"vendor/lib{index}.js": "" for index in range(1000)}
+
+    packed_files = pack_files_info(files_info, token_budget=1000)
+
+    assert len(packed_files.skipped_files) == 1000
+    assert packed_files.skipped_files_summary.endswith(" more)")
+    assert estimate_tokens(packed_files.skipped_files_summary) <= 50
+
+
+def test_chunk_files_info():
+    files_info = {
+        f"src/module{index}.py": "x = 1\n" * 100 for index in range(10)
+    }
+    files_info["huge.py"] = "y = 2\n" * 5000
+    files_info["yarn.lock"] = "lock"
+    token_budget = 500
+
+    chunked_files = chunk_files_info(
+        files_info,
+        token_budget=token_budget,
+        max_chunks=10
+    )
+
+    assert chunked_files.skipped_files == ["yarn.lock"]
+    assert chunked_files.truncated_files == ["huge.py"]
+    assert sorted(
+        path for chunk in chunked_files.chunks for path in chunk
+    ) == sorted(path for path in files_info if path != "yarn.lock")
+    assert all(
+        sum(
+            estimate_file_tokens(path, content)
+            for path, content in chunk.items()
+        ) <= token_budget
+        for chunk in chunked_files.chunks
+    )
+
+
+def test_chunk_files_info_max_chunks():
+    files_info = {
+        f"src/module{index}.py": "x = 1\n" * 100 for index in range(10)
+    }
+
+    chunked_files = chunk_files_info(
+        files_info,
+        token_budget=500,
+        max_chunks=2
+    )
+
+    assert len(chunked_files.chunks) == 2
+    assert len(chunked_files.skipped_files) == 6
+    assert chunked_files.skipped_files_summary
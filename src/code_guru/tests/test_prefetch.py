@@ -0,0 +1,83 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.code_guru.exceptions import GitHubError
+from src.code_guru.prefetch import RepoPrefetcher
+
+
+URLS = [
+    "https://github.com/user/repo1.git",
+    "https://github.com/user/repo2.git",
+    "https://github.com/user/repo3.git",
+]
+
+
+@pytest.fixture
+def sleep_mock(monkeypatch):
+    sleep_mock = AsyncMock()
+    monkeypatch.setattr("src.code_guru.prefetch.asyncio.sleep", sleep_mock)
+    return sleep_mock
+
+
+@pytest.fixture
+def git_hub_service_mock():
+    git_hub_service = MagicMock()
+    git_hub_service.get_api_url_from_usual_url.side_effect = (
+        lambda url: url.removesuffix(".git")
+    )
+    git_hub_service.get_files_info = AsyncMock(return_value={"a.py": "a"})
+    return git_hub_service
+
+
+def create_prefetcher(git_hub_service, concurrency: int = 2):
+    return RepoPrefetcher(
+        git_hub_service=git_hub_service,
+        git_hub_client=MagicMock(),
+        concurrency=concurrency,
+        repos_per_minute=30
+    )
+
+
+@pytest.mark.asyncio
+async def test_prefetch_warms_every_repo(git_hub_service_mock, sleep_mock):
+    results = await create_prefetcher(git_hub_service_mock).prefetch(URLS)
+
+    assert results == {"prefetched": 3, "skipped": 0}
+    assert [
+        call.kwargs["url"]
+        for call in git_hub_service_mock.get_files_info.await_args_list
+    ] == [url.removesuffix(".git") for url in URLS]
+    assert [call.args for call in sleep_mock.await_args_list] == [(2,), (2,)]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_counts_failures(git_hub_service_mock, sleep_mock):
+    git_hub_service_mock.get_files_info.side_effect = [
+        {"a.py": "a"},
+        GitHubError(status_code=404, message="Not Found"),
+        ValueError("Broken archive"),
+    ]
+
+    results = await create_prefetcher(git_hub_service_mock).prefetch(URLS)
+
+    assert results == {"prefetched": 1, "failed": 2, "skipped": 0}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_stops_when_rate_limited(
+    git_hub_service_mock,
+    sleep_mock
+):
+    git_hub_service_mock.get_files_info.side_effect = GitHubError(
+        status_code=429,
+        message="Rate limit exceeded"
+    )
+
+    results = await create_prefetcher(
+        git_hub_service_mock,
+        concurrency=1
+    ).prefetch(URLS)
+
+    assert results == {"rate_limited": 1, "skipped": 2}
+    git_hub_service_mock.get_files_info.assert_awaited_once()
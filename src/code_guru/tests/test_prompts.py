@@ -0,0 +1,80 @@
+import uuid
+
+from src.code_guru.metrics import PROMPT_PREFIXES
+from src.code_guru.prompts import (
+    REVIEW_PROMPT,
+    PromptTemplate,
+    build_messages,
+    get_prompt_prefix_hash,
+    record_prompt_prefix,
+)
+from src.code_guru.services import GroqAIService
+
+
+def get_messages(candidate_level: str, files_info: dict[str, str]):
+    return GroqAIService(groq_api=None)._get_messages(
+        assignment_description="Implement a REST API.",
+        candidate_level=candidate_level,
+        files_info=files_info
+    )
+
+
+def test_prompt_template_is_rendered_once_per_level():
+    template = PromptTemplate("""
+        Review code of a {candidate_level} developer.
+        Be concise.
+    """)
+
+    assert template.render("Junior") is template.render("Junior")
+    assert template.render("Junior") == (
+        "Review code of a Junior developer.\nBe concise."
+    )
+    assert template.render("Lead") == (
+        "Review code of a Lead developer.\nBe concise."
+    )
+
+
+def test_messages_sort_files_after_stable_prefix():
+    messages = get_messages("Junior", {"b.py": "b = 2", "a.py": "a = 1"})
+
+    assert messages[0]["content"] == REVIEW_PROMPT.render("Junior")
+    assert messages[1]["content"] == (
+        "1. Assignment description - Implement a REST API."
+    )
+    assert messages[2]["content"] == (
+        "2. Content of files -\n"
+        "\n--- a.py ---\na = 1"
+        "\n--- b.py ---\nb = 2"
+    )
+    assert messages == get_messages(
+        "Junior",
+        {"a.py": "a = 1", "b.py": "b = 2"}
+    )
+
+
+def test_prompt_prefix_hash_ignores_files():
+    prefix_hash = get_prompt_prefix_hash(
+        get_messages("Junior", {"a.py": "a = 1"})
+    )
+
+    assert prefix_hash == get_prompt_prefix_hash(
+        get_messages("Junior", {"b.py": "b = 2"})
+    )
+    assert prefix_hash != get_prompt_prefix_hash(
+        get_messages("Senior", {"a.py": "a = 1"})
+    )
+
+
+def test_record_prompt_prefix_counts_reuse():
+    messages = build_messages(
+        system_prompt=REVIEW_PROMPT.render("Middle"),
+        assignment_description=uuid.uuid4().hex,
+        content=["pass"]
+    )
+    reused = PROMPT_PREFIXES.labels("reused")
+    reused_count = reused._value.get()
+
+    record_prompt_prefix(messages)
+    record_prompt_prefix(messages)
+
+    assert reused._value.get() == reused_count + 1
@@ -0,0 +1,353 @@
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from httpx import Response
+
+from src.code_guru.exceptions import GitHubError
+from src.code_guru.rate_limit import (
+    ACQUIRE_MODEL_SCRIPT,
+    ACQUIRE_TOKEN_SCRIPT,
+    MODEL_LEASE_POLL_INTERVAL,
+    RELEASE_MODEL_SCRIPT,
+    UPDATE_TOKEN_SCRIPT,
+    GitHubRateLimiter,
+    GroqRateLimiter,
+    ModelLease,
+)
+from src.database.base import FailSafeRedis
+from src.settings import GITHUB_TOKEN_BURST
+
+
+@pytest.fixture
+def redis_mock():
+    return AsyncMock()
+
+
+@pytest.fixture
+def rate_limiter(redis_mock):
+    return GitHubRateLimiter(
+        redis=redis_mock,
+        tokens=["token1", "token2", "token1"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_acquire_returns_token_picked_by_script(
+    rate_limiter,
+    redis_mock
+):
+    redis_mock.eval.return_value = [2, b"0"]
+
+    token = await rate_limiter.acquire()
+
+    assert token == "token2"
+    script, keys_count, *keys = redis_mock.eval.await_args.args[:4]
+    assert script == ACQUIRE_TOKEN_SCRIPT
+    assert keys_count == 2
+    assert all(key.startswith("github_rate:") for key in keys)
+    assert all("token" not in key for key in keys)
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_bucket_to_refill(
+    rate_limiter,
+    redis_mock,
+    monkeypatch
+):
+    sleep_mock = AsyncMock()
+    monkeypatch.setattr("src.code_guru.rate_limit.asyncio.sleep", sleep_mock)
+    redis_mock.eval.side_effect = [[0, b"1.5"], [1, b"0"]]
+
+    token = await rate_limiter.acquire()
+
+    assert token == "token1"
+    sleep_mock.assert_awaited_once_with(1.5)
+
+
+@pytest.mark.asyncio
+async def test_acquire_gives_up_past_max_wait(rate_limiter, redis_mock):
+    redis_mock.eval.return_value = [0, b"3600"]
+
+    with pytest.raises(GitHubError) as exc_info:
+        await rate_limiter.acquire()
+
+    assert exc_info.value.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_acquire_passes_reserved_tokens(redis_mock):
+    rate_limiter = GitHubRateLimiter(
+        redis=redis_mock,
+        tokens=["token1"],
+        reserved_tokens=20
+    )
+    redis_mock.eval.return_value = [1, b"0"]
+
+    await rate_limiter.acquire()
+
+    assert redis_mock.eval.await_args.args[-1] == 20
+
+
+@pytest.mark.asyncio
+async def test_acquire_without_tokens(redis_mock):
+    redis_mock.eval.return_value = [0, b"-1"]
+    rate_limiter = GitHubRateLimiter(redis=redis_mock, tokens=[])
+
+    with pytest.raises(GitHubError):
+        await rate_limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_update_records_primary_rate_limit(rate_limiter, redis_mock):
+    reset_time = int(time.time()) + 60
+    response = Response(
+        403,
+        headers={
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(reset_time),
+        }
+    )
+
+    assert await rate_limiter.update("token1", response)
+
+    script, _, _, remaining, blocked_until = (
+        redis_mock.eval.await_args.args[:5]
+    )
+    assert script == UPDATE_TOKEN_SCRIPT
+    assert remaining == 0
+    assert blocked_until == reset_time
+    assert redis_mock.eval.await_args.args[-1] == reset_time
+
+
+@pytest.mark.asyncio
+async def test_update_records_secondary_rate_limit(rate_limiter, redis_mock):
+    response = Response(403, headers={"Retry-After": "30"})
+
+    assert await rate_limiter.update("token1", response)
+
+    remaining, blocked_until = redis_mock.eval.await_args.args[3:5]
+    assert remaining == -1
+    assert blocked_until == pytest.approx(time.time() + 30, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_update_ignores_other_errors(rate_limiter, redis_mock):
+    response = Response(403, headers={"X-RateLimit-Remaining": "42"})
+
+    assert not await rate_limiter.update("token1", response)
+
+    remaining, blocked_until = redis_mock.eval.await_args.args[3:5]
+    assert remaining == 42
+    assert blocked_until == 0
+
+
+@pytest.mark.asyncio
+async def test_update_refunds_not_modified(rate_limiter, redis_mock):
+    assert not await rate_limiter.update("token1", Response(304))
+
+    refund, reset_at = redis_mock.eval.await_args.args[-2:]
+    assert refund == 1
+    assert reset_at == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_rotates_tokens_when_redis_is_bypassed(
+    rate_limiter,
+    redis_mock
+):
+    redis_mock.eval.return_value = None
+
+    tokens = [await rate_limiter.acquire() for _ in range(3)]
+
+    assert tokens == ["token1", "token2", "token1"]
+
+
+@pytest.fixture
+def groq_rate_limiter(redis_mock):
+    return GroqRateLimiter(
+        redis=redis_mock,
+        concurrency=2,
+        tokens_per_minute=6000,
+        model_tokens_per_minute={"small": 600}
+    )
+
+
+@pytest.mark.asyncio
+async def test_groq_acquire_reserves_tokens(groq_rate_limiter, redis_mock):
+    redis_mock.eval.return_value = [1, b"0"]
+
+    lease, wait = await groq_rate_limiter.acquire("small", 1000)
+
+    assert lease.model == "small"
+    assert lease.tokens == 600
+    assert wait == 0
+    script, keys_count, *keys = redis_mock.eval.await_args.args[:4]
+    assert script == ACQUIRE_MODEL_SCRIPT
+    assert keys_count == 2
+    assert keys == ["groq_rate:small", "groq_leases:small"]
+    rate, capacity, tokens, concurrency = (
+        redis_mock.eval.await_args.args[5:9]
+    )
+    assert (rate, capacity, tokens, concurrency) == (10, 600, 1000, 2)
+
+
+@pytest.mark.asyncio
+async def test_groq_acquire_returns_wait(groq_rate_limiter, redis_mock):
+    redis_mock.eval.return_value = [0, b"2.5"]
+
+    assert await groq_rate_limiter.acquire("large", 100) == (None, 2.5)
+
+
+@pytest.mark.asyncio
+async def test_groq_acquire_when_redis_is_bypassed(
+    groq_rate_limiter,
+    redis_mock
+):
+    redis_mock.eval.return_value = None
+
+    lease, wait = await groq_rate_limiter.acquire("large", 100)
+
+    assert lease.tokens == 100
+    assert wait == 0
+
+
+@pytest.mark.asyncio
+async def test_groq_release_refunds_unused_tokens(
+    groq_rate_limiter,
+    redis_mock
+):
+    lease = ModelLease(
+        model="large",
+        lease_id="lease",
+        tokens=5000,
+        used_tokens=1200
+    )
+
+    await groq_rate_limiter.release(lease, retry_after=30)
+
+    script, _, _, _, lease_id, adjustment, capacity, blocked_until = (
+        redis_mock.eval.await_args.args[:8]
+    )
+    assert script == RELEASE_MODEL_SCRIPT
+    assert lease_id == "lease"
+    assert adjustment == 3800
+    assert capacity == 6000
+    assert blocked_until == pytest.approx(time.time() + 30, abs=1)
+
+
+def create_rate_limited_response(
+    remaining: int,
+    reset_at: int,
+    status_code: int = 200
+) -> Response:
+    return Response(
+        status_code,
+        headers={
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset_at),
+        }
+    )
+
+
+@pytest.fixture
+def fake_rate_limiter(fake_redis):
+    return GitHubRateLimiter(
+        redis=FailSafeRedis(redis=fake_redis),
+        tokens=["token1"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_bucket_is_raised_to_remaining_quota(
+    fake_rate_limiter,
+    monkeypatch
+):
+    sleep_mock = AsyncMock()
+    monkeypatch.setattr("src.code_guru.rate_limit.asyncio.sleep", sleep_mock)
+    reset_at = int(time.time()) + 3600
+
+    token = await fake_rate_limiter.acquire()
+    await fake_rate_limiter.update(
+        token,
+        create_rate_limited_response(4999, reset_at)
+    )
+    for _ in range(GITHUB_TOKEN_BURST * 2):
+        await fake_rate_limiter.acquire()
+
+    sleep_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bucket_keeps_lowest_remaining_until_reset(fake_rate_limiter):
+    reset_at = int(time.time()) + 3600
+    await fake_rate_limiter.update(
+        "token1",
+        create_rate_limited_response(2, reset_at)
+    )
+    await fake_rate_limiter.update(
+        "token1",
+        create_rate_limited_response(50, reset_at)
+    )
+
+    await fake_rate_limiter.acquire()
+    await fake_rate_limiter.acquire()
+    with pytest.raises(GitHubError) as exc_info:
+        await fake_rate_limiter.acquire()
+
+    assert exc_info.value.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_bucket_is_refilled_after_reset(fake_rate_limiter):
+    await fake_rate_limiter.update(
+        "token1",
+        create_rate_limited_response(0, int(time.time()) - 1, 403)
+    )
+
+    assert await fake_rate_limiter.acquire() == "token1"
+
+
+@pytest.mark.asyncio
+async def test_reserved_tokens_are_left_for_other_callers(
+    fake_rate_limiter,
+    fake_redis
+):
+    reserving_rate_limiter = GitHubRateLimiter(
+        redis=FailSafeRedis(redis=fake_redis),
+        tokens=["token1"],
+        reserved_tokens=5
+    )
+    await fake_rate_limiter.update(
+        "token1",
+        create_rate_limited_response(5, int(time.time()) + 3600)
+    )
+
+    with pytest.raises(GitHubError):
+        await reserving_rate_limiter.acquire()
+    assert await fake_rate_limiter.acquire() == "token1"
+
+
+@pytest.mark.asyncio
+async def test_groq_lease_limits_concurrency_and_refunds(fake_redis):
+    groq_rate_limiter = GroqRateLimiter(
+        redis=FailSafeRedis(redis=fake_redis),
+        concurrency=1,
+        tokens_per_minute=6000,
+        model_tokens_per_minute={}
+    )
+
+    lease, _ = await groq_rate_limiter.acquire("large", 5000)
+    assert await groq_rate_limiter.acquire("large", 100) == (
+        None,
+        MODEL_LEASE_POLL_INTERVAL
+    )
+
+    lease.used_tokens = 1000
+    await groq_rate_limiter.release(lease)
+    lease, _ = await groq_rate_limiter.acquire("large", 5000)
+    await groq_rate_limiter.release(lease)
+
+    lease, wait = await groq_rate_limiter.acquire("large", 5000)
+    assert lease is None
+    assert wait > 0
@@ -0,0 +1,73 @@
+import pytest
+
+from src.code_guru.exceptions import SerializationError
+from src.code_guru.serializers import (
+    CODEC_NONE,
+    CODEC_ZLIB,
+    HEADER,
+    deserialize_cached_response,
+    deserialize_content,
+    deserialize_files_info,
+    serialize_cached_response,
+    serialize_content,
+    serialize_files_info,
+)
+
+
+@pytest.mark.parametrize(
+    "files_info",
+    [
+        {},
+        {"file1.py": "print('Hello World')"},
+        {"src/ünïcödé.py": "x = '🐍'", "empty.txt": ""},
+        {f"src/file{index}.py": "import os\n" * 50 for index in range(20)},
+    ]
+)
+def test_files_info_round_trip(files_info):
+    assert deserialize_files_info(serialize_files_info(files_info)) == (
+        files_info
+    )
+
+
+def test_cached_response_round_trip():
+    validators = {"etag": 'W/"abc"', "last-modified": "Mon, 01 Jan 2024"}
+    content = b'{"size": 1}' * 100
+
+    assert deserialize_cached_response(
+        serialize_cached_response(validators, content)
+    ) == (validators, content)
+
+
+def test_content_round_trip():
+    content = "def main():\n    pass\n" * 100
+
+    assert deserialize_content(serialize_content(content)) == content
+
+
+@pytest.mark.parametrize(
+    "content, codec",
+    [
+        ("x = 1", CODEC_NONE),
+        ("def main():\n    pass\n" * 100, CODEC_ZLIB),
+    ]
+)
+def test_compression_threshold(content, codec):
+    _, _, serialized_codec = HEADER.unpack_from(serialize_content(content))
+
+    assert serialized_codec == codec
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"CG",
+        b"XX\x01\x00body",
+        b"CG\x01\x07body",
+        b"CG\x01\x01not zlib",
+        serialize_files_info({"file1.py": "content"})[:-3],
+    ]
+)
+def test_deserialize_invalid(data):
+    with pytest.raises(SerializationError):
+        deserialize_files_info(data)
@@ -1,6 +1,6 @@
 import re
 
-from src.settings import CANDIDATE_LEVELS
+from src.settings import BATCH_MAX_REPOS, CANDIDATE_LEVELS, JOB_PRIORITIES
 
 
 def validate_candidate_level(candidate_level: str) -> None:
@@ -11,9 +11,29 @@ def validate_candidate_level(candidate_level: str) -> None:
         )
 
 
+def validate_job_priority(priority: str) -> None:
+    if priority not in JOB_PRIORITIES:
+        raise ValueError(
+            f"Priority must be "
+            f"one of those - {', '.join(JOB_PRIORITIES)}"
+        )
+
+
 def validate_github_repo_url(github_repo_url: str) -> None:
     pattern = re.compile(
         r"^https://github\.com/[^/]+/[^/]+\.git$"
     )
     if not pattern.match(github_repo_url):
         raise ValueError("Invalid GitHub URL!")
+
+
+def validate_github_repo_urls(
+    github_repo_urls: list[str],
+    max_repos: int = BATCH_MAX_REPOS
+) -> None:
+    if not 0 < len(github_repo_urls) <= max_repos:
+        raise ValueError(
+            f"Batch must contain from 1 to {max_repos} repositories"
+        )
+    for github_repo_url in github_repo_urls:
+        validate_github_repo_url(github_repo_url)
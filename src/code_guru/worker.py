@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from typing import Callable
+
+from httpx import AsyncClient
+from redis.exceptions import ConnectionError, TimeoutError
+
+from src.code_guru.cache import ReviewCache
+from src.code_guru.interfaces import CodeReviewServiceInterface
+from src.code_guru.jobs import ReviewJobQueue
+from src.code_guru.rate_limit import GroqRateLimiter
+from src.code_guru.schemas import ReviewJob
+from src.code_guru.services import (
+    CodeReviewService,
+    GitHubService,
+    GroqAIService,
+)
+from src.database.base import FailSafeRedis, redis
+from src.git_hub.api import create_git_hub_client
+from src.groq_ai.api import groq_api
+from src.settings import (
+    JOB_POLL_INTERVAL,
+    JOB_VISIBILITY_TIMEOUT,
+    JOB_WORKER_CONCURRENCY,
+)
+
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class ReviewWorker:
+    def __init__(
+        self, job_queue: ReviewJobQueue,
+        create_review_service: Callable[[], CodeReviewServiceInterface],
+        concurrency: int = JOB_WORKER_CONCURRENCY
+    ):
+        self._job_queue = job_queue
+        self._create_review_service = create_review_service
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: set[asyncio.Task] = set()
+
+    async def run(self) -> None:
+        logger.info("Review worker started")
+        try:
+            while True:
+                await self.run_once()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+
+    async def run_once(self) -> bool:
+        await self._slots.acquire()
+        try:
+            job = await self._job_queue.claim()
+        except (ConnectionError, TimeoutError) as exc:
+            logger.warning(f"Failed to claim a review job: {exc!r}")
+            job = None
+        except BaseException:
+            self._slots.release()
+            raise
+
+        if job is None:
+            self._slots.release()
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            return False
+
+        task = asyncio.create_task(self._process(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(lambda _: self._slots.release())
+
+        return True
+
+    async def _process(self, job: ReviewJob) -> None:
+        logger.info(
+            f"Running review job {job.job_id} (attempt {job.attempts})"
+        )
+        heartbeat = asyncio.create_task(self._heartbeat(job.job_id))
+        try:
+            review = await self._create_review_service().review(
+                job.request
+            )
+        except Exception as exc:
+            logger.exception(f"Review job {job.job_id} failed")
+            await self._job_queue.fail(job, exc)
+        else:
+            await self._job_queue.complete(job, review)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(JOB_VISIBILITY_TIMEOUT / 3)
+            try:
+                await self._job_queue.extend(job_id)
+            except (ConnectionError, TimeoutError) as exc:
+                logger.warning(f"Failed to extend {job_id}: {exc!r}")
+
+
+def create_review_service(
+    cache_redis: FailSafeRedis,
+    git_hub_client: AsyncClient
+) -> CodeReviewServiceInterface:
+    return CodeReviewService(
+        git_hub_service=GitHubService(redis=cache_redis),
+        groq_ai_service=GroqAIService(
+            groq_api=groq_api,
+            rate_limiter=GroqRateLimiter(redis=cache_redis)
+        ),
+        review_cache=ReviewCache(redis=cache_redis),
+        git_hub_client=git_hub_client
+    )
+
+
+async def main() -> None:
+    cache_redis = FailSafeRedis(redis=redis)
+    try:
+        async with create_git_hub_client() as git_hub_client:
+            worker = ReviewWorker(
+                job_queue=ReviewJobQueue(redis=redis),
+                create_review_service=lambda: create_review_service(
+                    cache_redis=cache_redis,
+                    git_hub_client=git_hub_client
+                )
+            )
+            await worker.run()
+    finally:
+        await redis.aclose(close_connection_pool=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
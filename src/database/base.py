@@ -1,6 +1,103 @@
-from redis.asyncio import Redis
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
-from src.settings import REDIS_HOST, REDIS_PORT
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError, TimeoutError
 
+from src.settings import (
+    REDIS_CONNECT_TIMEOUT,
+    REDIS_HEALTH_CHECK_INTERVAL,
+    REDIS_HOST,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_POOL_TIMEOUT,
+    REDIS_PORT,
+    REDIS_RETRY_INTERVAL,
+    REDIS_SOCKET_TIMEOUT,
+)
 
-redis = Redis(host=REDIS_HOST, port=REDIS_PORT)
+
+logger = logging.getLogger("uvicorn.error")
+
+T = TypeVar("T")
+
+redis = Redis(
+    connection_pool=BlockingConnectionPool(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL
+    )
+)
+
+
+class FailSafeRedis:
+    _unavailable_until: float = 0
+
+    def __init__(self, redis: Redis):
+        self._redis = redis
+
+    @property
+    def is_available(self) -> bool:
+        return time.monotonic() >= FailSafeRedis._unavailable_until
+
+    async def get(self, name: str) -> Optional[bytes]:
+        return await self._call(lambda: self._redis.get(name), default=None)
+
+    async def mget(self, keys: list[str]) -> list[Optional[bytes]]:
+        return await self._call(
+            lambda: self._redis.mget(keys),
+            default=[None] * len(keys)
+        )
+
+    async def set(self, name: str, value: Any, **kwargs) -> bool:
+        return await self._call(
+            lambda: self._redis.set(name, value, **kwargs),
+            default=True
+        )
+
+    async def set_many(self, mapping: dict[str, Any], ex: int) -> None:
+        if not mapping:
+            return
+
+        async def set_many() -> None:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                for name, value in mapping.items():
+                    pipeline.set(name, value, ex=ex)
+                await pipeline.execute()
+
+        await self._call(set_many, default=None)
+
+    async def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        return await self._call(
+            lambda: self._redis.hincrby(name, key, amount),
+            default=0
+        )
+
+    async def eval(self, script: str, numkeys: int, *args) -> Any:
+        return await self._call(
+            lambda: self._redis.eval(script, numkeys, *args),
+            default=None
+        )
+
+    async def _call(
+        self, operation: Callable[[], Awaitable[T]],
+        default: T
+    ) -> T:
+        if not self.is_available:
+            return default
+
+        try:
+            return await operation()
+        except (ConnectionError, TimeoutError) as exc:
+            logger.warning(
+                f"Redis is unavailable, bypassing cache"
+                f" for {REDIS_RETRY_INTERVAL}s: {exc!r}"
+            )
+            FailSafeRedis._unavailable_until = (
+                time.monotonic() + REDIS_RETRY_INTERVAL
+            )
+            return default
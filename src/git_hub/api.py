@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import random
+
+from httpx import (
+    AsyncClient,
+    AsyncHTTPTransport,
+    Limits,
+    Request,
+    Response,
+    Timeout,
+    TransportError,
+)
+
+from src.settings import (
+    GITHUB_CONNECT_TIMEOUT,
+    GITHUB_HTTP2,
+    GITHUB_KEEPALIVE_EXPIRY,
+    GITHUB_MAX_CONNECTIONS,
+    GITHUB_MAX_KEEPALIVE_CONNECTIONS,
+    GITHUB_READ_TIMEOUT,
+    GITHUB_RETRIES,
+    GITHUB_RETRY_BACKOFF,
+)
+
+
+logger = logging.getLogger("uvicorn.error")
+
+RETRY_METHODS = {"GET", "HEAD"}
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+
+class RetryTransport(AsyncHTTPTransport):
+    def __init__(
+        self, max_retries: int = GITHUB_RETRIES,
+        backoff: float = GITHUB_RETRY_BACKOFF,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self._max_retries = max_retries
+        self._backoff = backoff
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if request.method not in RETRY_METHODS:
+            return await super().handle_async_request(request)
+
+        for attempt in range(self._max_retries + 1):
+            is_last_attempt = attempt == self._max_retries
+            try:
+                response = await super().handle_async_request(request)
+            except TransportError as exc:
+                if is_last_attempt:
+                    raise
+                logger.warning(f"Retrying {request.url} after {exc!r}")
+            else:
+                if (
+                    is_last_attempt
+                    or response.status_code not in RETRY_STATUS_CODES
+                ):
+                    return response
+                await response.aclose()
+                logger.warning(
+                    f"Retrying {request.url} after"
+                    f" {response.status_code} response"
+                )
+
+            await asyncio.sleep(self._get_backoff_delay(attempt))
+
+    def _get_backoff_delay(self, attempt: int) -> float:
+        delay = self._backoff * 2 ** attempt
+
+        return delay + random.uniform(0, delay)
+
+
+def create_git_hub_client() -> AsyncClient:
+    return AsyncClient(
+        timeout=Timeout(GITHUB_READ_TIMEOUT, connect=GITHUB_CONNECT_TIMEOUT),
+        transport=RetryTransport(
+            http2=GITHUB_HTTP2,
+            limits=Limits(
+                max_connections=GITHUB_MAX_CONNECTIONS,
+                max_keepalive_connections=GITHUB_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=GITHUB_KEEPALIVE_EXPIRY
+            )
+        )
+    )
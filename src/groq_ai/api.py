@@ -1,6 +1,6 @@
-from groq import Groq
+from groq import AsyncGroq
 
 from src.settings import GROQ_API_TOKEN
 
 
-groq_api = Groq(api_key=GROQ_API_TOKEN)
+groq_api = AsyncGroq(api_key=GROQ_API_TOKEN, max_retries=0)
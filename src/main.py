@@ -1,13 +1,54 @@
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, Request
+from redis.exceptions import RedisError
+
+from src.code_guru.metrics import format_server_timing, server_timings
 from src.code_guru.router import router as code_guru_router
+from src.database.base import redis
+from src.git_hub.api import create_git_hub_client
+
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await redis.ping()
+    except RedisError as exc:
+        logger.warning(f"Redis is unavailable on startup: {exc!r}")
 
+    try:
+        async with create_git_hub_client() as git_hub_client:
+            app.state.git_hub_client = git_hub_client
+            yield
+    finally:
+        await redis.aclose(close_connection_pool=True)
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(code_guru_router)
 
 
+@app.middleware("http")
+async def add_server_timing(request: Request, call_next):
+    timings = {}
+    context_token = server_timings.set(timings)
+    started_at = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        server_timings.reset(context_token)
+
+    timings["total"] = time.perf_counter() - started_at
+    response.headers["Server-Timing"] = format_server_timing(timings)
+    return response
+
+
 @app.get("/")
 async def main():
     return {
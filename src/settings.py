@@ -7,9 +7,141 @@ load_dotenv()
 
 # Environment
 GITHUB_API_TOKEN = os.getenv("GITHUB_API_TOKEN")
+GITHUB_API_TOKENS = [
+    token.strip()
+    for token in os.getenv("GITHUB_API_TOKENS", "").split(",")
+    if token.strip()
+] or [token for token in (GITHUB_API_TOKEN,) if token]
 GROQ_API_TOKEN = os.getenv("GROQ_API_TOKEN")
 REDIS_HOST = os.getenv("REDIS_HOST")
 REDIS_PORT = os.getenv("REDIS_PORT")
 
+# Redis
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 2))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 2))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+REDIS_RETRY_INTERVAL = float(os.getenv("REDIS_RETRY_INTERVAL", 5))
+
+# GitHub
+GITHUB_REVIEW_CONCURRENCY = int(os.getenv("GITHUB_REVIEW_CONCURRENCY", 10))
+GITHUB_MAX_CONCURRENCY = int(os.getenv("GITHUB_MAX_CONCURRENCY", 50))
+GITHUB_ARCHIVE_MIN_REPO_SIZE_KB = int(
+    os.getenv("GITHUB_ARCHIVE_MIN_REPO_SIZE_KB", 1024)
+)
+GITHUB_TREE_CACHE_TTL = int(os.getenv("GITHUB_TREE_CACHE_TTL", 60 * 60 * 24))
+GITHUB_BLOB_CACHE_TTL = int(
+    os.getenv("GITHUB_BLOB_CACHE_TTL", 60 * 60 * 24 * 7)
+)
+GITHUB_CONDITIONAL_CACHE_TTL = int(
+    os.getenv("GITHUB_CONDITIONAL_CACHE_TTL", 60 * 60 * 24)
+)
+GITHUB_HTTP2 = os.getenv("GITHUB_HTTP2", "true").lower() == "true"
+GITHUB_MAX_CONNECTIONS = int(os.getenv("GITHUB_MAX_CONNECTIONS", 100))
+GITHUB_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("GITHUB_MAX_KEEPALIVE_CONNECTIONS", 20)
+)
+GITHUB_KEEPALIVE_EXPIRY = float(os.getenv("GITHUB_KEEPALIVE_EXPIRY", 30))
+GITHUB_CONNECT_TIMEOUT = float(os.getenv("GITHUB_CONNECT_TIMEOUT", 5))
+GITHUB_READ_TIMEOUT = float(os.getenv("GITHUB_READ_TIMEOUT", 30))
+GITHUB_RETRIES = int(os.getenv("GITHUB_RETRIES", 3))
+GITHUB_RETRY_BACKOFF = float(os.getenv("GITHUB_RETRY_BACKOFF", 0.5))
+GITHUB_TOKEN_HOURLY_BUDGET = int(
+    os.getenv("GITHUB_TOKEN_HOURLY_BUDGET", 5000)
+)
+GITHUB_TOKEN_BURST = int(os.getenv("GITHUB_TOKEN_BURST", 100))
+GITHUB_RATE_LIMIT_MAX_WAIT = int(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", 300))
+GITHUB_MAX_FILE_SIZE = int(os.getenv("GITHUB_MAX_FILE_SIZE", 512 * 1024))
+GITHUB_MAX_REVIEW_SIZE = int(
+    os.getenv("GITHUB_MAX_REVIEW_SIZE", 32 * 1024 * 1024)
+)
+GITHUB_IGNORE_RULES = [
+    rule.strip()
+    for rule in os.getenv("GITHUB_IGNORE_RULES", "").split(",")
+    if rule.strip()
+]
+
+# Groq
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-70b-versatile")
+GROQ_CONTEXT_WINDOW = int(os.getenv("GROQ_CONTEXT_WINDOW", 131072))
+GROQ_MAX_COMPLETION_TOKENS = int(
+    os.getenv("GROQ_MAX_COMPLETION_TOKENS", 4096)
+)
+GROQ_PARTIAL_COMPLETION_TOKENS = int(
+    os.getenv("GROQ_PARTIAL_COMPLETION_TOKENS", 1024)
+)
+GROQ_FALLBACK_MODELS = [
+    model.strip()
+    for model in os.getenv(
+        "GROQ_FALLBACK_MODELS",
+        "llama-3.3-70b-versatile,llama-3.1-8b-instant"
+    ).split(",")
+    if model.strip()
+]
+GROQ_LIGHT_MODEL = os.getenv("GROQ_LIGHT_MODEL", "llama-3.1-8b-instant")
+GROQ_LIGHT_MODEL_LEVELS = [
+    level.strip()
+    for level in os.getenv("GROQ_LIGHT_MODEL_LEVELS", "Junior").split(",")
+    if level.strip()
+]
+GROQ_LIGHT_MODEL_MAX_PROMPT_TOKENS = int(
+    os.getenv("GROQ_LIGHT_MODEL_MAX_PROMPT_TOKENS", 8000)
+)
+GROQ_MODEL_CONCURRENCY = int(os.getenv("GROQ_MODEL_CONCURRENCY", 4))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", 30000))
+GROQ_MODEL_TOKENS_PER_MINUTE = {
+    model.strip(): int(limit)
+    for model, _, limit in (
+        item.partition("=")
+        for item in os.getenv("GROQ_MODEL_TOKENS_PER_MINUTE", "").split(",")
+        if item.strip()
+    )
+}
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", 4))
+GROQ_RETRY_BACKOFF = float(os.getenv("GROQ_RETRY_BACKOFF", 1))
+GROQ_RATE_LIMIT_MAX_WAIT = int(os.getenv("GROQ_RATE_LIMIT_MAX_WAIT", 120))
+GROQ_PROMPT_PREFIX_TTL = int(os.getenv("GROQ_PROMPT_PREFIX_TTL", 60 * 10))
+GROQ_PROMPT_PREFIX_CACHE_SIZE = int(
+    os.getenv("GROQ_PROMPT_PREFIX_CACHE_SIZE", 10000)
+)
+
+# Map-reduce review
+REVIEW_MAP_CHUNK_TOKENS = int(os.getenv("REVIEW_MAP_CHUNK_TOKENS", 32000))
+REVIEW_MAP_CONCURRENCY = int(os.getenv("REVIEW_MAP_CONCURRENCY", 4))
+REVIEW_MAX_TOTAL_TOKENS = int(os.getenv("REVIEW_MAX_TOTAL_TOKENS", 500000))
+
+# Cache
+CACHE_COMPRESSION_MIN_SIZE = int(os.getenv("CACHE_COMPRESSION_MIN_SIZE", 512))
+CACHE_COMPRESSION_LEVEL = int(os.getenv("CACHE_COMPRESSION_LEVEL", 1))
+LOCAL_CACHE_MAX_SIZE = int(os.getenv("LOCAL_CACHE_MAX_SIZE", 64 * 1024 * 1024))
+LOCAL_CACHE_TTL = int(os.getenv("LOCAL_CACHE_TTL", 60 * 60))
+CACHE_MGET_BATCH_SIZE = int(os.getenv("CACHE_MGET_BATCH_SIZE", 500))
+REVIEW_CACHE_TTL = int(os.getenv("REVIEW_CACHE_TTL", 60 * 60 * 24))
+REVIEW_HISTORY_TTL = int(
+    os.getenv("REVIEW_HISTORY_TTL", 60 * 60 * 24 * 30)
+)
+REVIEW_LOCK_TTL = int(os.getenv("REVIEW_LOCK_TTL", 180))
+REVIEW_LOCK_POLL_INTERVAL = float(os.getenv("REVIEW_LOCK_POLL_INTERVAL", 0.5))
+
+# Batch review
+BATCH_REVIEW_CONCURRENCY = int(os.getenv("BATCH_REVIEW_CONCURRENCY", 5))
+BATCH_MAX_REPOS = int(os.getenv("BATCH_MAX_REPOS", 200))
+
+# Prefetch
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", 2))
+PREFETCH_REPOS_PER_MINUTE = int(os.getenv("PREFETCH_REPOS_PER_MINUTE", 30))
+PREFETCH_MAX_REPOS = int(os.getenv("PREFETCH_MAX_REPOS", 2000))
+PREFETCH_RESERVED_TOKENS = int(os.getenv("PREFETCH_RESERVED_TOKENS", 20))
+
+# Review jobs
+JOB_VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", 300))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_RETRY_DELAY = int(os.getenv("JOB_RETRY_DELAY", 60))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", 60 * 60 * 24))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1))
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", 4))
+
 # Validation
 CANDIDATE_LEVELS = ("Junior", "Middle", "Senior")
+JOB_PRIORITIES = ("high", "normal", "low")